@@ -1,22 +1,32 @@
 import streamlit as st
 from views.user_view import render_user_view
 from views.admin_view import render_admin_view
+from views.recruiter_view import render_recruiter_view
+from utils.model_loader import get_model_registry
+from utils.download_utils import start_export_pruner
 
 def run():
     # Set page configuration once at the start
     st.set_page_config(page_title="Smart Resume Analyzer", layout="wide")
 
+    # Load the models in the background on the first run of this server process
+    get_model_registry().warm_up()
+    # Expired admin exports are deleted in the background, whether or not anyone exports again
+    start_export_pruner()
+
     # App state tracking for performance optimization
     if 'app_state' not in st.session_state:
         st.session_state.app_state = 'initial'
 
     st.title("Smart Resume Analyser")
     st.sidebar.markdown("# Choose User")
-    activities = ["User", "Admin"]
+    activities = ["User", "Recruiter", "Admin"]
     choice = st.sidebar.selectbox("Choose among the given options:", activities)
 
     if choice == 'User':
         render_user_view()
+    elif choice == 'Recruiter':
+        render_recruiter_view()
     else:
         render_admin_view()
 
@@ -0,0 +1,92 @@
+# benchmarks/bench_adzuna_client.py
+"""Compare Adzuna search latency: one-off requests.get, the pooled client, and its cache.
+
+Run from the repository root (no network needed):
+    python -m benchmarks.bench_adzuna_client [--latency-ms 50] [--repeat 20] [--pages 5]
+
+Starts scripts/fake_adzuna_server.py in this process. The same query is
+then issued --repeat times each way: as the old code did (a fresh
+requests.get with no Session), through AdzunaClient with the cache
+bypassed (pooled keep-alive connections), and through AdzunaClient with
+its cache, which is what a Streamlit rerun now does. The server's request
+count shows how many round trips each way made.
+
+It then loads --pages result pages one after another and with
+search_pages, reporting when the first page was ready and when all were.
+The rate limit is off for this comparison.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+from utils.headless import quiet_streamlit
+
+
+def _timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=int, default=50, help="Fake server delay per search")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from scripts.fake_adzuna_server import make_server
+    from services.adzuna_client import AdzunaClient
+
+    server = make_server(port=0, latency_ms=args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1/api/jobs"
+    params = {"app_id": "bench", "app_key": "bench", "results_per_page": 15, "what": "data scientist",
+              "where": "new york", "distance": 50, "content-type": "application/json"}
+    client = AdzunaClient("bench", "bench", base_url=base_url)
+    search = dict(what="Data Scientist", where="New York", distance=50)
+
+    cases = (
+        ("requests.get, no session", lambda: requests.get(f"{base_url}/us/search/1", params=params, timeout=30)),
+        ("pooled client, no cache", lambda: client.search("us", use_cache=False, **search)),
+        ("pooled client, cached", lambda: client.search("us", **search)),
+    )
+    print(f"{'search':28} {'median ms':>10} {'max ms':>8} {'round trips':>12}")
+    try:
+        for label, fn in cases:
+            before = sum(server.stats.values())
+            median, worst = _timed(fn, args.repeat)
+            print(f"{label:28} {median:>10.1f} {worst:>8.1f} {sum(server.stats.values()) - before:>12}")
+
+        print(f"\n{args.pages} pages{'':20} {'first ms':>10} {'all ms':>8} {'postings':>12}")
+        for label, concurrent in (("one after another", False), ("search_pages", True)):
+            fresh = AdzunaClient("bench", "bench", base_url=base_url, rate_per_minute=0)
+            started = time.perf_counter()
+            first = None
+            postings = 0
+            if concurrent:
+                batches = (results for _page, results, _count in fresh.search_pages("us", max_pages=args.pages,
+                                                                                    **search))
+            else:
+                batches = (fresh.search("us", page=page, **search)["results"] for page in range(1, args.pages + 1))
+            for results in batches:
+                first = first or (time.perf_counter() - started) * 1000
+                postings += len(results)
+            print(f"{label:28} {first:>10.1f} {(time.perf_counter() - started) * 1000:>8.1f} {postings:>12}")
+            fresh.close()
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
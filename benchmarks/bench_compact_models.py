@@ -0,0 +1,132 @@
+# benchmarks/bench_compact_models.py
+"""Compare the compact serving models against the original pickled models.
+
+Run from the repository root, after scripts.export_compact_models:
+    python -m benchmarks.bench_compact_models [--dir Uploaded_Resumes] [--repeat 50]
+        [--labels Datasets/clean_resume_data.csv --text-column Feature --label-column Category]
+
+For each head with both an original (vectorizer + classifier) and a compact
+model registered, reports how often the two agree on the sample resumes,
+the accuracy of each on a labelled CSV if one is given, single-document
+latency, and the cold load time and peak RSS of a fresh process that loads
+the model and scores one resume.
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def _time(fn, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def _scorer(kind, registry, keys):
+    """A function scoring one cleaned text with either the original or the compact model."""
+    if kind == 'compact':
+        model = registry.get(keys['compact'])
+        return lambda text: model.predict([text])
+    vectorizer, classifier = registry.get(keys['vectorizer']), registry.get(keys['classifier'])
+    return lambda text: classifier.predict(vectorizer.transform([text]))
+
+
+def _peak_rss_kb():
+    """Peak RSS of this process; /proc's VmHWM, unlike ru_maxrss, does not carry over the parent's peak."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _cold_start(kind, manifest_path, keys, text):
+    """Child process: load one model from scratch, score one text, report (seconds, peak RSS KB)."""
+    import numpy  # noqa: F401  (part of every process's baseline)
+    from utils.compact_model import CompactTextClassifier
+    from utils.model_registry import ModelRegistry
+
+    started = time.perf_counter()
+    if kind != 'baseline':
+        registry = ModelRegistry(manifest_path, loaders={'compact': CompactTextClassifier.load})
+        _scorer(kind, registry, keys)(text)
+    return time.perf_counter() - started, _peak_rss_kb()
+
+
+def _accuracy(predict, texts, labels):
+    return sum(predict(text)[0] == label for text, label in zip(texts, labels)) / len(labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default="Uploaded_Resumes")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--labels", help="Labelled CSV for the accuracy comparison")
+    parser.add_argument("--text-column", default="Feature")
+    parser.add_argument("--label-column", default="Category")
+    parser.add_argument("--manifest", default=None, help="Model manifest (default: models/manifest.json)")
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from scripts.export_compact_models import read_texts
+    from services.ml_service import MODEL_HEADS
+    from utils.compact_model import CompactTextClassifier
+    from utils.model_registry import MANIFEST_PATH, ModelRegistry, ModelUnavailable
+    from utils.text_utils import cleanResume
+
+    manifest_path = args.manifest or MANIFEST_PATH
+    registry = ModelRegistry(manifest_path, loaders={'compact': CompactTextClassifier.load})
+    texts = read_texts(args.dir, None)
+    labelled = None
+    if args.labels:
+        import pandas as pd
+        frame = pd.read_csv(args.labels, usecols=[args.text_column, args.label_column]).dropna()
+        labelled = ([cleanResume(text) for text in frame[args.text_column].astype(str)],
+                    frame[args.label_column].astype(str).tolist())
+
+    context = multiprocessing.get_context('spawn')
+    for _label_key, _top_k_key, vectorizer_key, classifier_key, compact_key in MODEL_HEADS:
+        keys = {'vectorizer': vectorizer_key, 'classifier': classifier_key, 'compact': compact_key}
+        try:
+            original, compact = _scorer('original', registry, keys), _scorer('compact', registry, keys)
+        except ModelUnavailable as e:
+            print(f"{compact_key}: skipped, {e}\n")
+            continue
+
+        print(f"{compact_key} ({len(texts)} resumes from {args.dir})")
+        agreement = sum(original(text)[0] == compact(text)[0] for text in texts) / len(texts)
+        print(f"  agreement with the original: {agreement:.1%}")
+        if labelled:
+            original_accuracy, compact_accuracy = (_accuracy(fn, *labelled) for fn in (original, compact))
+            print(f"  accuracy on {len(labelled[1])} labelled rows: original {original_accuracy:.2%}, "
+                  f"compact {compact_accuracy:.2%} (delta {compact_accuracy - original_accuracy:+.2%})")
+
+        original_ms = statistics.median(_time(original, text, args.repeat) for text in texts) * 1000
+        compact_ms = statistics.median(_time(compact, text, args.repeat) for text in texts) * 1000
+        print(f"  single-document latency (median): original {original_ms:.2f} ms, "
+              f"compact {compact_ms:.2f} ms ({original_ms / compact_ms:.1f}x)")
+
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            cold = {kind: pool.apply(_cold_start, (kind, manifest_path, keys, texts[0]))
+                    for kind in ('baseline', 'original', 'compact')}
+        baseline_kb = cold['baseline'][1]
+        for kind in ('original', 'compact'):
+            seconds, peak_kb = cold[kind]
+            print(f"  {kind:8} cold load + first score {seconds * 1000:7.1f} ms, "
+                  f"peak RSS {peak_kb / 1024:6.1f} MB (+{(peak_kb - baseline_kb) / 1024:.1f} MB over baseline)")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+# benchmarks/bench_jobs_dataset.py
+"""Compare reading Role and Features from the jobs CSV against the Parquet dataset.
+
+Run from the repository root, after scripts.convert_jobs_dataset:
+    python -m benchmarks.bench_jobs_dataset [--roles "Data Scientist" "Web Developer"]
+
+Times a full two-column read and a role-filtered read of each format. The
+CSV side uses pandas with usecols, as the notebooks did. Peak RSS is
+measured in a fresh process for each case.
+"""
+import argparse
+import multiprocessing
+import time
+
+from benchmarks.bench_compact_models import _peak_rss_kb
+from utils.jobs_dataset import DEFAULT_COLUMNS, JOBS_CSV, JOBS_DATASET, PARTITION_COLUMN
+
+
+def _read(kind, csv_path, dataset_dir, roles):
+    """Child process: run one read, report (seconds, rows, peak RSS KB)."""
+    started = time.perf_counter()
+    if kind == 'csv':
+        import pandas as pd
+        frame = pd.read_csv(csv_path, usecols=list(DEFAULT_COLUMNS))
+        if roles:
+            frame = frame[frame[PARTITION_COLUMN].isin(roles)]
+        rows = len(frame)
+    else:
+        from utils.jobs_dataset import read_jobs
+        rows = read_jobs(roles=roles, dataset_dir=dataset_dir).num_rows
+    return time.perf_counter() - started, rows, _peak_rss_kb()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=JOBS_CSV)
+    parser.add_argument("--dataset", default=JOBS_DATASET)
+    parser.add_argument("--roles", nargs="+", help="Roles for the filtered read (default: the first two)")
+    args = parser.parse_args(argv)
+
+    from utils.jobs_dataset import list_roles
+    roles = args.roles or list_roles(args.dataset)[:2]
+    context = multiprocessing.get_context('spawn')
+    print(f"{'read':32} {'format':8} {'rows':>9} {'seconds':>8} {'peak RSS':>10}")
+    for label, case_roles in (('Role + Features, all rows', None), (f'filtered to {len(roles)} roles', roles)):
+        for kind in ('csv', 'parquet'):
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                seconds, rows, peak_kb = pool.apply(_read, (kind, args.csv, args.dataset, case_roles))
+            print(f"{label:32} {kind:8} {rows:>9} {seconds:>8.2f} {peak_kb / 1024:>8.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
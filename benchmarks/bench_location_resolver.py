@@ -0,0 +1,49 @@
+# benchmarks/bench_location_resolver.py
+"""Time the offline location resolver and count how often Gemini would still be needed.
+
+Run from the repository root:
+    python -m benchmarks.bench_location_resolver [--dir Uploaded_Resumes] [--repeat 1000]
+
+Prints what the gazetteer finds in each resume header. A dash means no
+local answer, so locate_candidate would fall back to Gemini.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default="Uploaded_Resumes")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from services.batch_service import find_resumes, read_pdf
+
+    started = time.perf_counter()
+    from utils.location_resolver import resolve_location
+    print(f"Gazetteer import: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    timings, fallbacks = [], 0
+    paths = find_resumes(args.dir)
+    for path in paths:
+        text = read_pdf(path)[0]
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            location = resolve_location(text)
+        timings.append((time.perf_counter() - started) / args.repeat * 1e6)
+        fallbacks += location is None
+        found = ", ".join(v for k, v in location.items() if v and k != "full_address") if location else "-"
+        print(f"{os.path.basename(path)[:40]:40} {timings[-1]:>8.1f} us  {found}")
+    if timings:
+        print(f"median {statistics.median(timings):.1f} us per resume; "
+              f"{fallbacks} of {len(paths)} would fall back to Gemini")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
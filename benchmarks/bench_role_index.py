@@ -0,0 +1,76 @@
+# benchmarks/bench_role_index.py
+"""Measure build time, memory and query latency of the local role retrieval index.
+
+Run from the repository root, after scripts.convert_jobs_dataset:
+    python -m benchmarks.bench_role_index [--dataset Datasets/jobs_dataset] [--postings-per-role 200]
+        [--centroid-terms 5000] [--dir Uploaded_Resumes] [--repeat 20]
+
+Builds an index in this process, reporting the time taken, the index size
+and the growth in peak RSS. It then saves and reloads the index
+(memory-mapped) and times top-role and similar-posting queries for each
+sample resume.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_compact_models import _peak_rss_kb
+from utils.headless import quiet_streamlit
+
+
+def _latencies(fn, texts, repeat):
+    timings = []
+    for text in texts:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(text)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", help="Parquet jobs dataset (default: Datasets/jobs_dataset)")
+    parser.add_argument("--postings-per-role", type=int, default=200)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--centroid-terms", type=int)
+    parser.add_argument("--dir", default="Uploaded_Resumes")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from services.batch_service import find_resumes, read_pdf
+    from services.retrieval_service import RoleIndex, build_from_jobs_dataset
+
+    import pyarrow.dataset  # noqa: F401  (imports are not part of the build's memory)
+    import sklearn.feature_extraction.text  # noqa: F401
+    rss_before = _peak_rss_kb()
+    started = time.perf_counter()
+    index = build_from_jobs_dataset(args.dataset, n_features=args.n_features,
+                                    postings_per_role=args.postings_per_role, centroid_terms=args.centroid_terms)
+    build_seconds = time.perf_counter() - started
+    print(f"Built from {index.meta['documents']} postings in {build_seconds:.1f}s: {len(index.roles)} roles, "
+          f"{index.postings.shape[0]} searchable postings, centroid nnz {index.centroids.nnz}")
+    print(f"Index size {index.nbytes / 2 ** 20:.1f} MB; peak RSS grew "
+          f"{(_peak_rss_kb() - rss_before) / 1024:.0f} MB during the build")
+
+    with tempfile.TemporaryDirectory() as directory:
+        meta_path = index.save(directory)
+        started = time.perf_counter()
+        loaded = RoleIndex.load(meta_path)
+        print(f"Reload (memory-mapped, hashes verified): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        texts = [read_pdf(path)[0] for path in find_resumes(args.dir)]
+        texts = [text for text in texts if text.strip()]
+        for label, fn in (('top roles', lambda text: loaded.top_roles(text, args.k)),
+                          ('similar postings', lambda text: loaded.similar_postings(text, args.k))):
+            median, p95 = _latencies(fn, texts, args.repeat)
+            print(f"{label:17} k={args.k}: median {median:.2f} ms, p95 {p95:.2f} ms over {len(texts)} resumes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
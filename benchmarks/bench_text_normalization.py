@@ -0,0 +1,89 @@
+# benchmarks/bench_text_normalization.py
+"""Compare normalize_resume against the seven-regex reference on the sample PDFs.
+
+Run from the repository root:
+    python -m benchmarks.bench_text_normalization [--repeat 200] [--dir Uploaded_Resumes]
+
+Checks that the single-pass output (whole-document and chunked) is identical
+to the reference, reports per-document timings, and shows how many tokens of
+each serving vocabulary survive with and without the legacy RT/cc rule.
+"""
+import argparse
+import pickle
+import time
+
+from services.batch_service import find_resumes
+from utils.document_cache import get_document
+from utils.text_utils import clean_resume_reference, normalize_resume, normalize_resume_chunks
+
+VECTORIZERS = {
+    'categorization': 'models/tfidf_vectorizer_categorization.pkl',
+    'job_recommendation': 'models/tfidf_vectorizer_job_recommendation.pkl',
+}
+
+
+def _time(fn, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def _chunks(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+def _vocabulary_hits(vectorizer, text):
+    analyzer = vectorizer.build_analyzer()
+    tokens = analyzer(text)
+    return sum(1 for token in tokens if token in vectorizer.vocabulary_), len(tokens)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default="Uploaded_Resumes")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    texts = [(path, get_document(path)["text"]) for path in find_resumes(args.dir)]
+    total_ref = total_new = 0.0
+    mismatches = 0
+    print(f"{'document':45} {'chars':>8} {'reference':>11} {'single-pass':>12} {'speedup':>8}")
+    for path, text in texts:
+        expected = clean_resume_reference(text)
+        if normalize_resume(text) != expected:
+            mismatches += 1
+            print(f"MISMATCH (whole document): {path}")
+        if "".join(normalize_resume_chunks(_chunks(text, args.chunk_size))) != expected:
+            mismatches += 1
+            print(f"MISMATCH (chunked): {path}")
+        t_ref = _time(clean_resume_reference, text, args.repeat)
+        t_new = _time(normalize_resume, text, args.repeat)
+        total_ref += t_ref
+        total_new += t_new
+        print(f"{path[-45:]:45} {len(text):8d} {t_ref * 1e3:9.3f}ms {t_new * 1e3:10.3f}ms {t_ref / t_new:7.2f}x")
+    if texts:
+        print(f"{'total':45} {'':8} {total_ref * 1e3:9.3f}ms {total_new * 1e3:10.3f}ms {total_ref / total_new:7.2f}x")
+    print("outputs identical to reference" if not mismatches else f"{mismatches} mismatches")
+
+    for name, path in VECTORIZERS.items():
+        try:
+            with open(path, "rb") as f:
+                vectorizer = pickle.load(f)
+        except Exception as e:
+            print(f"{name}: vocabulary check skipped ({e})")
+            continue
+        legacy_hits = fixed_hits = legacy_total = fixed_total = 0
+        for _path, text in texts:
+            hits, total = _vocabulary_hits(vectorizer, normalize_resume(text))
+            legacy_hits, legacy_total = legacy_hits + hits, legacy_total + total
+            hits, total = _vocabulary_hits(vectorizer, normalize_resume(text, legacy_rt_cc=False))
+            fixed_hits, fixed_total = fixed_hits + hits, fixed_total + total
+        print(f"{name}: in-vocabulary tokens {legacy_hits}/{legacy_total} (legacy RT/cc) "
+              f"vs {fixed_hits}/{fixed_total} (whole-token RT/cc)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+# scripts/batch_analyze.py
+"""Headless batch analyzer.
+
+Run from the repository root:
+    python -m scripts.batch_analyze Uploaded_Resumes --workers 4 --llm stub -o results.jsonl
+
+Resumes are split into batches across worker processes and one JSON record
+per resume is written as soon as its batch finishes; throughput is
+reported on stderr.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from services.batch_service import LLM_MODES, init_worker, find_resumes, analyze_resumes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze every PDF resume in a directory.")
+    parser.add_argument("directory", help="Directory to walk for PDF resumes")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--llm", choices=LLM_MODES, default="off",
+                        help="Gemini usage: 'on' calls the API, 'off' skips it, 'stub' extracts locally")
+    parser.add_argument("-b", "--batch-size", type=int, default=16,
+                        help="Resumes per worker task; the models score each task as one batch")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--limit", type=int, help="Only analyze the first N resumes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    init_worker()
+    paths = find_resumes(args.directory)
+    if args.limit:
+        paths = paths[:args.limit]
+    if not paths:
+        print(f"No PDF files found under {args.directory}", file=sys.stderr)
+        return 1
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    failed = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=init_worker) as executor:
+            batch_size = max(1, args.batch_size)
+            batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+            futures = {executor.submit(analyze_resumes, batch, args.llm): batch for batch in batches}
+            for future in as_completed(futures):
+                try:
+                    records = future.result()
+                except Exception as e:
+                    records = [{"file": path, "llm": args.llm, "errors": {"worker": str(e)}}
+                               for path in futures[future]]
+                for record in records:
+                    if record["errors"]:
+                        failed += 1
+                    out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Analyzed {len(paths)} resumes ({failed} with errors) in {elapsed:.2f}s "
+          f"using {args.workers} workers: {len(paths) / elapsed:.2f} files/sec",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# scripts/build_role_index.py
+"""Build the local role retrieval index from the jobs dataset and register it.
+
+Run from the repository root, after scripts.convert_jobs_dataset:
+    python -m scripts.build_role_index [--dataset Datasets/jobs_dataset] [--postings-per-role 200]
+        [--n-features 262144] [--centroid-terms 5000]
+
+The index is written to models/role_index/ and registered in
+models/manifest.json as 'role_index' (format "role_index").
+"""
+import argparse
+import os
+import sys
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", help="Parquet jobs dataset (default: Datasets/jobs_dataset)")
+    parser.add_argument("--postings-per-role", type=int, default=200, help="Postings kept per role for search")
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="Hashed feature space")
+    parser.add_argument("--centroid-terms", type=int, help="Keep only the strongest terms of each role centroid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--version", default=time.strftime("%Y%m%d"), help="Version recorded in the manifest")
+    parser.add_argument("--manifest", default=None, help="Model manifest (default: models/manifest.json)")
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from services.retrieval_service import build_from_jobs_dataset
+    from utils.jobs_dataset import fingerprint, JOBS_DATASET
+    from utils.model_registry import MANIFEST_PATH, register_artifact
+
+    dataset_dir = args.dataset or JOBS_DATASET
+    if not os.path.isdir(dataset_dir):
+        print(f"{dataset_dir} not found; run python -m scripts.convert_jobs_dataset first", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    index = build_from_jobs_dataset(dataset_dir, n_features=args.n_features, seed=args.seed,
+                                    postings_per_role=args.postings_per_role, centroid_terms=args.centroid_terms)
+    manifest_path = args.manifest or MANIFEST_PATH
+    meta_path = index.save(os.path.join(os.path.dirname(manifest_path), 'role_index'))
+    register_artifact('role_index', meta_path, args.version, manifest_path=manifest_path, format='role_index',
+                      source=dataset_dir, source_sha256=fingerprint(dataset_dir))
+    print(f"Indexed {index.meta['documents']} postings into {len(index.roles)} roles "
+          f"({index.postings.shape[0]} searchable postings, {index.nbytes / 2 ** 20:.1f} MB) "
+          f"in {time.perf_counter() - started:.1f}s; registered role_index version {args.version}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
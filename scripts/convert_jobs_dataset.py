@@ -0,0 +1,39 @@
+# scripts/convert_jobs_dataset.py
+"""Convert the jobs CSV into the Role-partitioned Parquet dataset read by training and retrieval.
+
+Run from the repository root (after ``git lfs pull`` fetches the CSV):
+    python -m scripts.convert_jobs_dataset [--csv Datasets/jobs_dataset_with_features.csv]
+        [--out Datasets/jobs_dataset] [--categorical Role Experience ...]
+
+Text columns with few distinct values are dictionary-encoded; pass
+--categorical to choose them instead of inferring them from the first block.
+"""
+import argparse
+import sys
+
+from utils.jobs_dataset import JOBS_CSV, JOBS_DATASET, convert_csv
+
+LFS_POINTER_PREFIX = b'version https://git-lfs'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=JOBS_CSV)
+    parser.add_argument("--out", default=JOBS_DATASET, help="Dataset directory (replaced if it exists)")
+    parser.add_argument("--categorical", nargs="+", help="Columns to dictionary-encode (default: inferred)")
+    parser.add_argument("--block-size-mb", type=int, default=16, help="CSV bytes parsed per block")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, 'rb') as f:
+        if f.read(len(LFS_POINTER_PREFIX)) == LFS_POINTER_PREFIX:
+            print(f"{args.csv} is a git-lfs pointer; run `git lfs pull` first", file=sys.stderr)
+            return 1
+    stats = convert_csv(args.csv, args.out, categorical=args.categorical, block_size=args.block_size_mb << 20)
+    print(f"Wrote {stats['rows']} rows to {args.out} in {stats['seconds']}s: {stats['files']} files, "
+          f"{stats['bytes'] / 2 ** 20:.1f} MB; dictionary-encoded {', '.join(stats['categorical'])}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# scripts/export_compact_models.py
+"""Export the serving models to the compact NumPy format and register them.
+
+Run from the repository root:
+    python -m scripts.export_compact_models [--heads categorization job_recommendation]
+        [--distill Datasets/clean_resume_data.csv | --distill Uploaded_Resumes]
+        [--max-terms 20000] [--epsilon 1e-4]
+
+Each head's vectorizer and classifier are loaded through models/manifest.json
+and written to models/compact/<head>/, then registered as compact_<head>
+(format "compact"), which ml_service serves in preference to the pickles.
+Linear classifiers are exported as they are. Anything else (e.g. the random
+forests) is distilled first: a LogisticRegression is fitted on the same
+TF-IDF features to the original model's predictions over the --distill
+texts, a CSV with a text column or a directory of PDF resumes.
+"""
+import argparse
+import os
+import sys
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def read_texts(source, text_column):
+    """Cleaned training texts from a CSV column or from every PDF under a directory."""
+    from utils.text_utils import cleanResume
+
+    if os.path.isdir(source):
+        from services.batch_service import find_resumes, read_pdf
+        texts = [read_pdf(path)[0] for path in find_resumes(source)]
+    else:
+        import pandas as pd
+        texts = pd.read_csv(source, usecols=[text_column])[text_column].dropna().astype(str).tolist()
+    return [cleanResume(text) for text in texts]
+
+
+def distill(vectorizer, teacher, texts, C=10.0):
+    """Fit a LogisticRegression on the teacher's predictions; returns (student, agreement)."""
+    from sklearn.linear_model import LogisticRegression
+
+    X = vectorizer.transform(texts)
+    labels = teacher.predict(X)
+    if len(set(labels)) < 2:
+        raise ValueError("the distillation texts cover fewer than two of the model's classes")
+    student = LogisticRegression(C=C, max_iter=1000).fit(X, labels)
+    return student, float((student.predict(X) == labels).mean())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heads", nargs="+", choices=("categorization", "job_recommendation"),
+                        default=["categorization", "job_recommendation"])
+    parser.add_argument("--distill", help="CSV file or PDF directory used to distill non-linear models")
+    parser.add_argument("--text-column", default="Feature", help="Text column of the --distill CSV")
+    parser.add_argument("--max-terms", type=int, help="Keep weights for at most this many terms")
+    parser.add_argument("--epsilon", type=float, default=0.0, help="Drop weights at most this large")
+    parser.add_argument("--version", default=time.strftime("%Y%m%d"), help="Version recorded in the manifest")
+    parser.add_argument("--manifest", default=None, help="Model manifest (default: models/manifest.json)")
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from services.ml_service import MODEL_HEADS
+    from utils.compact_model import export_compact_model
+    from utils.model_registry import MANIFEST_PATH, ModelRegistry, ModelUnavailable, register_artifact
+
+    manifest_path = args.manifest or MANIFEST_PATH
+    registry = ModelRegistry(manifest_path)
+    texts = None
+    failed = 0
+    for head in args.heads:
+        _label_key, _top_k_key, vectorizer_key, classifier_key, compact_key = next(
+            h for h in MODEL_HEADS if h[4] == f'compact_{head}')
+        try:
+            vectorizer, classifier = registry.get(vectorizer_key), registry.get(classifier_key)
+        except ModelUnavailable as e:
+            print(f"{head}: skipped, {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        extra = {'source': classifier_key}
+        if not hasattr(classifier, 'coef_'):
+            if not args.distill:
+                print(f"{head}: {type(classifier).__name__} is not linear; pass --distill to export it",
+                      file=sys.stderr)
+                failed += 1
+                continue
+            if texts is None:
+                texts = read_texts(args.distill, args.text_column)
+            classifier, agreement = distill(vectorizer, classifier, texts)
+            extra.update(distilled=True, distill_agreement=round(agreement, 4))
+            print(f"{head}: distilled on {len(texts)} texts, {agreement:.1%} agreement with the original",
+                  file=sys.stderr)
+
+        directory = os.path.join(os.path.dirname(manifest_path), 'compact', head)
+        try:
+            meta_path = export_compact_model(vectorizer, classifier, directory,
+                                             max_terms=args.max_terms, epsilon=args.epsilon)
+        except ValueError as e:
+            print(f"{head}: skipped, {e}", file=sys.stderr)
+            failed += 1
+            continue
+        entry = register_artifact(compact_key, meta_path, args.version, manifest_path=manifest_path,
+                                  format='compact', **extra)
+        directory_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{head}: registered {compact_key} version {entry['version']} "
+              f"({directory_bytes / 1024:.0f} KB in {directory})", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
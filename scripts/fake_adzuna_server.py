@@ -0,0 +1,117 @@
+# scripts/fake_adzuna_server.py
+"""Local stand-in for the Adzuna search API, for offline latency and caching tests.
+
+Run from the repository root:
+    python -m scripts.fake_adzuna_server [--port 8765] [--latency-ms 300] [--total 200]
+
+Then point the app at it; any non-empty [adzuna] credentials in secrets.toml will do:
+    SRA_ADZUNA_BASE_URL=http://127.0.0.1:8765/v1/api/jobs streamlit run App.py
+
+GET /v1/api/jobs/<country>/search/<page> answers after the configured latency
+with deterministic postings in Adzuna's response shape. Missing app_id or
+app_key gets a 401, like the real API. GET /stats returns the request count
+per path, so tests can check what the client actually sent.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_PATH = re.compile(r'^/v1/api/jobs/(?P<country>[a-z]{2})/search/(?P<page>\d+)$')
+TITLES = ("Data Scientist", "Software Engineer", "Web Developer", "Data Analyst", "Android Developer",
+          "UI/UX Designer", "DevOps Engineer", "Product Manager")
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+
+
+def fake_results(country, what, where, page, results_per_page, total):
+    """Deterministic postings for one page of a query; ids are stable across pages and calls."""
+    first = (page - 1) * results_per_page
+    results = []
+    for n in range(first, min(first + results_per_page, total)):
+        rng = random.Random(f"{country}|{what}|{where}|{n}")
+        title = f"{what.title()} {rng.choice(('I', 'II', 'Senior', 'Lead'))}" if what else rng.choice(TITLES)
+        job_id = str(zlib.crc32(f"{country}|{what}|{where}|{n}".encode("utf-8")))
+        results.append({
+            "id": job_id,
+            "title": title,
+            "company": {"display_name": rng.choice(COMPANIES)},
+            "location": {"display_name": where.title() if where else country.upper()},
+            "description": f"{title} role. " + " ".join(rng.choice(TITLES).lower() for _ in range(30)),
+            "redirect_url": f"https://www.adzuna.example/details/{job_id}",
+            "salary_min": rng.randrange(40, 90) * 1000,
+            "salary_max": rng.randrange(90, 160) * 1000,
+            "created": f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T00:00:00Z",
+        })
+    return results
+
+
+def make_server(port=8765, latency_ms=300, total=200, host="127.0.0.1"):
+    """A ThreadingHTTPServer serving fake search pages; ``server.stats`` counts requests per path."""
+    stats = Counter()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/stats":
+                with lock:
+                    return self._reply(200, dict(stats))
+            match = SEARCH_PATH.match(url.path)
+            if not match:
+                return self._reply(404, {"exception": "NOT_FOUND"})
+            with lock:
+                stats[url.path] += 1
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if not query.get("app_id") or not query.get("app_key"):
+                return self._reply(401, {"exception": "AUTH_FAIL", "display": "Authorisation failed"})
+            time.sleep(latency_ms / 1000)
+            page = int(match.group("page"))
+            results = fake_results(match.group("country"), query.get("what", ""), query.get("where", ""),
+                                   page, int(query.get("results_per_page", 10)), total)
+            self._reply(200, {"count": total, "mean": 75000, "results": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=300, help="Delay before each search response")
+    parser.add_argument("--total", type=int, default=200, help="Postings each query matches across all pages")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.port, args.latency_ms, args.total, args.host)
+    print(f"Fake Adzuna API on http://{args.host}:{server.server_port}/v1/api/jobs "
+          f"({args.latency_ms} ms latency, {args.total} postings per query)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
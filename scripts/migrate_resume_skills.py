@@ -0,0 +1,73 @@
+# scripts/migrate_resume_skills.py
+"""Backfill resume_skill and skill_count from existing resume_data rows.
+
+Run from the repository root:
+    python -m scripts.migrate_resume_skills [--chunk-size 1000]
+
+Rows are read in id order with keyset pagination, so memory stays bounded
+however large the table is. The backfill is idempotent and can be
+interrupted and re-run; skill_count is rebuilt from resume_skill in one
+transaction at the end.
+"""
+import argparse
+import sys
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def rebuild_skill_counts(connection):
+    """Replace skill_count with a full recount of resume_skill."""
+    connection.begin()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM skill_count")
+            cursor.execute(
+                "INSERT INTO skill_count (skill, resume_count) "
+                "SELECT skill, COUNT(*) FROM resume_skill GROUP BY skill"
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=1000, help="resume_data rows per round trip")
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from utils.database import get_pool
+    from utils.skill_utils import parse_skill_list
+
+    pool = get_pool()
+    last_id = 0
+    rows_seen = pairs_written = 0
+    started = time.perf_counter()
+    while True:
+        with pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id, skills FROM resume_data WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, args.chunk_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            pairs = [(row['id'], skill) for row in rows for skill in parse_skill_list(row['skills'] or '')]
+            if pairs:
+                cursor.executemany("INSERT IGNORE INTO resume_skill (resume_id, skill) VALUES (%s, %s)", pairs)
+                pairs_written += cursor.rowcount
+        last_id = rows[-1]['id']
+        rows_seen += len(rows)
+        print(f"{rows_seen} rows scanned, {pairs_written} skills added (last id {last_id})", file=sys.stderr)
+
+    with pool.connection() as connection:
+        rebuild_skill_counts(connection)
+    print(f"Backfilled {rows_seen} rows in {time.perf_counter() - started:.1f}s; skill_count rebuilt",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# scripts/rank_candidates.py
+"""Rank resumes against one job description.
+
+Run from the repository root:
+    python -m scripts.rank_candidates Uploaded_Resumes/JD/JD_Data_Scientist.txt Uploaded_Resumes
+        [--top 20] [--keywords 30] [--explain-top 3] [--format table|jsonl] [-o shortlist.jsonl]
+
+The resume arguments are PDF files or directories to walk for PDFs. Parsed
+text and term counts come from the document cache, so re-ranking the same
+resumes against another JD only tokenizes the JD. --explain-top asks
+Gemini about the first N candidates of the shortlist.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from utils.headless import quiet_streamlit
+
+
+def _format_table(shortlist, width=8):
+    lines = [f"{'rank':>4} {'score':>6} {'coverage':>8}  {'resume':40} missing keywords"]
+    for record in shortlist:
+        lines.append(f"{record['rank']:>4} {record['score']:>6.3f} {record['coverage']:>8.0%}  "
+                     f"{os.path.basename(record['name'])[:40]:40} {', '.join(record['missing'][:width])}")
+        if record.get('explanation'):
+            lines.extend('       ' + line for line in record['explanation'].strip().splitlines())
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("job_description", help="Text file holding the job description")
+    parser.add_argument("resumes", nargs="+", help="PDF files or directories of PDFs")
+    parser.add_argument("--top", type=int, help="Shortlist size (default: every resume)")
+    parser.add_argument("--keywords", type=int, default=30, help="JD keywords to match resumes against")
+    parser.add_argument("--explain-top", type=int, default=0, help="Ask Gemini to explain the first N matches")
+    parser.add_argument("--format", choices=("table", "jsonl"), default="table")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    quiet_streamlit()
+    from services.batch_service import find_resumes
+    from services.ranking_service import explain_top, load_resumes, rank_resumes
+
+    with open(args.job_description, encoding="utf-8") as f:
+        job_description = f.read()
+    paths = []
+    for source in args.resumes:
+        paths.extend(find_resumes(source) if os.path.isdir(source) else [source])
+    if not paths:
+        print(f"No PDF files found under {' '.join(args.resumes)}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    resumes = load_resumes(paths)
+    loaded = time.perf_counter()
+    shortlist = rank_resumes(job_description, resumes, top=args.top, keywords=args.keywords)
+    ranked = time.perf_counter()
+    if args.explain_top:
+        explain_top(job_description, shortlist, resumes, args.explain_top)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.format == "jsonl":
+            for record in shortlist:
+                out.write(json.dumps(record) + "\n")
+        else:
+            out.write(_format_table(shortlist))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Ranked {len(resumes)} resumes in {ranked - loaded:.2f}s "
+          f"after loading them in {loaded - started:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+# scripts/train_models.py
+"""Train the categorization or job-recommendation model from a CSV or Parquet dataset, out of core.
+
+Run from the repository root:
+    python -m scripts.train_models categorization [--data Datasets/clean_resume_data.csv]
+    python -m scripts.train_models job_recommendation --sample 20000
+    python -m scripts.train_models job_recommendation --mode hashing --epochs 2 --max-memory-mb 1024
+
+The job model reads Datasets/jobs_dataset (scripts.convert_jobs_dataset)
+when it exists, falling back to the CSV. Either way the data is read in
+chunks and never loaded whole; the dataset's role partitions are
+interleaved, so every chunk mixes all labels as the CSV does. Rows are
+deduplicated and split into train and test sets by a hash of their
+content, so the split does not depend on row order or chunking.
+
+- ``--mode sample`` (default) keeps a seeded reservoir sample of the train
+  rows, uniform (--sample N) or stratified by label (--per-class N), can
+  oversample it to balanced classes, and fits a TfidfVectorizer and a
+  classifier on it in memory. This replaces the notebooks'
+  ``df.sample(n=20000)`` and pandas resampling loops.
+- ``--mode hashing`` trains on the full corpus with a HashingVectorizer and
+  SGDClassifier.partial_fit, one chunk at a time. The label set is
+  collected in a first pass, and memory is bounded by --max-memory-mb
+  (coefficients plus one chunk). Accuracy is measured on a reservoir
+  sample of the held-out rows. Deduplication adds a set of 64-bit row
+  hashes; pass --no-dedupe to skip it on very large corpora.
+
+The vectorizer and classifier are written to models/trained/<version>/ and
+registered in models/manifest.json under the serving names, so
+load_ml_models serves them. Their metrics and training parameters are
+recorded alongside. A compact model registered for the head is
+unregistered, because it no longer matches; re-run
+scripts.export_compact_models to serve the new model compactly.
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import random
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+from utils.headless import quiet_streamlit
+from utils.jobs_dataset import JOBS_CSV, JOBS_DATASET
+
+HEADS = {
+    'categorization': {
+        'data': os.path.join('Datasets', 'clean_resume_data.csv'),
+        'text_column': 'Feature', 'label_column': 'Category',
+        'classifier': 'random_forest', 'balance': True,
+    },
+    'job_recommendation': {
+        'data': JOBS_CSV, 'dataset': JOBS_DATASET,
+        'text_column': 'Features', 'label_column': 'Role',
+        'classifier': 'logistic_regression', 'sample': 20000,
+    },
+}
+CLASSIFIERS = ('logistic_regression', 'random_forest', 'sgd')
+# Rough in-memory cost of one byte of source text once parsed, cleaned and vectorized
+CHUNK_OVERHEAD = 6
+
+
+def row_hash(text, label):
+    """Stable 64-bit hash of a row, used for deduplication and the train/test split."""
+    digest = hashlib.blake2b(f'{label}\0{text}'.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def iter_chunks(path, text_column, label_column, chunk_rows):
+    """Yield (cleaned texts, labels) per chunk of a CSV or Parquet dataset, skipping rows missing either value."""
+    from utils.text_utils import cleanResume
+
+    if os.path.isdir(path):
+        # The dataset is partitioned by role; interleave the partitions so no chunk holds a single label
+        from utils.jobs_dataset import iter_interleaved
+        for batch in iter_interleaved([text_column, label_column], batch_rows=chunk_rows, dataset_dir=path):
+            pairs = [(text, label) for text, label in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist())
+                     if text is not None and label is not None]
+            yield [cleanResume(text) for text, _label in pairs], [label.strip() for _text, label in pairs]
+        return
+
+    import pandas as pd
+    for chunk in pd.read_csv(path, usecols=[text_column, label_column], dtype=str, chunksize=chunk_rows):
+        chunk = chunk.dropna()
+        yield [cleanResume(text) for text in chunk[text_column]], chunk[label_column].str.strip().tolist()
+
+
+def source_bytes(path):
+    """Size of the training data as text: the CSV's size, or a Parquet dataset's uncompressed size."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    import pyarrow.parquet as pq
+    total = 0
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            metadata = pq.ParquetFile(os.path.join(root, name)).metadata
+            total += sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    return total
+
+
+def iter_rows(path, text_column, label_column, chunk_rows, test_percent, dedupe=True):
+    """Yield (text, label, is_test) for every distinct row of the CSV."""
+    seen = set()
+    for texts, labels in iter_chunks(path, text_column, label_column, chunk_rows):
+        for text, label in zip(texts, labels):
+            key = row_hash(text, label)
+            if dedupe:
+                if key in seen:
+                    continue
+                seen.add(key)
+            yield text, label, key % 100 < test_percent
+
+
+class Reservoir:
+    """Uniform random sample of at most ``capacity`` items from a stream (Algorithm R)."""
+
+    def __init__(self, capacity, rng):
+        self.capacity = capacity
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+
+    def add(self, item):
+        self.seen += 1
+        if self.capacity is None or len(self.items) < self.capacity:
+            self.items.append(item)
+        else:
+            slot = self.rng.randrange(self.seen)
+            if slot < self.capacity:
+                self.items[slot] = item
+
+
+def sample_rows(rows, rng, sample=None, per_class=None, max_test_rows=5000):
+    """Reservoir-sample (text, label, is_test) rows into (train, test) lists of (text, label).
+
+    Train rows are sampled uniformly (``sample``), per label
+    (``per_class``) or kept whole; test rows are sampled uniformly.
+    """
+    test = Reservoir(max_test_rows, rng)
+    train = Reservoir(sample, rng)
+    by_label = {}
+    for text, label, is_test in rows:
+        if is_test:
+            test.add((text, label))
+        elif per_class is not None:
+            by_label.setdefault(label, Reservoir(per_class, rng)).add((text, label))
+        else:
+            train.add((text, label))
+    if per_class is not None:
+        train_rows = [row for label in sorted(by_label) for row in by_label[label].items]
+    else:
+        train_rows = train.items
+    return train_rows, test.items
+
+
+def balance(rows, rng):
+    """Oversample every label (with replacement) up to the size of the largest one."""
+    by_label = {}
+    for row in rows:
+        by_label.setdefault(row[1], []).append(row)
+    target = max((len(group) for group in by_label.values()), default=0)
+    balanced = []
+    for label in sorted(by_label):
+        group = by_label[label]
+        balanced.extend(group)
+        balanced.extend(rng.choices(group, k=target - len(group)))
+    rng.shuffle(balanced)
+    return balanced
+
+
+def make_classifier(name, seed):
+    if name == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=seed, n_jobs=-1)
+    if name == 'sgd':
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(loss='log_loss', random_state=seed)
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(max_iter=1000, random_state=seed)
+
+
+def train_sampled(args, rng):
+    """Fit TfidfVectorizer + classifier on a reservoir sample; returns (vectorizer, classifier, metrics)."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    rows = iter_rows(args.data, args.text_column, args.label_column, args.chunk_rows, args.test_percent,
+                     args.dedupe)
+    train, test = sample_rows(rows, rng, sample=args.sample, per_class=args.per_class,
+                              max_test_rows=args.max_test_rows)
+    if args.balance:
+        train = balance(train, rng)
+    if not train:
+        raise SystemExit(f"{args.data}: no usable training rows")
+    print(f"Training on {len(train)} sampled rows ({len({label for _t, label in train})} labels)", file=sys.stderr)
+
+    vectorizer = TfidfVectorizer()
+    X = vectorizer.fit_transform([text for text, _label in train])
+    classifier = make_classifier(args.classifier, args.seed).fit(X, [label for _text, label in train])
+    metrics = {'train_rows': len(train)}
+    if test:
+        predicted = classifier.predict(vectorizer.transform([text for text, _label in test]))
+        correct = sum(p == label for p, (_text, label) in zip(predicted, test))
+        metrics.update(test_rows=len(test), accuracy=round(correct / len(test), 4))
+    return vectorizer, classifier, metrics
+
+
+def train_hashing(args, rng):
+    """Fit HashingVectorizer + SGDClassifier over the whole CSV with partial_fit, in bounded memory."""
+    import numpy as np
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
+
+    def rows():
+        return iter_rows(args.data, args.text_column, args.label_column, args.chunk_rows, args.test_percent,
+                         args.dedupe)
+
+    # Pass 1: label counts (for the class list and balancing weights) and row count
+    counts = Counter(label for _text, label, is_test in rows() if not is_test)
+    if len(counts) < 2:
+        raise SystemExit(f"{args.data}: fewer than two labels among the training rows")
+    classes = np.array(sorted(counts))
+    total = sum(counts.values())
+
+    coef_bytes = len(classes) * args.n_features * 8
+    row_bytes = source_bytes(args.data) / max(1, total) * CHUNK_OVERHEAD
+    budget = args.max_memory_mb * 1024 * 1024 - coef_bytes
+    if budget <= 0:
+        raise SystemExit(f"{len(classes)} classes x {args.n_features} features need {coef_bytes >> 20} MB of "
+                         f"coefficients, over --max-memory-mb {args.max_memory_mb}; lower --n-features")
+    batch_rows = max(1, min(args.chunk_rows, int(budget / row_bytes)))
+    print(f"{total} training rows, {len(classes)} labels; batches of {batch_rows} rows, "
+          f"~{(coef_bytes + batch_rows * row_bytes) / 2 ** 20:.0f} MB", file=sys.stderr)
+
+    vectorizer = HashingVectorizer(n_features=args.n_features, alternate_sign=False)
+    classifier = SGDClassifier(loss='log_loss', alpha=args.alpha, random_state=args.seed)
+    weights = {label: total / (len(classes) * count) for label, count in counts.items()}
+    for epoch in range(args.epochs):
+        batch = []
+        for text, label, is_test in rows():
+            if is_test:
+                continue
+            batch.append((text, label))
+            if len(batch) == batch_rows:
+                _partial_fit(vectorizer, classifier, batch, classes, weights if args.balance else None, rng)
+                batch = []
+        if batch:
+            _partial_fit(vectorizer, classifier, batch, classes, weights if args.balance else None, rng)
+        print(f"Epoch {epoch + 1}/{args.epochs} done", file=sys.stderr)
+
+    # A uniform sample of the held-out rows, not the first ones, which may cover only a few labels
+    test = Reservoir(args.max_test_rows, rng)
+    for text, label, is_test in rows():
+        if is_test:
+            test.add((text, label))
+    correct = tested = 0
+    test_rows = iter(test.items)
+    while batch := list(islice(test_rows, batch_rows)):
+        predicted = classifier.predict(vectorizer.transform([text for text, _label in batch]))
+        correct += sum(p == label for p, (_text, label) in zip(predicted, batch))
+        tested += len(batch)
+    metrics = {'train_rows': total, 'epochs': args.epochs}
+    if tested:
+        metrics.update(test_rows=tested, accuracy=round(correct / tested, 4))
+    return vectorizer, classifier, metrics
+
+
+def _partial_fit(vectorizer, classifier, batch, classes, weights, rng):
+    rng.shuffle(batch)
+    labels = [label for _text, label in batch]
+    sample_weight = [weights[label] for label in labels] if weights else None
+    classifier.partial_fit(vectorizer.transform([text for text, _label in batch]), labels,
+                           classes=classes, sample_weight=sample_weight)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("head", choices=sorted(HEADS))
+    parser.add_argument("--data", "--csv", dest="data",
+                        help="Training CSV or Parquet dataset directory (default: the head's data in Datasets/)")
+    parser.add_argument("--text-column")
+    parser.add_argument("--label-column")
+    parser.add_argument("--mode", choices=("sample", "hashing"), default="sample")
+    parser.add_argument("--sample", type=int, help="Uniform reservoir of this many training rows")
+    parser.add_argument("--per-class", type=int, help="Stratified reservoir of this many rows per label")
+    parser.add_argument("--balance", action=argparse.BooleanOptionalAction,
+                        help="Oversample (sample mode) or weight (hashing mode) labels to balance them")
+    parser.add_argument("--classifier", choices=CLASSIFIERS, help="Classifier for sample mode")
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="Hashing mode feature space")
+    parser.add_argument("--alpha", type=float, default=1e-6, help="Hashing mode SGD regularization")
+    parser.add_argument("--epochs", type=int, default=1, help="Hashing mode passes over the CSV")
+    parser.add_argument("--max-memory-mb", type=int, default=1024, help="Hashing mode memory ceiling")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="CSV rows read per chunk")
+    parser.add_argument("--test-percent", type=int, default=20, help="Rows held out for the accuracy check")
+    parser.add_argument("--max-test-rows", type=int, default=5000)
+    parser.add_argument("--dedupe", action=argparse.BooleanOptionalAction, default=True,
+                        help="Drop repeated (text, label) rows, as the notebooks' drop_duplicates did")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--version", default=time.strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--manifest", default=None, help="Model manifest (default: models/manifest.json)")
+    parser.add_argument("--dry-run", action="store_true", help="Train and report, but write nothing")
+    args = parser.parse_args(argv)
+    defaults = HEADS[args.head]
+    if args.data is None and defaults.get('dataset') and os.path.isdir(defaults['dataset']):
+        args.data = defaults['dataset']
+    for option in ('data', 'text_column', 'label_column', 'classifier', 'balance', 'sample'):
+        if getattr(args, option) is None:
+            setattr(args, option, defaults.get(option))
+    if args.per_class is not None:
+        args.sample = None
+
+    quiet_streamlit()
+    from services.ml_service import MODEL_HEADS
+    from utils.jobs_dataset import fingerprint
+    from utils.model_registry import MANIFEST_PATH, file_sha256, register_artifact, unregister_artifact
+
+    if not os.path.exists(args.data):
+        print(f"{args.data} not found", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    rng = random.Random(args.seed)
+    train = train_hashing if args.mode == 'hashing' else train_sampled
+    vectorizer, classifier, metrics = train(args, rng)
+    metrics['train_seconds'] = round(time.perf_counter() - started, 1)
+    print(f"{args.head}: {metrics}", file=sys.stderr)
+    if args.dry_run:
+        return 0
+
+    manifest_path = args.manifest or MANIFEST_PATH
+    _label_key, _top_k_key, vectorizer_key, classifier_key, compact_key = next(
+        h for h in MODEL_HEADS if h[4] == f'compact_{args.head}')
+    directory = os.path.join(os.path.dirname(manifest_path), 'trained', args.version)
+    os.makedirs(directory, exist_ok=True)
+    training = {
+        'mode': args.mode, 'source': args.data, 'seed': args.seed,
+        'source_sha256': fingerprint(args.data) if os.path.isdir(args.data) else file_sha256(args.data),
+        'classifier': type(classifier).__name__,
+        **{option: getattr(args, option) for option in ('sample', 'per_class', 'balance', 'test_percent')},
+    }
+    for key, model in ((vectorizer_key, vectorizer), (classifier_key, classifier)):
+        path = os.path.join(directory, f'{key}.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        register_artifact(key, path, args.version, manifest_path=manifest_path, format='pickle',
+                          metrics=metrics, training=training)
+        print(f"Registered {key} version {args.version} ({path})", file=sys.stderr)
+    if unregister_artifact(compact_key, manifest_path):
+        print(f"Unregistered the stale {compact_key}; re-run scripts.export_compact_models to replace it",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# services/adzuna_client.py
+"""Adzuna job-search client shared by every session of the server process.
+
+Requests go through one requests.Session whose connection pool keeps
+connections to Adzuna alive between searches. Each request has separate
+connect and read timeouts. Responses are cached in memory for a TTL, keyed
+on the normalized query: country code, what, where, distance and page. A
+widget interaction that reruns the script, or another session asking the
+same thing, is answered without a round trip.
+
+search_pages() fetches several result pages at once on a bounded thread
+pool and yields them as they arrive, with postings deduplicated. Every
+request that reaches the network first takes a token from a process-wide
+rate limiter, because all sessions share one API key.
+
+The base URL comes from utils/settings.py, so scripts/fake_adzuna_server.py
+can stand in for the real API.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.settings import (
+    ADZUNA_BASE_URL, ADZUNA_CACHE_MAX_ENTRIES, ADZUNA_CACHE_TTL_SECONDS, ADZUNA_CONNECT_TIMEOUT_SECONDS,
+    ADZUNA_MAX_WORKERS, ADZUNA_POOL_SIZE, ADZUNA_RATE_BURST, ADZUNA_RATE_LIMIT_PER_MINUTE,
+    ADZUNA_READ_TIMEOUT_SECONDS
+)
+
+RESULTS_PER_PAGE = 15
+
+
+class AdzunaError(Exception):
+    """A search failed: no response, a non-200 status or a body that is not JSON."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _normalize(value):
+    return " ".join(str(value).split()).lower() if value else None
+
+
+def query_key(country_code, what=None, where=None, distance=None, page=1, results_per_page=RESULTS_PER_PAGE):
+    """The cache key of a search: case and whitespace are ignored, and distance only counts with a where."""
+    where = _normalize(where)
+    return (_normalize(country_code), _normalize(what), where,
+            int(distance) if where and distance is not None else None, int(page), int(results_per_page))
+
+
+class RateLimiter:
+    """Token bucket allowing ``per_minute`` requests a minute, in bursts of up to ``burst``; 0 disables it."""
+
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def posting_key(result):
+    """Identity of a posting for deduplication: its Adzuna id, else its URL."""
+    return result.get("id") or result.get("redirect_url")
+
+
+class AdzunaClient:
+    """Pooled, cached client for the Adzuna search endpoint."""
+
+    def __init__(self, app_id, app_key, base_url=ADZUNA_BASE_URL, connect_timeout=ADZUNA_CONNECT_TIMEOUT_SECONDS,
+                 read_timeout=ADZUNA_READ_TIMEOUT_SECONDS, cache_ttl=ADZUNA_CACHE_TTL_SECONDS,
+                 cache_max_entries=ADZUNA_CACHE_MAX_ENTRIES, pool_size=ADZUNA_POOL_SIZE,
+                 max_workers=ADZUNA_MAX_WORKERS, rate_per_minute=ADZUNA_RATE_LIMIT_PER_MINUTE,
+                 rate_burst=ADZUNA_RATE_BURST):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.hits = self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.rate_limiter = RateLimiter(rate_per_minute, rate_burst)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="adzuna")
+        self.session = requests.Session()
+        # Retry only connection failures and throttling/5xx answers, with a short backoff
+        retry = Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=("GET",), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _store(self, key, response):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def search(self, country_code, what=None, where=None, distance=None, page=1,
+               results_per_page=RESULTS_PER_PAGE, use_cache=True):
+        """Return the parsed JSON of one search page; raises AdzunaError on failure."""
+        key = query_key(country_code, what, where, distance, page, results_per_page)
+        if use_cache:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+
+        country, what, where, distance = key[:4]
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": results_per_page,
+            "content-type": "application/json",
+        }
+        if what:
+            params["what"] = what
+        if where:
+            params["where"] = where
+            if distance is not None:
+                params["distance"] = distance
+        self.rate_limiter.acquire()
+        try:
+            response = self.session.get(f"{self.base_url}/{country}/search/{int(page)}", params=params,
+                                        timeout=self.timeout)
+        except requests.RequestException as e:
+            raise AdzunaError(f"Request error: {e}") from e
+        if response.status_code != 200:
+            raise AdzunaError(f"API error: {response.status_code} - {response.text[:500]}", response.status_code)
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise AdzunaError(f"Failed to parse API response: {e}", response.status_code) from e
+        self._store(key, data)
+        return data
+
+    def search_pages(self, country_code, what=None, where=None, distance=None, max_pages=1,
+                     results_per_page=RESULTS_PER_PAGE):
+        """Yield ``(page, new_results, count)`` for pages 1..max_pages as each one arrives.
+
+        Page 1 is fetched on its own, so it can be shown at once and its
+        total count caps how many more pages exist. The remaining pages
+        are fetched concurrently on the client's thread pool and yielded
+        in completion order. Postings already yielded, by id or URL, are
+        dropped. A failed page raises AdzunaError. Pages still pending
+        are cancelled when the caller stops early.
+        """
+        seen = set()
+
+        def fresh(data):
+            results = []
+            for result in data.get("results", []):
+                key = posting_key(result)
+                if key is None or key not in seen:
+                    seen.add(key)
+                    results.append(result)
+            return results
+
+        first = self.search(country_code, what, where, distance, 1, results_per_page)
+        count = int(first.get("count") or 0)
+        yield 1, fresh(first), count
+
+        last_page = min(max_pages, math.ceil(count / results_per_page))
+        futures = {self._executor.submit(self.search, country_code, what, where, distance, page, results_per_page): page
+                   for page in range(2, last_page + 1)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], fresh(future.result()), count
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+@st.cache_resource
+def get_adzuna_client():
+    """Process-wide client built from the [adzuna] secrets, so its cache is shared by every session."""
+    return AdzunaClient(st.secrets["adzuna"]["ADZUNA_APP_ID"], st.secrets["adzuna"]["ADZUNA_API_KEY"])
@@ -1,33 +1,33 @@
+import json
+import re
+
 import streamlit as st
+from utils.gemini_utils import generate_content_cached
+from utils.location_resolver import resolve_location
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_gemini_response1(input_prompt, text):
-    """Get Gemini AI response for a single input"""
-    from utils.expensive_libraries import load_expensive_libraries
-    libs = load_expensive_libraries()
-    genai = libs['genai']
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content([input_prompt, text])
-    return response.text
-
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_gemini_response2(input_prompt, text, input):
-    """Get Gemini AI response for multiple inputs"""
-    from utils.expensive_libraries import load_expensive_libraries
-    libs = load_expensive_libraries()
-    genai = libs['genai']
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content([input_prompt, text, input])
-    return response.text
+SUMMARY_PROMPT = """
+You are an expert Applicant Tracking System (ATS) with deep knowledge in various job fields.
 
-def extract_location_from_resume(resume_text):
-    """Extract location information from resume text using Gemini AI"""
-    from utils.gemini_utils import get_gemini_response1
-    import json
-    
-    location_prompt = """
+I will provide you with a resume text below. Please analyze the entire resume content and generate a comprehensive candidate summary.
+
+Requirements:
+- Provide a brief summary of the candidate based on the resume content
+- Present the summary in bullet points format
+- Keep the summary between 100-150 words
+- Focus on key qualifications, experience, skills, and strengths
+- Highlight the candidate's professional background and potential value
+
+Resume Text:
+{resume_text}
+
+Please provide your analysis as a candidate summary in bullet points.
+"""
+
+MATCH_PROMPT = """You are an skilled ATS (Applicant Tracking System) scanner with a deep understanding of various job fields and ATS functionality, your task is to evaluate the resume against the provided job description. First the output should come as Key skills missing and then last final thoughts."""
+
+LOCATION_PROMPT = """
     You are an expert resume parser. Your task is to extract the candidate's current location information from the resume text.
-    
+
     Instructions:
     1. Look for explicit mentions of current location, address, city, state, country or postal/zip code
     2. Focus on the most recent/current location if multiple locations are present
@@ -44,38 +44,57 @@ def extract_location_from_resume(resume_text):
     6. If you can't find any location information at all, return {"location_found": false}
     7. Be specific - don't just say "United States" if you can identify the city and state
     8. IMPORTANT: Make sure you return only valid JSON, nothing else.
-    
+
     Analyze the resume carefully and extract only factual location information, not assumptions.
     """
-    
+
+
+def get_gemini_response1(input_prompt, text, timeout=None):
+    """Get Gemini AI response for a single input"""
+    return generate_content_cached([input_prompt, text], timeout=timeout)
+
+def get_gemini_response2(input_prompt, text, input, timeout=None):
+    """Get Gemini AI response for multiple inputs"""
+    return generate_content_cached([input_prompt, text, input], timeout=timeout)
+
+def summarize_candidate(resume_text, timeout=None):
+    """Generate the bullet-point candidate summary; API errors propagate."""
+    return get_gemini_response1(SUMMARY_PROMPT, resume_text, timeout=timeout)
+
+def match_candidate(resume_text, job_description, timeout=None):
+    """Evaluate the resume against a job description: missing key skills, then final thoughts."""
+    return get_gemini_response2(MATCH_PROMPT, resume_text, job_description, timeout=timeout)
+
+def locate_candidate(resume_text, timeout=None):
+    """Extract location information as a dict without touching the UI.
+
+    The offline gazetteer answers first; Gemini is only asked when no header
+    line has a postal code, "City, ST" or two agreeing places. Safe to run
+    off the script thread; failures are reported in the ``error`` field
+    instead of with st.error.
+    """
+    location = resolve_location(resume_text)
+    if location is not None:
+        return location
     try:
-        response = get_gemini_response1(location_prompt, resume_text)
-        
-    
-        
-        # Try to clean the response if it's not valid JSON
-        # Sometimes AI models add extra text before or after the JSON
-        if response:
-            # Try to find JSON-like content between braces
-            import re
-            json_match = re.search(r'(\{.*\})', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                try:
-                    # Parse and validate the JSON
-                    location_data = json.loads(json_str)
-                    return location_data
-                except json.JSONDecodeError:
-                    st.error("Could not parse location data as JSON")
-                    # Return a default valid format
-                    return {"location_found": False, "error": "Invalid JSON format"}
-            else:
-                st.error("No JSON-like content found in response")
-                return {"location_found": False, "error": "No JSON content found"}
-        else:
-            st.error("Empty response from Gemini API")
-            return {"location_found": False, "error": "Empty API response"}
-            
+        response = get_gemini_response1(LOCATION_PROMPT, resume_text, timeout=timeout)
     except Exception as e:
-        st.error(f"Error extracting location: {str(e)}")
-        return {"location_found": False, "error": str(e)}
\ No newline at end of file
+        return {"location_found": False, "error": str(e)}
+
+    # Sometimes AI models add extra text before or after the JSON
+    if not response:
+        return {"location_found": False, "error": "Empty API response"}
+    json_match = re.search(r'(\{.*\})', response, re.DOTALL)
+    if not json_match:
+        return {"location_found": False, "error": "No JSON content found"}
+    try:
+        return json.loads(json_match.group(1))
+    except json.JSONDecodeError:
+        return {"location_found": False, "error": "Invalid JSON format"}
+
+def extract_location_from_resume(resume_text):
+    """Extract location information from resume text, using Gemini AI only when the gazetteer cannot"""
+    location_data = locate_candidate(resume_text)
+    if location_data.get("error"):
+        st.error(f"Error extracting location: {location_data['error']}")
+    return location_data
@@ -0,0 +1,88 @@
+# services/async_ai_service.py
+"""Background fan-out of the per-resume Gemini calls.
+
+A single asyncio event loop runs on a daemon thread for the whole process.
+Each session owns an AsyncAIClient whose semaphore caps how many of its
+calls are in flight at once, and every call is bounded by a timeout. Calls
+are submitted as soon as the resume text is known and return
+concurrent.futures.Future objects, so a Streamlit rerun can pick up
+results that finished in the meantime instead of waiting on each call in
+turn.
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+from services.ai_service import locate_candidate, summarize_candidate
+from utils.settings import AI_CALL_TIMEOUT_SECONDS, AI_SESSION_CONCURRENCY
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """Return the process-wide background event loop, starting it on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="ai-event-loop", daemon=True).start()
+    return _loop
+
+
+class AsyncAIClient:
+    """Runs blocking Gemini calls on the background loop with a concurrency cap and timeouts."""
+
+    def __init__(self, max_concurrency=AI_SESSION_CONCURRENCY, timeout=AI_CALL_TIMEOUT_SECONDS):
+        self.loop = get_event_loop()
+        self.timeout = timeout
+        self.tasks = {}
+        self.errors = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(self, fn, args):
+        async with self._semaphore:
+            return await asyncio.wait_for(
+                asyncio.to_thread(fn, *args, timeout=self.timeout), self.timeout
+            )
+
+    def submit(self, name, fn, *args):
+        """Start ``fn(*args, timeout=...)`` in the background under ``name``.
+
+        A call already submitted under the same name is reused.
+        """
+        if name not in self.tasks:
+            self.tasks[name] = asyncio.run_coroutine_threadsafe(self._run(fn, args), self.loop)
+        return self.tasks[name]
+
+    def done(self, name):
+        """Whether the named call has finished (successfully or not)."""
+        return name in self.tasks and self.tasks[name].done()
+
+    def result(self, name, default=None):
+        """Wait for the named call and return its result, or ``default`` on error or timeout.
+
+        The failure is kept in ``errors[name]`` for the UI to report.
+        """
+        future = self.tasks.get(name)
+        if future is None:
+            return default
+        try:
+            return future.result(timeout=self.timeout)
+        except (concurrent.futures.TimeoutError, asyncio.TimeoutError):
+            self.errors[name] = f"timed out after {self.timeout}s"
+        except Exception as e:
+            self.errors[name] = str(e)
+        return default
+
+    def cancel_all(self):
+        """Cancel every call that has not finished yet."""
+        for future in self.tasks.values():
+            future.cancel()
+
+
+def start_resume_analysis(client, resume_text):
+    """Submit the resume-level calls that only need the text: location and summary."""
+    client.submit('location', locate_candidate, resume_text)
+    client.submit('summary', summarize_candidate, resume_text)
+    return client
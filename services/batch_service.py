@@ -0,0 +1,137 @@
+# services/batch_service.py
+import os
+import re
+import time
+
+from utils.headless import quiet_streamlit
+
+LLM_MODES = ("on", "off", "stub")
+NO_OF_COURSES = 4
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PHONE_PATTERN = re.compile(r'\+?\(?\d[\d ().-]{8,}\d')
+
+
+def init_worker():
+    """Silence Streamlit's bare-mode warnings in headless worker processes."""
+    quiet_streamlit()
+
+
+def find_resumes(directory):
+    """Walk a directory and return the sorted paths of all PDF files in it."""
+    paths = []
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith('.pdf'):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def read_pdf(pdf_path):
+    """Return the text, page count and content hash of a PDF, parsing it at most once across runs."""
+    from utils.document_cache import get_document
+    document = get_document(pdf_path)
+    return document["text"], document["no_of_pages"], document["sha256"]
+
+
+def stub_resume_data(text, no_of_pages):
+    """Build an extraction result locally, in the shape Gemini returns, without any network call."""
+    from services.recommendation_service import load_recommendation_data
+    text_lower = text.lower()
+    skills = []
+    for keyword in load_recommendation_data()['keyword_index']:
+        if re.search(r'(?<!\w)' + re.escape(keyword).replace(r'\ ', r'\s+') + r'(?!\w)', text_lower):
+            skills.append(keyword)
+
+    email_match = EMAIL_PATTERN.search(text)
+    phone_match = PHONE_PATTERN.search(text)
+    first_line = text.strip().split('\n', 1)[0] if text.strip() else ""
+    return {
+        "name": first_line.strip()[:255],
+        "email": email_match.group(0) if email_match else "",
+        "mobile_number": phone_match.group(0).strip() if phone_match else "",
+        "skills": skills[:10],
+        "no_of_pages": no_of_pages
+    }
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def analyze_resumes(pdf_paths, llm_mode="off"):
+    """Run the full analysis pipeline on a batch of PDFs and return one JSON-serialisable record each.
+
+    Both classifiers run once over the whole batch. Each stage is guarded on
+    its own, so a failing stage is reported in ``errors`` and the remaining
+    stages still run.
+    """
+    from services.ml_service import predict_batch
+    from services.recommendation_service import (
+        load_recommendation_data, match_skill_domain, missing_skills, rank_domains, recommend_courses
+    )
+
+    started = time.perf_counter()
+    records, texts = [], []
+    for pdf_path in pdf_paths:
+        record = {"file": pdf_path, "llm": llm_mode, "errors": {}}
+        records.append(record)
+        try:
+            text, no_of_pages, sha256 = read_pdf(pdf_path)
+        except Exception as e:
+            record["errors"]["pdf"] = str(e)
+            continue
+        record["sha256"] = sha256
+        record["no_of_pages"] = no_of_pages
+        texts.append((record, text))
+
+        resume_data = {"skills": []}
+        if llm_mode == "on":
+            from utils.pdf_utils import extract_resume_data_with_gemini
+            try:
+                resume_data = extract_resume_data_with_gemini(pdf_path)
+            except Exception as e:
+                record["errors"]["llm"] = str(e)
+        elif llm_mode == "stub":
+            resume_data = stub_resume_data(text, no_of_pages)
+        for key in ("name", "email", "mobile_number"):
+            if key in resume_data:
+                record[key] = resume_data[key]
+        record["skills"] = resume_data.get("skills", [])
+
+        try:
+            rec_data = load_recommendation_data()
+            ranking = rank_domains(record["skills"], rec_data)
+            record["skill_domains"] = [
+                {"domain": entry["domain"], "confidence": round(entry["confidence"], 3)} for entry in ranking
+            ]
+            recommended_skills, _course_list = match_skill_domain(record["skills"], rec_data, ranking)
+            record["recommended_skills"] = list(recommended_skills)
+            courses = recommend_courses(
+                rec_data["course_index"], missing_skills(recommended_skills, record["skills"]),
+                ranking, NO_OF_COURSES, seed=record["sha256"]
+            )
+            record["recommended_courses"] = [c_name for c_name, _c_link in courses]
+        except Exception as e:
+            record["errors"]["recommendations"] = str(e)
+
+    if texts:
+        try:
+            predictions = predict_batch([text for _record, text in texts])
+            for (record, _text), prediction in zip(texts, predictions):
+                # A model that cannot be served only fails its own field
+                record["errors"].update(prediction.pop("unavailable"))
+                record.update(prediction)
+        except Exception as e:
+            for record, _text in texts:
+                record["errors"]["models"] = str(e)
+
+    elapsed_ms = _elapsed_ms(started)
+    for record in records:
+        record["batch_elapsed_ms"] = elapsed_ms
+    return records
+
+
+def analyze_resume(pdf_path, llm_mode="off"):
+    """Run the full analysis pipeline on one PDF."""
+    return analyze_resumes([pdf_path], llm_mode)[0]
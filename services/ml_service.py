@@ -1,22 +1,162 @@
 import streamlit as st
+from collections import Counter
 from utils.text_utils import cleanResume
-from utils.model_loader import load_ml_models
+from utils.model_loader import load_model
+from utils.model_registry import ModelUnavailable
+
+# (label key, top-k key, vectorizer, classifier, compact model) for each model head;
+# the compact model (scripts/export_compact_models.py) is served when registered
+MODEL_HEADS = (
+    ('predicted_category', 'category_top_k', 'tfidf_vectorizer_categorization', 'rf_classifier_categorization',
+     'compact_categorization'),
+    ('recommended_job', 'job_top_k', 'tfidf_vectorizer_job_recommendation', 'rf_classifier_job_recommendation',
+     'compact_job_recommendation'),
+)
+
+_ANALYZER_PARAMS = ('analyzer', 'lowercase', 'preprocessor', 'tokenizer', 'token_pattern',
+                    'stop_words', 'strip_accents', 'ngram_range')
+
+
+def _shares_analyzer(vectorizers):
+    """True when every vectorizer tokenizes text identically."""
+    first = vectorizers[0].get_params()
+    return all(
+        all(v.get_params()[p] == first[p] for p in _ANALYZER_PARAMS) for v in vectorizers[1:]
+    )
+
+
+def _is_plain_tfidf(vectorizer):
+    """True for the default TF-IDF weighting that _tfidf_from_counts reproduces."""
+    params = vectorizer.get_params()
+    # HashingVectorizer has neither idf weights nor a vocabulary
+    return (params.get('use_idf', False) and params['norm'] == 'l2' and not params['sublinear_tf']
+            and not params['binary'])
+
+
+def _tfidf_from_counts(doc_counts, vectorizer):
+    """Build the TF-IDF matrix of pre-tokenized documents against one vocabulary."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from sklearn.preprocessing import normalize
+
+    vocabulary = vectorizer.vocabulary_
+    indptr, indices, values = [0], [], []
+    for counts in doc_counts:
+        for term, count in counts.items():
+            index = vocabulary.get(term)
+            if index is not None:
+                indices.append(index)
+                values.append(count)
+        indptr.append(len(indices))
+    counts_matrix = csr_matrix(
+        (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(doc_counts), len(vocabulary))
+    )
+    counts_matrix.sort_indices()
+    return normalize(counts_matrix.multiply(vectorizer.idf_).tocsr(), norm='l2', copy=False)
+
+
+def _native(value):
+    """Convert numpy scalars (e.g. np.str_ labels) to plain Python values."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _top_k(classifier, X, top_k):
+    """Return (labels, [[(label, score), ...], ...]) for a batch."""
+    import numpy as np
+
+    if hasattr(classifier, 'predict_proba'):
+        scores = classifier.predict_proba(X)
+    elif hasattr(classifier, 'decision_function'):
+        scores = classifier.decision_function(X)
+        if scores.ndim == 1:
+            scores = np.column_stack([-scores, scores])
+    else:
+        labels = [_native(label) for label in classifier.predict(X)]
+        return labels, [[(label, None)] for label in labels]
+
+    classes = classifier.classes_
+    k = min(top_k, scores.shape[1])
+    order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    labels = [_native(label) for label in classes[order[:, 0]]]
+    ranked = [[(_native(classes[j]), float(row[j])) for j in row_order] for row, row_order in zip(scores, order)]
+    return labels, ranked
+
+
+def _available_heads():
+    """Return ([(head, vectorizer, classifier)], {label_key: error}) for the heads that can be served.
+
+    A head served by its compact model has no vectorizer: the compact
+    model scores cleaned text directly.
+    """
+    heads, unavailable = [], {}
+    for head in MODEL_HEADS:
+        try:
+            heads.append((head, None, load_model(head[4])))
+            continue
+        except ModelUnavailable:
+            pass
+        try:
+            heads.append((head, load_model(head[2]), load_model(head[3])))
+        except ModelUnavailable as e:
+            unavailable[head[0]] = str(e)
+    return heads, unavailable
+
+
+def predict_batch(resume_texts, top_k=3):
+    """Run both models over a batch of resumes.
+
+    Each text is cleaned and tokenized once; both TF-IDF matrices are built
+    from the shared token counts and each classifier runs once on the whole
+    batch. Returns one dict per resume with ``predicted_category`` and
+    ``recommended_job`` plus ``category_top_k``/``job_top_k`` lists of
+    (label, score) pairs. A head whose models cannot be loaded yields None
+    and an empty list, with the reason under ``unavailable[label_key]``.
+    """
+    heads, unavailable = _available_heads()
+    cleaned = [cleanResume(text) for text in resume_texts]
+    results = []
+    for _ in cleaned:
+        result = {'unavailable': dict(unavailable)}
+        for label_key, top_k_key, *_models in MODEL_HEADS:
+            if label_key in unavailable:
+                result[label_key] = None
+                result[top_k_key] = []
+        results.append(result)
+    if not heads:
+        return results
+
+    vectorizers = [vectorizer for _head, vectorizer, _classifier in heads if vectorizer is not None]
+    doc_counts = None
+    if vectorizers and _shares_analyzer(vectorizers):
+        analyzer = vectorizers[0].build_analyzer()
+        doc_counts = [Counter(analyzer(text)) for text in cleaned]
+
+    for (label_key, top_k_key, *_models), vectorizer, classifier in heads:
+        if vectorizer is None:
+            X = cleaned
+        elif doc_counts is not None and _is_plain_tfidf(vectorizer):
+            X = _tfidf_from_counts(doc_counts, vectorizer)
+        else:
+            X = vectorizer.transform(cleaned)
+        labels, ranked = _top_k(classifier, X, top_k)
+        for result, label, top in zip(results, labels, ranked):
+            result[label_key] = label
+            result[top_k_key] = top
+    return results
+
 
 @st.cache_data
+def analyze_resume_text(resume_text, top_k=3):
+    """Run both models on a single resume (a batch of one)."""
+    return predict_batch([resume_text], top_k=top_k)[0]
+
+
 def predict_category(resume_text):
     """Predict the resume category."""
-    models = load_ml_models()
-    resume_text = cleanResume(resume_text)
-    resume_tfidf = models['tfidf_vectorizer_categorization'].transform([resume_text])
-    predicted_category = models['rf_classifier_categorization'].predict(resume_tfidf)[0]
-    return predicted_category
+    return analyze_resume_text(resume_text)['predicted_category']
 
 
-@st.cache_data
 def job_recommendation(resume_text):
     """Recommend a job based on resume text."""
-    models = load_ml_models()
-    resume_text = cleanResume(resume_text)
-    resume_tfidf = models['tfidf_vectorizer_job_recommendation'].transform([resume_text])
-    recommended_job = models['rf_classifier_job_recommendation'].predict(resume_tfidf)[0]
-    return recommended_job
\ No newline at end of file
+    return analyze_resume_text(resume_text)['recommended_job']
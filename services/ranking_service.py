@@ -0,0 +1,140 @@
+# services/ranking_service.py
+"""Rank a batch of resumes against one job description.
+
+Each document is reduced once to its term counts, with stop words dropped.
+The counts are stored in the document cache as an extraction, so later
+rankings of the same PDF skip both parsing and tokenizing. For a ranking,
+the counts of the JD and of every resume become one CSR matrix, weighted
+by sublinear TF and by IDF over that pool and L2-normalized. The scores
+are then a single sparse product of the resume rows with the JD row.
+
+The JD's most repeated terms are its keywords. Each resume's matched
+and missing keywords are read from the same matrix. Gemini is only asked
+to explain the top of the shortlist, and only when requested.
+"""
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+
+from services.retrieval_service import top_k
+from utils.document_cache import get_document, put_extraction
+from utils.text_utils import normalize_resume
+from utils.upload_store import upload_name
+
+TERM_COUNTS_EXTRACTION = 'term_counts_v1'
+JD_KEYWORDS = 30
+
+_TOKEN = re.compile(r'\b[a-z][a-z0-9]+\b')
+
+
+def term_counts(text):
+    """{term: count} of lower-cased words, stop words and bare numbers excluded."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    # Whole-token RT/cc removal, so words like "accuracy" survive cleaning
+    tokens = _TOKEN.findall(normalize_resume(text or '', legacy_rt_cc=False).lower())
+    return dict(Counter(token for token in tokens if token not in ENGLISH_STOP_WORDS))
+
+
+def document_terms(document):
+    """Term counts of a document cache entry, computed once and stored with it."""
+    counts = document['extractions'].get(TERM_COUNTS_EXTRACTION)
+    if counts is None:
+        counts = term_counts(document['text'])
+        document['extractions'][TERM_COUNTS_EXTRACTION] = counts
+        put_extraction(document['sha256'], TERM_COUNTS_EXTRACTION, counts)
+    return counts
+
+
+def load_resumes(pdf_files, names=None):
+    """[(name, document)] for PDFs given as paths or uploads, one per distinct content.
+
+    Documents come from the document cache, so only new PDFs are parsed.
+    Stored uploads (utils/upload_store.py) are named by their original
+    filename rather than their hash.
+    """
+    resumes, seen = [], set()
+    for i, pdf_file in enumerate(pdf_files):
+        document = get_document(pdf_file)
+        if document['sha256'] in seen:
+            continue
+        seen.add(document['sha256'])
+        name = names[i] if names else getattr(pdf_file, 'name', None) or upload_name(pdf_file) or str(pdf_file)
+        resumes.append((name, document))
+    return resumes
+
+
+def _weights(counts):
+    """L2-normalized sublinear TF-IDF rows for a list of term counts, with the term of each column."""
+    from sklearn.feature_extraction import DictVectorizer
+    from sklearn.preprocessing import normalize
+
+    vectorizer = DictVectorizer(dtype=np.float32)
+    X = vectorizer.fit_transform(counts).tocsr()
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = (np.log((1 + X.shape[0]) / (1 + df)) + 1).astype(np.float32)
+    X.data = 1 + np.log(X.data)
+    return normalize(X.multiply(idf).tocsr(), copy=False), vectorizer.feature_names_
+
+
+def rank_resumes(job_description, resumes, top=None, keywords=JD_KEYWORDS):
+    """Score ``resumes`` ([(name, document)]) against the JD text; returns the shortlist, best first.
+
+    Each record holds ``rank``, ``name``, ``sha256``, ``score`` (cosine
+    similarity), ``coverage`` (the share of JD keywords present) and the
+    ``matched`` and ``missing`` keywords. ``top`` limits the shortlist.
+    """
+    if not resumes:
+        return []
+    jd_counts = term_counts(job_description)
+    X, terms = _weights([jd_counts] + [document_terms(doc) for _name, doc in resumes])
+    jd, X = X[0], X[1:]
+    scores = (X @ jd.T).toarray().ravel()
+
+    # Keywords are the JD's most repeated terms; TF-IDF weight breaks ties, so pool-wide words come last
+    jd_weights = jd.toarray().ravel()
+    columns = {term: i for i, term in enumerate(terms)}
+    ranked_terms = sorted(jd_counts, key=lambda term: (-jd_counts[term], -jd_weights[columns[term]]))
+    keyword_columns = np.array([columns[term] for term in ranked_terms[:keywords]], dtype=np.intp)
+    present = (X[:, keyword_columns] > 0).toarray()
+
+    shortlist = []
+    for rank, i in enumerate(top_k(scores, top or len(scores)), start=1):
+        name, document = resumes[i]
+        matched = [terms[c] for c, hit in zip(keyword_columns, present[i]) if hit]
+        missing = [terms[c] for c, hit in zip(keyword_columns, present[i]) if not hit]
+        shortlist.append({
+            'rank': rank,
+            'name': name,
+            'sha256': document['sha256'],
+            'score': round(float(scores[i]), 4),
+            'coverage': round(len(matched) / len(keyword_columns), 4) if len(keyword_columns) else 0.0,
+            'matched': matched,
+            'missing': missing,
+        })
+    return shortlist
+
+
+def explain_top(job_description, shortlist, resumes, n, client=None):
+    """Add a Gemini match explanation to the first ``n`` shortlist records only.
+
+    The calls run concurrently on an AsyncAIClient. A failed call leaves
+    ``explanation`` as None and records the reason in ``explanation_error``.
+    """
+    from services.ai_service import match_candidate
+    from services.async_ai_service import AsyncAIClient
+
+    client = client or AsyncAIClient()
+    texts = {document['sha256']: document['text'] for _name, document in resumes}
+    jd_key = hashlib.sha256(job_description.encode('utf-8')).hexdigest()[:12]
+    names = []
+    for record in shortlist[:n]:
+        name = f"explain_{jd_key}_{record['sha256']}"
+        client.submit(name, match_candidate, texts[record['sha256']], job_description)
+        names.append(name)
+    for record, name in zip(shortlist, names):
+        record['explanation'] = client.result(name)
+        if name in client.errors:
+            record['explanation_error'] = client.errors[name]
+    return shortlist
@@ -1,12 +1,82 @@
+import hashlib
+import heapq
+import re
 import streamlit as st
-import random
 from Recommendor.Skills import ds_keyword, ds_skills, web_keyword, web_skills, android_keyword, android_skills, ios_keyword, ios_skills, uiux_keyword, uiux_skills
 from Recommendor.Courses import ds_course, web_course, android_course, ios_course, uiux_course
 
+# (domain, key prefix in the recommendation data), in tie-break order
+DOMAINS = (
+    ('Data Science', 'ds'),
+    ('Web Development', 'web'),
+    ('Android Development', 'android'),
+    ('IOS Development', 'ios'),
+    ('UI-UX Development', 'uiux'),
+)
+
+
+def normalize_keyword(text):
+    """Lower-case and collapse whitespace, so 'node jS' and 'Node  JS' compare equal."""
+    return ' '.join(str(text).lower().split())
+
+
+def build_keyword_index(domain_keywords):
+    """Map each normalized keyword to a tuple of (domain, weight).
+
+    A keyword shared by several domains (e.g. 'flask') splits its weight
+    between them, so it counts as weaker evidence for each.
+    """
+    domains_by_keyword = {}
+    for domain, keywords in domain_keywords:
+        for keyword in keywords:
+            key = normalize_keyword(keyword)
+            domains = domains_by_keyword.setdefault(key, [])
+            if domain not in domains:
+                domains.append(domain)
+    return {
+        keyword: tuple((domain, 1.0 / len(domains)) for domain in domains)
+        for keyword, domains in domains_by_keyword.items()
+    }
+
+
+def course_terms(text):
+    """Normalize a course title or skill for term matching: 'Node.js' and 'node JS' both become 'node js'."""
+    return ' '.join(re.sub(r'[^a-z0-9#+]+', ' ', str(text).lower()).split())
+
+
+def build_course_index(domain_courses, skill_terms):
+    """Index courses by domain and by every skill term their title mentions.
+
+    Returns {'courses': ((domain, name, link), ...), 'by_domain': {domain:
+    course ids}, 'by_skill': {term: course ids}}, all immutable so the
+    cached index can be shared by every session without copying.
+    """
+    courses = []
+    seen = set()
+    for domain, course_list in domain_courses:
+        for name, link in course_list:
+            if (name, link) not in seen:
+                seen.add((name, link))
+                courses.append((domain, name, link))
+    terms = {course_terms(term) for term in skill_terms} - {''}
+    by_domain, by_skill = {}, {}
+    for course_id, (domain, name, _link) in enumerate(courses):
+        by_domain.setdefault(domain, []).append(course_id)
+        title = f' {course_terms(name)} '
+        for term in terms:
+            if f' {term} ' in title:
+                by_skill.setdefault(term, []).append(course_id)
+    return {
+        'courses': tuple(courses),
+        'by_domain': {domain: tuple(ids) for domain, ids in by_domain.items()},
+        'by_skill': {term: tuple(ids) for term, ids in by_skill.items()},
+    }
+
+
 @st.cache_resource
 def load_recommendation_data():
-    """Load recommendation data"""
-    return {
+    """Load recommendation data and build the keyword index once"""
+    data = {
         'ds_keyword': ds_keyword, 'ds_skills': ds_skills,
         'web_keyword': web_keyword, 'web_skills': web_skills,
         'android_keyword': android_keyword, 'android_skills': android_skills,
@@ -16,18 +86,84 @@ def load_recommendation_data():
         'android_course': android_course, 'ios_course': ios_course,
         'uiux_course': uiux_course
     }
+    data['keyword_index'] = build_keyword_index(
+        [(domain, data[f'{prefix}_keyword']) for domain, prefix in DOMAINS]
+    )
+    data['course_index'] = build_course_index(
+        [(domain, data[f'{prefix}_course']) for domain, prefix in DOMAINS],
+        [term for _domain, prefix in DOMAINS for term in data[f'{prefix}_skills'] + data[f'{prefix}_keyword']]
+    )
+    return data
+
+
+def rank_domains(skills, rec_data):
+    """Score every domain in one pass over the skills and return them ranked.
+
+    Returns a list of {'domain', 'key', 'score', 'confidence', 'matched'}
+    for domains with at least one matching skill, best first; confidence
+    is the domain's share of the total score. Ties keep DOMAINS order, so
+    the result no longer depends on the order of the skills.
+    """
+    index = rec_data['keyword_index']
+    scores = {}
+    matched = {}
+    for skill in dict.fromkeys(normalize_keyword(skill) for skill in skills):
+        for domain, weight in index.get(skill, ()):
+            scores[domain] = scores.get(domain, 0.0) + weight
+            matched.setdefault(domain, []).append(skill)
+    total = sum(scores.values())
+    ranked = [
+        {'domain': domain, 'key': prefix, 'score': scores[domain],
+         'confidence': scores[domain] / total, 'matched': matched[domain]}
+        for domain, prefix in DOMAINS if domain in scores
+    ]
+    ranked.sort(key=lambda entry: -entry['score'])
+    return ranked
+
+
+def match_skill_domain(skills, rec_data, ranking=None):
+    """Return (recommended_skills, course_list) for the best-scoring domain."""
+    ranking = rank_domains(skills, rec_data) if ranking is None else ranking
+    if not ranking:
+        return [], []
+    prefix = ranking[0]['key']
+    return rec_data[f'{prefix}_skills'], rec_data[f'{prefix}_course']
+
+
+def missing_skills(recommended_skills, skills):
+    """Recommended skills the candidate does not already list."""
+    have = {normalize_keyword(skill) for skill in skills}
+    return [skill for skill in recommended_skills if normalize_keyword(skill) not in have]
+
+
+def recommend_courses(course_index, skill_gaps, ranking, k=4, seed=0):
+    """Return the top-k (name, link) courses for a candidate, deterministically.
+
+    A course scores one point per missing skill its title covers plus the
+    confidence of its domain in ``ranking``. Equal scores are broken by a
+    hash of the seed and the title, so the order is reproducible for a
+    given seed and the shared index is never copied or mutated.
+    """
+    scores = {}
+    for entry in ranking:
+        for course_id in course_index['by_domain'].get(entry['domain'], ()):
+            scores[course_id] = entry['confidence']
+    for term in {course_terms(skill) for skill in skill_gaps}:
+        for course_id in course_index['by_skill'].get(term, ()):
+            scores[course_id] = scores.get(course_id, 0.0) + 1
+
+    courses = course_index['courses']
+
+    def rank_key(course_id):
+        tie = hashlib.sha256(f'{seed}:{courses[course_id][1]}'.encode('utf-8')).digest()
+        return -scores[course_id], tie
+
+    return [courses[course_id][1:] for course_id in heapq.nsmallest(k, scores, key=rank_key)]
 
 
-def course_recommender(course_list):
+def course_recommender(courses):
+    """Render already-selected (name, link) courses and return their names."""
     st.subheader("**Courses & Certificates Recommendations**")
-    c = 0
-    rec_course = []
-    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 4)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
+    for c, (c_name, c_link) in enumerate(courses, 1):
         st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_reco:
-            break
-    return rec_course
\ No newline at end of file
+    return [c_name for c_name, _c_link in courses]
@@ -0,0 +1,236 @@
+# services/retrieval_service.py
+"""Local resume-to-role retrieval over the jobs corpus.
+
+A RoleIndex holds L2-normalized hashed TF-IDF vectors (HashingVectorizer
+counts weighted by the corpus IDF) for a per-role sample of postings, plus
+one normalized centroid per role built from every posting. A query is one
+sparse matrix product followed by np.argpartition, so it runs locally in
+milliseconds.
+
+The index is built by scripts/build_role_index.py and saved as .npy
+arrays plus a meta.json. It is registered in models/manifest.json as
+'role_index', and the arrays are memory-mapped on load like the compact
+models.
+"""
+import json
+import os
+import random
+
+import numpy as np
+
+from utils.model_registry import file_sha256
+from utils.text_utils import cleanResume
+
+INDEX_FORMAT = 1
+ARRAYS = ('idf', 'roles', 'posting_roles', 'posting_rows', 'posting_snippets')
+MATRICES = ('centroids', 'postings')
+SNIPPET_BYTES = 160
+
+
+def _vectorizer(n_features):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, dtype=np.float32)
+
+
+def _tfidf(vectorizer, idf, texts):
+    """L2-normalized TF-IDF rows of already-cleaned texts."""
+    from sklearn.preprocessing import normalize
+    return normalize(vectorizer.transform(texts).multiply(idf).tocsr(), copy=False)
+
+
+def top_k(scores, k):
+    """Indices of the ``k`` largest scores, best first; only those k are sorted."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def _prune_rows(matrix, max_terms):
+    """Keep the ``max_terms`` largest weights of each CSR row, then renormalize."""
+    from scipy.sparse import csr_matrix
+    from sklearn.preprocessing import normalize
+
+    indptr, indices, data = [0], [], []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        keep = np.arange(start, end)
+        if end - start > max_terms:
+            keep = start + np.argpartition(-matrix.data[start:end], max_terms - 1)[:max_terms]
+            keep.sort()
+        indices.append(matrix.indices[keep])
+        data.append(matrix.data[keep])
+        indptr.append(indptr[-1] + len(keep))
+    pruned = csr_matrix((np.concatenate(data) if data else np.empty(0, np.float32),
+                         np.concatenate(indices) if indices else np.empty(0, np.int32),
+                         np.asarray(indptr)), shape=matrix.shape)
+    return normalize(pruned, copy=False)
+
+
+def build_role_index(read_chunks, n_features=2 ** 18, postings_per_role=200, centroid_terms=None, seed=0):
+    """Build a RoleIndex from ``read_chunks()``, which returns an iterator of (texts, roles) lists.
+
+    Two passes: the first counts document frequencies and roles, and the
+    second builds the centroids from every posting. It also keeps a
+    seeded reservoir of ``postings_per_role`` postings per role for
+    posting-level search. Memory holds the centroids and the reservoirs,
+    never the corpus.
+    """
+    from scipy.sparse import csr_matrix, vstack
+    from sklearn.preprocessing import normalize
+
+    vectorizer = _vectorizer(n_features)
+    df = np.zeros(n_features, dtype=np.int64)
+    role_counts = {}
+    n_docs = 0
+    for texts, roles in read_chunks():
+        counts = vectorizer.transform([cleanResume(text) for text in texts])
+        df += np.bincount(counts.indices, minlength=n_features)
+        n_docs += counts.shape[0]
+        for role in roles:
+            role_counts[role] = role_counts.get(role, 0) + 1
+    if not n_docs:
+        raise ValueError("no postings to index")
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    role_names = sorted(role_counts)
+    role_ids = {role: i for i, role in enumerate(role_names)}
+
+    rng = random.Random(seed)
+    centroid_sum = csr_matrix((len(role_names), n_features), dtype=np.float32)
+    reservoirs = {role: [] for role in role_names}
+    seen = dict.fromkeys(role_names, 0)
+    row_number = 0
+    for texts, roles in read_chunks():
+        X = _tfidf(vectorizer, idf, [cleanResume(text) for text in texts])
+        ids = np.fromiter((role_ids[role] for role in roles), dtype=np.int64, count=len(roles))
+        membership = csr_matrix((np.ones(len(ids), dtype=np.float32), (ids, np.arange(len(ids)))),
+                                shape=(len(role_names), len(ids)))
+        centroid_sum = centroid_sum + membership @ X
+        for i, (text, role) in enumerate(zip(texts, roles)):
+            seen[role] += 1
+            reservoir = reservoirs[role]
+            slot = len(reservoir) if len(reservoir) < postings_per_role else rng.randrange(seen[role])
+            if slot < postings_per_role:
+                entry = (row_number + i, X[i], text[:SNIPPET_BYTES].encode('utf-8')[:SNIPPET_BYTES])
+                if slot == len(reservoir):
+                    reservoir.append(entry)
+                else:
+                    reservoir[slot] = entry
+        row_number += len(texts)
+
+    centroids = normalize(centroid_sum.tocsr(), copy=False).astype(np.float32)
+    if centroid_terms:
+        centroids = _prune_rows(centroids, centroid_terms)
+    kept = [(role_ids[role], *entry) for role in role_names
+            for entry in sorted(reservoirs[role], key=lambda entry: entry[0])]
+    meta = {
+        'format_version': INDEX_FORMAT,
+        'n_features': n_features,
+        'documents': n_docs,
+        'postings_per_role': postings_per_role,
+        'centroid_terms': centroid_terms,
+        'seed': seed,
+    }
+    return RoleIndex(meta, {
+        'idf': idf,
+        'roles': np.array(role_names, dtype=str),
+        'posting_roles': np.array([k[0] for k in kept], dtype=np.int32),
+        'posting_rows': np.array([k[1] for k in kept], dtype=np.int64),
+        'posting_snippets': np.array([k[3] for k in kept], dtype=f'S{SNIPPET_BYTES}'),
+        'centroids': centroids,
+        'postings': vstack([k[2] for k in kept]).tocsr().astype(np.float32),
+    })
+
+
+def build_from_jobs_dataset(dataset_dir=None, text_column='Features', role_column='Role', batch_rows=5000,
+                            **kwargs):
+    """Build the index from the Parquet jobs dataset (see utils/jobs_dataset.py)."""
+    from utils.jobs_dataset import JOBS_DATASET, iter_batches
+
+    def read_chunks():
+        for batch in iter_batches([text_column, role_column], batch_rows=batch_rows,
+                                  dataset_dir=dataset_dir or JOBS_DATASET):
+            pairs = [(text, role) for text, role in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist())
+                     if text and role]
+            yield [text for text, _role in pairs], [role.strip() for _text, role in pairs]
+
+    return build_role_index(read_chunks, **kwargs)
+
+
+class RoleIndex:
+    """Role centroids and sampled postings as L2-normalized hashed TF-IDF rows."""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        for name in ARRAYS + MATRICES:
+            setattr(self, name, arrays[name])
+        self._vectorizer = _vectorizer(meta['n_features'])
+
+    def vector(self, text):
+        """The query's normalized TF-IDF row (text is cleaned as resumes are for the models)."""
+        return _tfidf(self._vectorizer, self.idf, [cleanResume(text)])
+
+    def top_roles(self, text, k=5):
+        """[(role, cosine similarity to the role centroid)] for the ``k`` closest roles."""
+        scores = (self.centroids @ self.vector(text).T).toarray().ravel()
+        return [(str(self.roles[i]), float(scores[i])) for i in top_k(scores, k)]
+
+    def similar_postings(self, text, k=5):
+        """[(corpus row, role, cosine similarity, snippet)] for the ``k`` closest sampled postings."""
+        scores = (self.postings @ self.vector(text).T).toarray().ravel()
+        return [(int(self.posting_rows[i]), str(self.roles[self.posting_roles[i]]), float(scores[i]),
+                 self.posting_snippets[i].decode('utf-8', 'ignore'))
+                for i in top_k(scores, k)]
+
+    def similarity(self, text_a, text_b):
+        """Cosine similarity of two texts under the index's TF-IDF weighting."""
+        return float(self.vector(text_a).multiply(self.vector(text_b)).sum())
+
+    @property
+    def nbytes(self):
+        matrices = (getattr(self, name) for name in MATRICES)
+        return (sum(getattr(self, name).nbytes for name in ARRAYS)
+                + sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in matrices))
+
+    def save(self, directory):
+        """Write the index as .npy arrays plus meta.json (with their hashes); returns the meta.json path."""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        for name in MATRICES:
+            matrix = getattr(self, name)
+            arrays.update({f'{name}_data': matrix.data, f'{name}_indices': matrix.indices,
+                           f'{name}_indptr': matrix.indptr})
+        files = {}
+        for name, array in arrays.items():
+            path = os.path.join(directory, f'{name}.npy')
+            np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+            files[name] = file_sha256(path)
+        meta = dict(self.meta, shapes={name: list(getattr(self, name).shape) for name in MATRICES}, files=files)
+        meta_path = os.path.join(directory, 'meta.json')
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+            f.write('\n')
+        return meta_path
+
+    @classmethod
+    def load(cls, meta_path, mmap=True, verify=True):
+        """Open a saved index, memory-mapping its arrays and checking their hashes."""
+        from scipy.sparse import csr_matrix
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != INDEX_FORMAT:
+            raise ValueError(f"{meta_path}: unsupported index format {meta.get('format_version')!r}")
+        directory = os.path.dirname(meta_path)
+        loaded = {}
+        for name in meta['files']:
+            path = os.path.join(directory, f'{name}.npy')
+            if verify and file_sha256(path) != meta['files'][name]:
+                raise ValueError(f"{path} does not match the hash in {meta_path}")
+            loaded[name] = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        arrays = {name: loaded[name] for name in ARRAYS}
+        for name in MATRICES:
+            parts = (loaded[f'{name}_data'], loaded[f'{name}_indices'], loaded[f'{name}_indptr'])
+            arrays[name] = csr_matrix(parts, shape=tuple(meta['shapes'][name]), copy=False)
+        return cls(meta, arrays)
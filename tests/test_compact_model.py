@@ -0,0 +1,49 @@
+# tests/test_compact_model.py
+"""The compact scorer must match scikit-learn on the model it was exported from.
+
+Run from the repository root:  python -m pytest tests
+"""
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from utils.compact_model import CompactTextClassifier, export_compact_model
+
+TRAIN = [
+    ("python pandas machine learning statistics multidisciplinary research", "data"),
+    ("deep learning python tensorflow statistics modelling", "data"),
+    ("react javascript css html frontend design", "web"),
+    ("javascript node express html css web apps", "web"),
+    ("android kotlin java mobile apps play store", "mobile"),
+    ("kotlin android java mobile ui testing", "mobile"),
+]
+QUERIES = [
+    "Multidisciplinary data scientist with Python and statistics",
+    # PDF extraction glues words together; the truncated token must not match "multidisciplinary"
+    "multidisciplinarying pythonpandas statistics",
+    "javascriptreactcss frontend",
+    "nothing in the vocabulary at all",
+    "",
+]
+
+
+def _fit(**params):
+    texts, labels = zip(*TRAIN)
+    vectorizer = TfidfVectorizer(**params)
+    classifier = LogisticRegression(C=10.0, max_iter=1000).fit(vectorizer.fit_transform(texts), labels)
+    return vectorizer, classifier
+
+
+def _assert_matches_sklearn(tmp_path, **params):
+    vectorizer, classifier = _fit(**params)
+    compact = CompactTextClassifier.load(export_compact_model(vectorizer, classifier, str(tmp_path)))
+    expected = classifier.decision_function(vectorizer.transform(QUERIES))
+    np.testing.assert_allclose(compact.decision_function(QUERIES), expected, rtol=1e-4, atol=1e-5)
+
+
+def test_matches_sklearn(tmp_path):
+    _assert_matches_sklearn(tmp_path)
+
+
+def test_matches_sklearn_with_bigrams_and_sublinear_tf(tmp_path):
+    _assert_matches_sklearn(tmp_path, ngram_range=(1, 2), sublinear_tf=True, stop_words='english')
@@ -0,0 +1,231 @@
+# utils/compact_model.py
+"""Compact serving format for a TF-IDF + linear text classifier.
+
+An exported model is a directory of .npy arrays plus a meta.json:
+
+- ``terms.npy``: sorted UTF-8 vocabulary (fixed-width bytes), searched with
+  np.searchsorted, so no Python dict is built at load time
+- ``idf.npy``: float32 IDF weight of each term
+- ``weights_data.npy``/``weights_indices.npy``/``weights_indptr.npy``:
+  float32 CSR matrix of term -> per-class weights
+- ``intercept.npy``, ``classes.npy``
+
+Every array is opened with mmap_mode='r' and checked against the SHA-256
+recorded in meta.json. Scoring needs NumPy only: no scikit-learn import or
+unpickling on the serving path.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ('terms', 'idf', 'weights_data', 'weights_indices', 'weights_indptr', 'intercept', 'classes')
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_compact_model(vectorizer, classifier, directory, max_terms=None, epsilon=0.0):
+    """Write a fitted TfidfVectorizer plus linear classifier in the compact format.
+
+    Weights of terms whose largest absolute class weight is at most
+    ``epsilon`` are pruned, as are all but the ``max_terms`` strongest terms
+    if given; single weights at most ``epsilon`` are dropped as well. Returns
+    the path of the written meta.json.
+    """
+    params = vectorizer.get_params()
+    if params['analyzer'] != 'word' or params['strip_accents'] or params['preprocessor'] or params['tokenizer']:
+        raise ValueError("only word analyzers with the default preprocessing can be exported")
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError(f"{type(vectorizer).__name__} has no vocabulary; only TF-IDF models can be exported")
+    if not hasattr(classifier, 'coef_'):
+        raise ValueError(f"{type(classifier).__name__} is not a linear model; distill it first")
+
+    coef = np.asarray(classifier.coef_.toarray() if hasattr(classifier.coef_, 'toarray') else classifier.coef_)
+    intercept = np.broadcast_to(np.asarray(classifier.intercept_, dtype=np.float64), (coef.shape[0],))
+    if coef.shape[0] == 1:
+        # Binary models score one class; store both sides so top-k works the same way
+        coef, intercept = np.vstack([-coef, coef]), np.concatenate([-intercept, intercept])
+    weights = coef.T  # (n_terms, n_classes)
+
+    # Every vocabulary term stays (it still counts towards the L2 norm);
+    # pruning only drops rows from the weight matrix
+    strength = np.abs(weights).max(axis=1)
+    weighted = strength > epsilon
+    if max_terms is not None and weighted.sum() > max_terms:
+        weighted[:] = False
+        weighted[np.argsort(-strength, kind='stable')[:max_terms]] = True
+
+    vocabulary = vectorizer.vocabulary_
+    index_to_term = {index: term for term, index in vocabulary.items()}
+    encoded = [index_to_term[i].encode('utf-8') for i in range(len(index_to_term))]
+    order = np.argsort(np.array(encoded, dtype=object), kind='stable')
+    terms = np.array([encoded[i] for i in order], dtype=f'S{max((len(t) for t in encoded), default=1)}')
+
+    kept_weights = np.where(weighted[:, None] & (np.abs(weights) > epsilon), weights, 0.0)[order]
+    nonzero = kept_weights != 0
+    indptr = np.concatenate([[0], np.cumsum(nonzero.sum(axis=1))]).astype(np.int32)
+    rows, cols = np.nonzero(nonzero)
+    idf = vectorizer.idf_[order] if params['use_idf'] else np.ones(len(order))
+
+    classes = np.asarray(classifier.classes_)
+    if not hasattr(classifier, 'predict_proba') or getattr(classifier, 'loss', 'log_loss') not in ('log_loss', 'log'):
+        proba = 'none'
+    elif (type(classifier).__name__ == 'LogisticRegression' and len(classes) > 2
+          and getattr(classifier, 'multi_class', 'auto') != 'ovr' and classifier.solver != 'liblinear'):
+        proba = 'softmax'
+    else:
+        # One-vs-rest logistic scores, normalised across classes
+        proba = 'ovr'
+
+    arrays = {
+        'terms': terms,
+        'idf': idf.astype(np.float32),
+        'weights_data': kept_weights[rows, cols].astype(np.float32),
+        'weights_indices': cols.astype(np.int32),
+        'weights_indptr': indptr,
+        'intercept': intercept.astype(np.float32),
+        'classes': classes.astype(str),
+    }
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    for name, array in arrays.items():
+        path = os.path.join(directory, f'{name}.npy')
+        np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+        files[name] = _sha256(path)
+
+    stop_words = vectorizer.get_stop_words()
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'lowercase': params['lowercase'],
+        'token_pattern': params['token_pattern'],
+        'stop_words': sorted(stop_words) if stop_words else None,
+        'ngram_range': list(params['ngram_range']),
+        'binary': params['binary'],
+        'sublinear_tf': params['sublinear_tf'],
+        'norm': params['norm'],
+        'proba': proba,
+        'source_terms': len(vocabulary),
+        'weighted_terms': int(np.count_nonzero(np.diff(indptr))),
+        'files': files,
+    }
+    meta_path = os.path.join(directory, 'meta.json')
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+        f.write('\n')
+    return meta_path
+
+
+class CompactTextClassifier:
+    """Pure-NumPy scorer over the arrays written by export_compact_model."""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self._token_pattern = re.compile(meta['token_pattern'])
+        self._stop_words = frozenset(meta['stop_words'] or ())
+        self._ngram_range = tuple(meta['ngram_range'])
+
+    @classmethod
+    def load(cls, meta_path, mmap=True, verify=True):
+        """Open a compact model, memory-mapping its arrays and checking their hashes."""
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"{meta_path}: unsupported compact format {meta.get('format_version')!r}")
+        directory = os.path.dirname(meta_path)
+        arrays = {}
+        for name in ARRAYS:
+            path = os.path.join(directory, f'{name}.npy')
+            if verify and _sha256(path) != meta['files'][name]:
+                raise ValueError(f"{path} does not match the hash in {meta_path}")
+            arrays[name] = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        return cls(meta, arrays)
+
+    @property
+    def classes_(self):
+        return self.classes
+
+    def _tokens(self, text):
+        if self.meta['lowercase']:
+            text = text.lower()
+        tokens = [t for t in self._token_pattern.findall(text) if t not in self._stop_words]
+        low, high = self._ngram_range
+        if high == 1:
+            return tokens
+        grams = list(tokens) if low == 1 else []
+        for n in range(max(2, low), high + 1):
+            grams.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def decision_function(self, texts):
+        """Linear class scores, shape (n_texts, n_classes)."""
+        n_classes = len(self.classes)
+        scores = np.empty((len(texts), n_classes), dtype=np.float32)
+        for row, text in enumerate(texts):
+            scores[row] = self.intercept
+            # Casting to the fixed-width vocabulary dtype would truncate longer tokens into false matches
+            counts = {}
+            for term, count in Counter(self._tokens(text)).items():
+                key = term.encode('utf-8')
+                if len(key) <= self.terms.itemsize:
+                    counts[key] = count
+            if not counts:
+                continue
+            keys = np.array(list(counts), dtype=self.terms.dtype)
+            positions = np.searchsorted(self.terms, keys)
+            positions[positions == len(self.terms)] = 0
+            found = self.terms[positions] == keys
+            if not found.any():
+                continue
+            positions = positions[found]
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))[found]
+            if self.meta['binary']:
+                tf = np.ones_like(tf)
+            elif self.meta['sublinear_tf']:
+                tf = 1 + np.log(tf)
+            values = tf * self.idf[positions]
+            if self.meta['norm'] == 'l2':
+                values /= np.sqrt(np.dot(values, values))
+            starts = self.weights_indptr[positions]
+            lengths = self.weights_indptr[positions + 1] - starts
+            total = int(lengths.sum())
+            if total == 0:
+                continue
+            # Gather the CSR rows of every term in the document and accumulate per class
+            offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            gather = np.repeat(starts, lengths) + offsets
+            contributions = self.weights_data[gather] * np.repeat(values, lengths)
+            scores[row] += np.bincount(self.weights_indices[gather], weights=contributions, minlength=n_classes)
+        return scores
+
+    @property
+    def predict_proba(self):
+        """Class probabilities matching the exported model's predict_proba, if it had one."""
+        if self.meta['proba'] == 'none':
+            raise AttributeError("the exported model has no probability estimates")
+        return self._predict_proba
+
+    def _predict_proba(self, texts):
+        scores = self.decision_function(texts).astype(np.float64)
+        if self.meta['proba'] == 'softmax':
+            scores -= scores.max(axis=1, keepdims=True)
+            exp = np.exp(scores)
+            return exp / exp.sum(axis=1, keepdims=True)
+        if self.meta['proba'] == 'ovr':
+            prob = 1 / (1 + np.exp(-scores))
+            total = prob.sum(axis=1, keepdims=True)
+            return np.divide(prob, total, out=np.full_like(prob, 1 / prob.shape[1]), where=total > 0)
+
+    def predict(self, texts):
+        return self.classes[np.argmax(self.decision_function(texts), axis=1)]
@@ -1,42 +1,46 @@
 # utils/database.py
+import datetime
+import hashlib
+import threading
 import streamlit as st
 import pymysql
-import time
+from utils.db_pool import ConnectionPool, is_transient_error
+from utils.download_utils import prune_exports, write_export
+from utils.skill_utils import canonical_skill, parse_skill_list
+from utils.write_behind import WriteBehindQueue
+from utils.settings import (
+    DB_POOL_MAX_SIZE, DB_POOL_IDLE_TIMEOUT_SECONDS, DB_POOL_PING_AFTER_SECONDS, DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+    DB_WRITE_BATCH_SIZE, DB_WRITE_FLUSH_INTERVAL_MS, DB_WRITE_MAX_RETRIES, DB_QUERY_CACHE_TTL_SECONDS,
+    EXPORT_CHUNK_ROWS
+)
 
-# Remove the cache_resource decorator to prevent connection pooling issues
-def get_database_connection():
-    """Get a fresh database connection."""
-    try:
-        connection = pymysql.connect(
-            host=st.secrets["DB"]["HOST"],
-            user=st.secrets["DB"]["USER"],
-            password=st.secrets["DB"]["PASSWORD"],
-            port=st.secrets["DB"]["PORT"],
-            database=st.secrets["DB"]["DATABASE"],
-            cursorclass=pymysql.cursors.DictCursor,
-            # Add connection timeout parameters
-            connect_timeout=10,
-            # Adding autocommit to prevent transaction issues
-            autocommit=True
-        )
-        return connection
-    except pymysql.MySQLError as e:
-        st.error(f"Database connection error: {e}")
-        return None
+# Longest wait for another process's migrations to finish
+SCHEMA_LOCK_TIMEOUT_SECONDS = 30
 
-def insert_data(name, email, timestamp, no_of_pages, cand_level, skills, recommended_skills, courses):
-    """Insert data into the database with proper connection handling."""
-    # Create a new connection for each operation
-    connection = None
-    try:
-        connection = get_database_connection()
-        if not connection:
-            return False
-            
-        cursor = connection.cursor()
-        
-        # Create the resume_data table if it doesn't exist
-        create_table_query = """
+# Bump whenever the stored analysis output changes, so re-analysed resumes get a new row
+RESULT_VERSION = 2
+
+
+def _add_column(table, column, definition):
+    """Migration step adding a column unless it exists."""
+    return ("SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (table, column), f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _add_index(table, index, columns, unique=False):
+    """Migration step creating an index unless it exists."""
+    return ("SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            (table, index), f"CREATE {'UNIQUE ' if unique else ''}INDEX {index} ON {table} ({columns})")
+
+
+# Ordered schema migrations; each version is applied once per database and recorded in schema_migrations.
+# MySQL commits every DDL statement on its own, so each step is idempotent (IF NOT EXISTS or an
+# information_schema check) and a migration interrupted half-way is simply completed on the next start.
+MIGRATIONS = (
+    (1, (
+        """
         CREATE TABLE IF NOT EXISTS resume_data (
             id INT AUTO_INCREMENT PRIMARY KEY,
             name VARCHAR(255),
@@ -48,26 +52,337 @@ def insert_data(name, email, timestamp, no_of_pages, cand_level, skills, recomme
             recommended_skills TEXT,
             courses TEXT
         )
+        """,
+    )),
+    # One row per analysed document and result version; NULL keys (direct inserts) are not deduplicated
+    (2, (
+        _add_column("resume_data", "content_key", "CHAR(64) NULL"),
+        _add_index("resume_data", "resume_data_content_key", "content_key", unique=True),
+    )),
+    # Model outputs as filterable columns; indexes serve the admin filters in id order
+    (3, (
+        _add_column("resume_data", "predicted_category", "VARCHAR(255) NULL"),
+        _add_column("resume_data", "recommended_job", "VARCHAR(255) NULL"),
+        _add_index("resume_data", "resume_data_category", "predicted_category, id"),
+        _add_index("resume_data", "resume_data_timestamp", "timestamp"),
+    )),
+    # Normalised candidate skills plus a per-skill aggregate for the admin chart;
+    # existing rows are backfilled by scripts/migrate_resume_skills.py
+    (4, (
         """
-        cursor.execute(create_table_query)
-        
-        # Insert data into the table
-        insert_query = """
-        INSERT INTO resume_data 
-        (name, email, timestamp, no_of_pages, cand_level, skills, recommended_skills, courses) 
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        CREATE TABLE IF NOT EXISTS resume_skill (
+            resume_id INT NOT NULL,
+            skill VARCHAR(100) NOT NULL,
+            PRIMARY KEY (resume_id, skill),
+            INDEX resume_skill_skill (skill, resume_id)
+        )
+        """,
         """
-        cursor.execute(insert_query, (
-            name, email, timestamp, no_of_pages, 
-            cand_level, skills, recommended_skills, courses
-        ))
-        
-        cursor.close()
+        CREATE TABLE IF NOT EXISTS skill_count (
+            skill VARCHAR(100) PRIMARY KEY,
+            resume_count INT NOT NULL,
+            INDEX skill_count_count (resume_count)
+        )
+        """,
+    )),
+)
+
+INSERT_RESUME_DATA = """
+INSERT INTO resume_data
+(content_key, name, email, timestamp, no_of_pages, cand_level, skills, recommended_skills, courses,
+ predicted_category, recommended_job)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE id = id
+"""
+
+# Columns the admin grid may project, in display order
+RESUME_COLUMNS = (
+    'id', 'name', 'email', 'timestamp', 'no_of_pages', 'cand_level', 'predicted_category',
+    'recommended_job', 'skills', 'recommended_skills', 'courses'
+)
+DEFAULT_ADMIN_COLUMNS = ('id', 'name', 'email', 'timestamp', 'predicted_category', 'recommended_job', 'skills')
+
+# Bumped after every successful write in this process; part of the query cache key
+_write_version = 0
+_write_version_lock = threading.Lock()
+
+
+def _connect():
+    """Open a new database connection from the configured secrets."""
+    return pymysql.connect(
+        host=st.secrets["DB"]["HOST"],
+        user=st.secrets["DB"]["USER"],
+        password=st.secrets["DB"]["PASSWORD"],
+        port=st.secrets["DB"]["PORT"],
+        database=st.secrets["DB"]["DATABASE"],
+        cursorclass=pymysql.cursors.DictCursor,
+        connect_timeout=10,
+        # Pooled connections are shared between callers, so no transaction may stay open
+        autocommit=True
+    )
+
+
+def apply_migrations(connection):
+    """Apply pending MIGRATIONS, serialised across processes with a named lock.
+
+    Raises pymysql.OperationalError if the lock is not acquired within
+    SCHEMA_LOCK_TIMEOUT_SECONDS; get_pool is not cached then, so the next
+    call tries again.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK('resume_analyzer_schema', %s) AS acquired", (SCHEMA_LOCK_TIMEOUT_SECONDS,))
+        # 0 is a timeout and NULL an error; either way this session does not hold the lock
+        if cursor.fetchone()["acquired"] != 1:
+            raise pymysql.OperationalError(
+                f"could not acquire the schema migration lock within {SCHEMA_LOCK_TIMEOUT_SECONDS}s")
+        try:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+            cursor.execute("SELECT version FROM schema_migrations")
+            applied = {row["version"] for row in cursor.fetchall()}
+            for version, statements in MIGRATIONS:
+                if version in applied:
+                    continue
+                for step in statements:
+                    if isinstance(step, str):
+                        cursor.execute(step)
+                        continue
+                    exists_query, params, statement = step
+                    cursor.execute(exists_query, params)
+                    if cursor.fetchone() is None:
+                        cursor.execute(statement)
+                cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('resume_analyzer_schema')")
+
+
+@st.cache_resource
+def get_pool():
+    """Process-wide connection pool; the schema is brought up to date once, on creation."""
+    pool = ConnectionPool(
+        _connect,
+        max_size=DB_POOL_MAX_SIZE,
+        idle_timeout=DB_POOL_IDLE_TIMEOUT_SECONDS,
+        ping_after=DB_POOL_PING_AFTER_SECONDS,
+        checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS
+    )
+    with pool.connection() as connection:
+        apply_migrations(connection)
+    return pool
+
+
+def insert_data(name, email, timestamp, no_of_pages, cand_level, skills, recommended_skills, courses):
+    """Insert one analysis row using a pooled connection."""
+    try:
+        with get_pool().connection() as connection, connection.cursor() as cursor:
+            cursor.execute(INSERT_RESUME_DATA, (
+                None, name, email, timestamp, no_of_pages,
+                cand_level, skills, recommended_skills, courses, None, None
+            ))
+            store_resume_skills(cursor, {cursor.lastrowid: parse_skill_list(skills)})
+        _bump_write_version()
         return True
     except pymysql.MySQLError as e:
         st.error(f"Database error: {e}")
         return False
-    finally:
-        # Always close the connection in the finally block
-        if connection:
-            connection.close()
\ No newline at end of file
+
+
+def content_key(resume_sha256):
+    """Deduplication key for one document's analysis under the current RESULT_VERSION."""
+    return hashlib.sha256(f"{resume_sha256}:{RESULT_VERSION}".encode("utf-8")).hexdigest()
+
+
+def refresh_skill_counts(cursor, skills):
+    """Recount the given skills from resume_skill into skill_count.
+
+    Only the touched skills are recounted, each through the (skill,
+    resume_id) index, which keeps the aggregate correct even when a batch
+    is retried or another process writes the same skills concurrently.
+    """
+    if not skills:
+        return
+    cursor.execute(
+        "INSERT INTO skill_count (skill, resume_count) "
+        "SELECT skill, COUNT(*) FROM resume_skill WHERE skill IN %s GROUP BY skill "
+        "ON DUPLICATE KEY UPDATE resume_count = VALUES(resume_count)",
+        (tuple(skills),)
+    )
+
+
+def store_resume_skills(cursor, skills_by_id):
+    """Insert (resume_id, skill) pairs and refresh the counts of the skills involved."""
+    pairs = [(resume_id, skill) for resume_id, skills in skills_by_id.items() if resume_id for skill in skills]
+    if not pairs:
+        return
+    cursor.executemany("INSERT IGNORE INTO resume_skill (resume_id, skill) VALUES (%s, %s)", pairs)
+    refresh_skill_counts(cursor, {skill for _, skill in pairs})
+
+
+def write_resume_rows(rows):
+    """Insert a batch of (resume_data row, canonical skills) pairs; existing content keys are skipped."""
+    with get_pool().connection() as connection, connection.cursor() as cursor:
+        cursor.executemany(INSERT_RESUME_DATA, [row for row, _ in rows])
+        skills_by_key = {row[0]: skills for row, skills in rows if skills}
+        if skills_by_key:
+            cursor.execute(
+                "SELECT id, content_key FROM resume_data WHERE content_key IN %s", (tuple(skills_by_key),)
+            )
+            store_resume_skills(cursor, {
+                found['id']: skills_by_key[found['content_key']] for found in cursor.fetchall()
+            })
+    _bump_write_version()
+
+
+@st.cache_resource
+def get_write_queue():
+    """Process-wide write-behind queue for resume_data rows."""
+    return WriteBehindQueue(
+        write_resume_rows,
+        batch_size=DB_WRITE_BATCH_SIZE,
+        flush_interval=DB_WRITE_FLUSH_INTERVAL_MS / 1000,
+        max_retries=DB_WRITE_MAX_RETRIES,
+        retry_on=is_transient_error
+    )
+
+
+def save_resume_data(resume_sha256, name, email, timestamp, no_of_pages, cand_level, skills,
+                     recommended_skills, courses, predicted_category=None, recommended_job=None):
+    """Queue an analysis row for a background write; repeat calls for the same document are no-ops."""
+    key = content_key(resume_sha256)
+    return get_write_queue().put(key, ((
+        key, name, email, timestamp, no_of_pages,
+        cand_level, skills, recommended_skills, courses, predicted_category, recommended_job
+    ), parse_skill_list(skills)))
+
+
+def _bump_write_version():
+    global _write_version
+    with _write_version_lock:
+        _write_version += 1
+
+
+def write_version():
+    """Counter of resume_data writes made by this process, used to invalidate cached queries."""
+    return _write_version
+
+
+def _filter_conditions(date_from=None, date_to=None, category=None, skill=None):
+    """WHERE conditions and parameters for the admin filters.
+
+    ``timestamp`` is stored as 'YYYY-MM-DD_HH:MM:SS', so the date range
+    compares as strings; the skill filter is an exact canonical match
+    served by resume_skill.
+    """
+    where, params = [], []
+    if date_from is not None:
+        where.append("timestamp >= %s")
+        params.append(date_from.strftime('%Y-%m-%d'))
+    if date_to is not None:
+        where.append("timestamp < %s")
+        params.append((date_to + datetime.timedelta(days=1)).strftime('%Y-%m-%d'))
+    if category:
+        where.append("predicted_category = %s")
+        params.append(category)
+    if skill:
+        where.append("id IN (SELECT resume_id FROM resume_skill WHERE skill = %s)")
+        params.append(canonical_skill(skill))
+    return where, params
+
+
+def _projection(columns):
+    """Whitelisted columns in display order, always including ``id``."""
+    return [column for column in RESUME_COLUMNS if column in columns or column == 'id']
+
+
+def build_page_query(columns, after_id=None, page_size=50, date_from=None, date_to=None, category=None, skill=None):
+    """Build one keyset-paginated resume_data query, newest first.
+
+    Only whitelisted columns are projected (``id`` always, as the cursor).
+    Rows come after ``after_id`` in descending id order, and one extra row
+    is fetched to tell whether another page exists.
+    """
+    where, params = _filter_conditions(date_from, date_to, category, skill)
+    if after_id is not None:
+        where.insert(0, "id < %s")
+        params.insert(0, after_id)
+    sql = f"SELECT {', '.join(_projection(columns))} FROM resume_data"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC LIMIT %s"
+    params.append(page_size + 1)
+    return sql, params
+
+
+def build_export_query(columns, date_from=None, date_to=None, category=None, skill=None):
+    """Build the unpaginated query behind an export, with the same projection and filters as the grid."""
+    where, params = _filter_conditions(date_from, date_to, category, skill)
+    sql = f"SELECT {', '.join(_projection(columns))} FROM resume_data"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY id DESC", params
+
+
+def stream_rows(sql, params, chunk_size=EXPORT_CHUNK_ROWS):
+    """Yield (column_names, rows) chunks from an unbuffered server-side cursor.
+
+    The first chunk is empty and only carries the column names, so an
+    empty result still produces a header.
+    """
+    with get_pool().connection() as connection, connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        yield names, []
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield names, rows
+
+
+def export_resume_data(fmt, columns, date_from=None, date_to=None, category=None, skill=None):
+    """Stream the filtered resume_data rows into an export file; returns (file name, row count)."""
+    prune_exports()
+    sql, params = build_export_query(columns, date_from, date_to, category, skill)
+    return write_export(stream_rows(sql, params), fmt)
+
+
+@st.cache_data(ttl=DB_QUERY_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_resume_page(version, columns, after_id=None, page_size=50, date_from=None, date_to=None,
+                      category=None, skill=None):
+    """Return (rows, next_after_id) for one page; next_after_id is None on the last page.
+
+    ``version`` is only part of the cache key: pass write_version() so a
+    write from this process invalidates cached pages, while the TTL bounds
+    staleness from other processes.
+    """
+    sql, params = build_page_query(columns, after_id, page_size, date_from, date_to, category, skill)
+    with get_pool().connection() as connection, connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    next_after_id = rows[page_size - 1]['id'] if len(rows) > page_size else None
+    return rows[:page_size], next_after_id
+
+
+@st.cache_data(ttl=DB_QUERY_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_categories(version):
+    """Distinct predicted categories for the admin filter, read from the category index."""
+    with get_pool().connection() as connection, connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT predicted_category FROM resume_data "
+            "WHERE predicted_category IS NOT NULL ORDER BY predicted_category"
+        )
+        return [row['predicted_category'] for row in cursor.fetchall()]
+
+
+@st.cache_data(ttl=DB_QUERY_CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_skill_counts(version, limit=20):
+    """Most common candidate skills, read from the skill_count aggregate's index."""
+    with get_pool().connection() as connection, connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT skill, resume_count FROM skill_count ORDER BY resume_count DESC LIMIT %s", (limit,)
+        )
+        return cursor.fetchall()
@@ -0,0 +1,126 @@
+# utils/db_pool.py
+"""Small thread-safe pool of pymysql connections.
+
+Connections are checked out with a context manager and returned on exit.
+Idle connections older than ``idle_timeout`` are closed instead of reused,
+ones idle longer than ``ping_after`` are pinged before being handed out,
+and a connection that raised a connection-level error is discarded rather
+than returned. At most ``max_size`` connections exist at once; callers
+beyond that wait up to ``checkout_timeout`` seconds.
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+# Errors after which a connection cannot be trusted any more
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+# Server/client error codes worth retrying: lock wait timeout, deadlock, too many
+# connections, can't connect, server gone away, lost connection
+TRANSIENT_ERROR_CODES = {1205, 1213, 1040, 2003, 2006, 2013}
+
+
+class PoolTimeout(pymysql.MySQLError):
+    """No connection became available within the checkout timeout."""
+
+
+def is_transient_error(error):
+    """Whether a failed statement may succeed if simply retried."""
+    if isinstance(error, (PoolTimeout, pymysql.err.InterfaceError)):
+        return True
+    return isinstance(error, pymysql.MySQLError) and bool(error.args) and error.args[0] in TRANSIENT_ERROR_CODES
+
+
+class ConnectionPool:
+    """Bounded LIFO pool with idle expiry and ping-on-checkout health checks."""
+
+    def __init__(self, connect, max_size=5, idle_timeout=300, ping_after=30, checkout_timeout=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.checkout_timeout = checkout_timeout
+        # Most recently returned connection first, so surplus ones age out
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+
+    def _discard(self, connection):
+        with self._lock:
+            self._size -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _healthy(self, connection, idle_for):
+        if idle_for > self.idle_timeout:
+            return False
+        if idle_for > self.ping_after:
+            try:
+                connection.ping(reconnect=False)
+            except Exception:
+                return False
+        return True
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            try:
+                connection, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._size < self.max_size
+                    if can_open:
+                        self._size += 1
+                if can_open:
+                    try:
+                        return self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._size -= 1
+                        raise
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"no database connection available within {self.checkout_timeout}s")
+                try:
+                    connection, returned_at = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+            if self._healthy(connection, time.monotonic() - returned_at):
+                return connection
+            self._discard(connection)
+
+    def _release(self, connection):
+        self._idle.put((connection, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a ``with`` block."""
+        connection = self._acquire()
+        try:
+            yield connection
+        except CONNECTION_ERRORS:
+            self._discard(connection)
+            raise
+        except BaseException:
+            self._release(connection)
+            raise
+        else:
+            self._release(connection)
+
+    def close_all(self):
+        """Close every idle connection; checked-out ones are closed when discarded."""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+    def stats(self):
+        """Open and idle connection counts."""
+        return {"open": self._size, "idle": self._idle.qsize(), "max_size": self.max_size}
@@ -0,0 +1,202 @@
+# utils/document_cache.py
+"""Disk-backed cache of parsed PDFs keyed on the SHA-256 of the file bytes.
+
+Every session, worker process and restart shares the same entries, so a
+document is only parsed once no matter what it was called when uploaded.
+Entries are JSON files written atomically; the least recently used ones are
+evicted once the entry or byte limits in utils/settings.py are exceeded.
+Extraction results live in their own files under <sha256>.d/, one per
+extraction name, so concurrent writers (the Gemini extraction, ranking,
+batch workers) never overwrite each other's results.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from utils.settings import DOCUMENT_CACHE_DIR, DOCUMENT_CACHE_MAX_ENTRIES, DOCUMENT_CACHE_MAX_BYTES
+
+_evict_lock = threading.Lock()
+
+
+def document_hash(pdf_bytes):
+    """Return the hex SHA-256 of the PDF bytes."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def read_pdf_bytes(pdf_file):
+    """Return the raw bytes of a PDF given as a path, bytes or file-like object."""
+    if isinstance(pdf_file, (bytes, bytearray, memoryview)):
+        return bytes(pdf_file)
+    if hasattr(pdf_file, 'getvalue'):
+        return pdf_file.getvalue()
+    with open(pdf_file, "rb") as f:
+        return f.read()
+
+
+def _entry_path(sha256):
+    return os.path.join(DOCUMENT_CACHE_DIR, sha256 + ".json")
+
+
+def _extractions_dir(sha256):
+    return os.path.join(DOCUMENT_CACHE_DIR, sha256 + ".d")
+
+
+def _load_entry(sha256):
+    path = _entry_path(sha256)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        # Reads refresh the mtime so eviction is least-recently-used
+        os.utime(path)
+    except OSError:
+        pass
+    extractions = entry.setdefault("extractions", {})
+    directory = _extractions_dir(sha256)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        names = ()
+    for file_name in names:
+        if file_name.endswith(".json"):
+            try:
+                with open(os.path.join(directory, file_name), "r", encoding="utf-8") as f:
+                    extractions[file_name[:-len(".json")]] = json.load(f)
+            except (OSError, ValueError):
+                continue
+    return entry
+
+
+def _write_json(path, value):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _store_entry(entry):
+    _write_json(_entry_path(entry["sha256"]), entry)
+    evict()
+
+
+def _dir_bytes(directory):
+    try:
+        with os.scandir(directory) as it:
+            return sum(item.stat().st_size for item in it if item.is_file())
+    except OSError:
+        return 0
+
+
+def evict(max_entries=None, max_bytes=None):
+    """Remove least recently used entries until the cache fits its limits."""
+    max_entries = DOCUMENT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    max_bytes = DOCUMENT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _evict_lock:
+        entries, directories = [], []
+        try:
+            with os.scandir(DOCUMENT_CACHE_DIR) as it:
+                for item in it:
+                    if item.name.endswith(".json"):
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        # An entry's size includes its extraction files
+                        size = stat.st_size + _dir_bytes(item.path[:-len(".json")] + ".d")
+                        entries.append((stat.st_mtime, size, item.path))
+                    elif item.name.endswith(".d"):
+                        directories.append(item.path)
+        except FileNotFoundError:
+            return 0
+        total_bytes = sum(size for _mtime, size, _path in entries)
+        entries.sort()
+        removed = 0
+        while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+            _mtime, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            removed += 1
+        # Extractions of entries removed here or earlier
+        for directory in directories:
+            if not os.path.exists(directory[:-len(".d")] + ".json"):
+                shutil.rmtree(directory, ignore_errors=True)
+        return removed
+
+
+def _parse_pdf(pdf_bytes):
+    from PyPDF2 import PdfReader
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    pages = []
+    for page in reader.pages:
+        page_text = page.extract_text()
+        pages.append(page_text if page_text is not None else "")
+    return pages
+
+
+def get_document(pdf_file, sha256=None):
+    """Return the cached parse of a PDF, parsing and storing it on a miss.
+
+    The entry holds ``sha256``, ``no_of_pages``, the per-page ``pages`` text,
+    the concatenated ``text`` and any ``extractions`` stored against it.
+    Callers that already know the content hash pass it, and a cache hit
+    then reads nothing from ``pdf_file``.
+    """
+    pdf_bytes = None
+    if sha256 is None:
+        pdf_bytes = read_pdf_bytes(pdf_file)
+        sha256 = document_hash(pdf_bytes)
+    entry = _load_entry(sha256)
+    if entry is not None:
+        return entry
+
+    pages = _parse_pdf(pdf_bytes if pdf_bytes is not None else read_pdf_bytes(pdf_file))
+    entry = {
+        "sha256": sha256,
+        "no_of_pages": len(pages),
+        "pages": pages,
+        "text": "".join(pages),
+        "extractions": {}
+    }
+    _store_entry(entry)
+    return entry
+
+
+def get_extraction(sha256, name):
+    """Return a stored extraction result for a document, or None."""
+    entry = _load_entry(sha256)
+    if entry is None:
+        return None
+    return entry.get("extractions", {}).get(name)
+
+
+def put_extraction(sha256, name, result):
+    """Store an extraction result alongside an already cached document.
+
+    Each name is its own file, replaced atomically, so writers of
+    different extractions for one document never lose each other's
+    results. ``name`` must be usable as a file name.
+    """
+    if not os.path.exists(_entry_path(sha256)):
+        return False
+    try:
+        _write_json(os.path.join(_extractions_dir(sha256), name + ".json"), result)
+    except OSError:
+        # The entry was evicted meanwhile; the result is only a cache
+        return False
+    return True
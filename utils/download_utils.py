@@ -1,11 +1,122 @@
-import base64
+# utils/download_utils.py
+import csv
+import gzip
+import os
+import secrets
+import tempfile
+import threading
+import time
 
-def get_table_download_link(df, filename, text):
-    """Generates a link allowing the data in a given panda dataframe to be downloaded
-    in:  dataframe
-    out: href string
+from utils.settings import EXPORT_DIR, EXPORT_MAX_AGE_SECONDS
+
+# Export format label -> file extension
+EXPORT_FORMATS = {
+    'CSV': '.csv',
+    'CSV (gzip)': '.csv.gz',
+    'Parquet': '.parquet',
+}
+# How often the background pruner looks for expired exports
+PRUNE_INTERVAL_SECONDS = 60
+
+_pruner_lock = threading.Lock()
+_pruner = None
+
+def _write_csv(chunks, f):
+    writer = None
+    count = 0
+    for names, rows in chunks:
+        if writer is None:
+            writer = csv.writer(f)
+            writer.writerow(names)
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    count = 0
+    try:
+        for names, rows in chunks:
+            if writer is None:
+                # Every resume_data column except the id is text
+                schema = pa.schema([(name, pa.int64() if name == 'id' else pa.string()) for name in names])
+                writer = pq.ParquetWriter(path, schema, compression='snappy')
+            if rows:
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+                ))
+                count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def write_export(chunks, fmt, directory=EXPORT_DIR):
+    """Write (column_names, rows) chunks to a new file in ``directory``; returns (file name, row count).
+
+    The first chunk may be empty; it still provides the header. Only one
+    chunk is held in memory at a time. The file gets an unguessable name,
+    because it is served to anyone who has the URL, and appears atomically
+    once complete.
     """
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()  # some strings <-> bytes conversions necessary here
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
\ No newline at end of file
+    extension = EXPORT_FORMATS[fmt]
+    os.makedirs(directory, exist_ok=True)
+    name = f"resume_data_{time.strftime('%Y%m%d_%H%M%S')}_{secrets.token_urlsafe(12)}{extension}"
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        if extension == '.parquet':
+            count = _write_parquet(chunks, tmp_path)
+        elif extension == '.csv.gz':
+            with gzip.open(tmp_path, 'wt', newline='', encoding='utf-8') as f:
+                count = _write_csv(chunks, f)
+        else:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                count = _write_csv(chunks, f)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return name, count
+
+def prune_exports(directory=EXPORT_DIR, max_age=EXPORT_MAX_AGE_SECONDS):
+    """Delete exports older than ``max_age`` seconds."""
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def start_export_pruner(directory=EXPORT_DIR, max_age=EXPORT_MAX_AGE_SECONDS, interval=PRUNE_INTERVAL_SECONDS):
+    """Prune expired exports every ``interval`` seconds on a daemon thread; later calls do nothing.
+
+    Exports hold every candidate's name and email and are served to anyone
+    with the URL, so they must expire even if nobody exports again.
+    """
+    global _pruner
+    with _pruner_lock:
+        if _pruner is not None:
+            return False
+
+        def run():
+            while True:
+                prune_exports(directory, max_age)
+                time.sleep(interval)
+
+        _pruner = threading.Thread(target=run, name='export-pruner', daemon=True)
+        _pruner.start()
+        return True
+
+def get_export_download_link(name, text, directory=EXPORT_DIR):
+    """Link to an export served by Streamlit's static file serving (enableStaticServing)."""
+    url = 'app/' + os.path.join(directory, name).replace(os.sep, '/')
+    return f'<a href="{url}" download="{name}">{text}</a>'
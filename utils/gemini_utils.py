@@ -1,5 +1,7 @@
 # utils/gemini_utils.py
 import streamlit as st
+from utils.llm_cache import get_llm_cache
+from utils.prompt_builder import fit_parts
 
 @st.cache_resource
 def load_expensive_libraries():
@@ -23,28 +25,41 @@ def load_expensive_libraries():
         'TextConverter': TextConverter
     }
 
-@st.cache_data(ttl=3600)
+GEMINI_MODEL = 'gemini-2.0-flash'
+
+
+def generate_content_cached(parts, model_name=GEMINI_MODEL, timeout=None):
+    """Call Gemini through the persistent response cache; API errors propagate.
+
+    Parts are deduplicated and trimmed to PROMPT_MAX_TOKENS first, so an
+    oversized resume is cut section-aware instead of being rejected.
+    ``timeout`` (seconds) bounds the API request itself.
+    """
+    parts = fit_parts(parts)
+
+    def generate():
+        libs = load_expensive_libraries()
+        genai = libs['genai']
+        model = genai.GenerativeModel(model_name)
+        request_options = {'timeout': timeout} if timeout else None
+        return model.generate_content(parts, request_options=request_options).text
+
+    return get_llm_cache().get_or_generate(model_name, parts, generate)
+
+
 def get_gemini_response1(input_prompt, text):
     """Get Gemini API response."""
-    libs = load_expensive_libraries()
-    genai = libs['genai']
-    model = genai.GenerativeModel('gemini-2.0-flash')
     try:
-        response = model.generate_content([input_prompt, text])
-        return response.text
+        return generate_content_cached([input_prompt, text])
     except Exception as e:
         st.error(f"Gemini API error: {e}")
         return None
 
-@st.cache_data(ttl=3600)
+
 def get_gemini_response2(input_prompt, text, input):
     """Get Gemini API response with additional input."""
-    libs = load_expensive_libraries()
-    genai = libs['genai']
-    model = genai.GenerativeModel('gemini-2.0-flash')
     try:
-        response = model.generate_content([input_prompt, text, input])
-        return response.text
+        return generate_content_cached([input_prompt, text, input])
     except Exception as e:
         st.error(f"Gemini API error: {e}")
         return None
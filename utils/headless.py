@@ -0,0 +1,9 @@
+# utils/headless.py
+
+
+def quiet_streamlit():
+    """Silence Streamlit's bare-mode warnings when app code runs outside `streamlit run`."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.set_option("logger.level", "error")
+    set_log_level("error")
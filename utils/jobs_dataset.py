@@ -0,0 +1,196 @@
+# utils/jobs_dataset.py
+"""Columnar copy of the jobs corpus and its readers.
+
+scripts/convert_jobs_dataset.py streams Datasets/jobs_dataset_with_features.csv
+into a Parquet dataset partitioned by Role (one directory per role, hive
+style), with low-cardinality text columns dictionary-encoded. Readers open
+it through a memory-mapped filesystem and read only the columns they ask
+for; a role filter only touches that role's files.
+"""
+import hashlib
+import os
+import shutil
+import time
+
+JOBS_CSV = os.path.join('Datasets', 'jobs_dataset_with_features.csv')
+JOBS_DATASET = os.path.join('Datasets', 'jobs_dataset')
+PARTITION_COLUMN = 'Role'
+DEFAULT_COLUMNS = ('Role', 'Features')
+
+
+def infer_categorical(csv_path, block_size=16 << 20, max_unique_ratio=0.01):
+    """Text columns whose first block has few distinct values (worth dictionary-encoding)."""
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
+    reader = pcsv.open_csv(csv_path, read_options=pcsv.ReadOptions(block_size=block_size))
+    batch = reader.read_next_batch()
+    categorical = []
+    for name, column in zip(batch.schema.names, batch.columns):
+        if pa.types.is_string(column.type) and len(column) and \
+                len(column.unique()) <= max(1, len(column) * max_unique_ratio):
+            categorical.append(name)
+    return categorical
+
+
+def convert_csv(csv_path=JOBS_CSV, dataset_dir=JOBS_DATASET, categorical=None, block_size=16 << 20,
+                min_rows_per_group=16 * 1024, max_rows_per_group=64 * 1024):
+    """Stream a CSV into a Role-partitioned Parquet dataset, replacing any previous one.
+
+    The CSV is read block by block; the writer buffers at most about
+    ``min_rows_per_group`` rows per role before flushing a row group. Row
+    order within a role follows the CSV. The dataset is written next to
+    ``dataset_dir`` and swapped in at the end, so readers never see a
+    half-written copy. Returns a dict of conversion stats.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.dataset as ds
+
+    started = time.perf_counter()
+    if categorical is None:
+        categorical = infer_categorical(csv_path, block_size)
+    categorical = sorted(set(categorical) | {PARTITION_COLUMN})
+    reader = pcsv.open_csv(
+        csv_path,
+        read_options=pcsv.ReadOptions(block_size=block_size),
+        convert_options=pcsv.ConvertOptions(
+            column_types={name: pa.dictionary(pa.int32(), pa.string()) for name in categorical}),
+    )
+    tmp_dir = f'{dataset_dir}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    ds.write_dataset(
+        reader, tmp_dir, format='parquet',
+        partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+        min_rows_per_group=min_rows_per_group, max_rows_per_group=max_rows_per_group,
+        max_partitions=100_000, existing_data_behavior='error', preserve_order=True,
+    )
+    old_dir = f'{dataset_dir}.old-{os.getpid()}'
+    if os.path.exists(dataset_dir):
+        os.replace(dataset_dir, old_dir)
+    os.replace(tmp_dir, dataset_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    files = [os.path.join(root, name) for root, _dirs, names in os.walk(dataset_dir) for name in names]
+    return {
+        'rows': open_dataset(dataset_dir).count_rows(),
+        'files': len(files),
+        'bytes': sum(os.path.getsize(path) for path in files),
+        'categorical': categorical,
+        'seconds': round(time.perf_counter() - started, 1),
+    }
+
+
+def open_dataset(dataset_dir=JOBS_DATASET):
+    """Open the Parquet dataset over a memory-mapped local filesystem."""
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    if not os.path.isdir(dataset_dir):
+        raise FileNotFoundError(f"{dataset_dir} not found; run python -m scripts.convert_jobs_dataset")
+    return ds.dataset(dataset_dir, format='parquet', filesystem=fs.LocalFileSystem(use_mmap=True),
+                      partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+
+
+def _expression(roles=None, filter=None):
+    import pyarrow.compute as pc
+
+    expression = filter
+    if roles is not None:
+        role_filter = pc.field(PARTITION_COLUMN).isin(list(roles))
+        expression = role_filter if expression is None else expression & role_filter
+    return expression
+
+
+def read_jobs(columns=DEFAULT_COLUMNS, roles=None, filter=None, limit=None, dataset_dir=JOBS_DATASET):
+    """Read a pyarrow Table of ``columns``, optionally only ``roles`` and rows matching ``filter``.
+
+    ``filter`` is a pyarrow.compute expression, e.g. ``pc.field('Role') != 'Intern'``.
+    """
+    dataset = open_dataset(dataset_dir)
+    expression = _expression(roles, filter)
+    if limit is not None:
+        return dataset.head(limit, columns=list(columns), filter=expression)
+    return dataset.to_table(columns=list(columns), filter=expression)
+
+
+def iter_batches(columns=DEFAULT_COLUMNS, roles=None, filter=None, batch_rows=5000, dataset_dir=JOBS_DATASET):
+    """Yield RecordBatches of at most ``batch_rows`` rows, in a stable order."""
+    dataset = open_dataset(dataset_dir)
+    yield from dataset.to_batches(columns=list(columns), filter=_expression(roles, filter),
+                                  batch_size=batch_rows, use_threads=False)
+
+
+def iter_interleaved(columns=DEFAULT_COLUMNS, batch_rows=5000, seed=0, dataset_dir=JOBS_DATASET):
+    """Yield Tables of about ``batch_rows`` rows, each mixing every file of the dataset in proportion.
+
+    iter_batches reads one Role partition after another, so a learner fed
+    in that order (SGDClassifier.partial_fit) sees one class at a time
+    and forgets the earlier ones. Here every file contributes its share
+    of each table, so every table holds each role at about its overall
+    frequency, and its rows are shuffled (seeded) so any slice of it
+    does too. At most one pending batch per file is held in memory.
+    """
+    import math
+
+    import numpy as np
+    import pyarrow as pa
+
+    dataset = open_dataset(dataset_dir)
+    fragments = list(dataset.get_fragments())
+    sizes = [fragment.count_rows() for fragment in fragments]
+    rounds = math.ceil(sum(sizes) / batch_rows)
+    rng = np.random.default_rng(seed)
+    streams = []
+    for fragment, size in zip(fragments, sizes):
+        if size:
+            quota = math.ceil(size / rounds)
+            batches = fragment.to_batches(schema=dataset.schema, columns=list(columns), batch_size=quota,
+                                          use_threads=False)
+            streams.append(_recut(batches, quota))
+    while streams:
+        parts, live = [], []
+        for stream in streams:
+            share = next(stream, None)
+            if share is not None:
+                parts.extend(share)
+                live.append(stream)
+        streams = live
+        if parts:
+            table = pa.Table.from_batches(parts)
+            yield table.take(rng.permutation(table.num_rows))
+
+
+def _recut(batches, rows):
+    """Re-cut a stream of RecordBatches into lists of slices totalling ``rows`` rows (the last may be short)."""
+    parts, needed = [], rows
+    for batch in batches:
+        while len(batch):
+            part = batch.slice(0, needed)
+            parts.append(part)
+            needed -= len(part)
+            batch = batch.slice(len(part))
+            if not needed:
+                yield parts
+                parts, needed = [], rows
+    if parts:
+        yield parts
+
+
+def list_roles(dataset_dir=JOBS_DATASET):
+    """Every role in the dataset, read from the partition directories only."""
+    dataset = open_dataset(dataset_dir)
+    return sorted({str(value) for value in dataset.partitioning.dictionaries[0]})
+
+
+def fingerprint(dataset_dir=JOBS_DATASET):
+    """SHA-256 over the dataset's file names and contents, to record which data a model saw."""
+    from utils.model_registry import file_sha256
+
+    digest = hashlib.sha256()
+    for root, dirs, names in os.walk(dataset_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            digest.update(f'{os.path.relpath(path, dataset_dir)}\0{file_sha256(path)}\n'.encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,157 @@
+# utils/llm_cache.py
+"""Persistent Gemini response cache shared by every session, worker and restart.
+
+Responses live in a local SQLite file keyed on the model name plus the
+SHA-256 of each prompt part. Entries expire after a TTL, the least recently
+used ones are evicted once the byte budget is exceeded, and hit/miss
+counters are kept in the same file so they aggregate across processes.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from utils.settings import LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_BYTES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_key(model_name, parts):
+    """Key a request on the model plus a hash of every prompt part, in order."""
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(hashlib.sha256(str(part).encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL, byte-budget LRU eviction and counters."""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads or forked processes
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, name):
+        self._connection().execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, model_name, parts):
+        """Return the cached response text, or None on a miss or expired entry."""
+        key = cache_key(model_name, parts)
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+            if row is not None:
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count("misses")
+            return None
+        connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return row[0]
+
+    def put(self, model_name, parts, response):
+        """Store a response and evict least recently used entries past the byte budget."""
+        key = cache_key(model_name, parts)
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model_name, response, size, now, now)
+        )
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones until under max_bytes."""
+        connection = self._connection()
+        if self.ttl_seconds:
+            connection.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        connection.execute(
+            "INSERT INTO counters (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (removed,)
+        )
+        return removed
+
+    def get_or_generate(self, model_name, parts, generate):
+        """Return the cached response or call ``generate()`` and cache its non-empty result."""
+        response = self.get(model_name, parts)
+        if response is not None:
+            return response
+        response = generate()
+        if response:
+            self.put(model_name, parts, response)
+        return response
+
+    def stats(self):
+        """Return hit/miss/eviction counters plus current entry count and size."""
+        connection = self._connection()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        stats.update(dict(connection.execute("SELECT name, value FROM counters").fetchall()))
+        entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide response cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
@@ -0,0 +1,517 @@
+# utils/location_resolver.py
+"""Offline location extraction from the resume header.
+
+A gazetteer of countries, states/provinces and major cities is compiled
+into one dict keyed on lower-cased phrases when the module is imported.
+The first lines of the resume are tokenized, and every 1-4 word n-gram is
+a single hash lookup, longest first. Postal codes are matched with
+compiled patterns: UK and Canadian codes anywhere, US ZIP and Indian PIN
+codes only right after a place of their country. The result has the same
+shape as the Gemini location prompt, in microseconds.
+
+resolve_location returns None unless a header line pins the place down
+with a postal code, "City, ST" or two agreeing places, and no other such
+line names a different country. Callers then fall back to Gemini.
+"""
+import re
+from collections import namedtuple
+
+HEADER_LINES = 20
+HEADER_CHARS = 2000
+MAX_NGRAM = 4
+# A postal code, "City, ST" or two places agreeing on one line; a lone place name could be anything
+MIN_STRENGTH = 2
+
+Place = namedtuple('Place', 'kind name state country')
+
+# canonical name: aliases (lower case). Georgia and Jordan are left out; they are US states and common names
+_COUNTRIES = {
+    "United States": ("united states", "united states of america", "america"),
+    "United Kingdom": ("united kingdom", "great britain", "britain", "england", "scotland", "wales",
+                       "northern ireland"),
+    "Canada": ("canada",), "Australia": ("australia",), "Germany": ("germany", "deutschland"),
+    "France": ("france",), "Italy": ("italy", "italia"), "Netherlands": ("netherlands", "the netherlands", "holland"),
+    "Spain": ("spain", "españa"), "India": ("india", "bharat"), "Ireland": ("ireland",),
+    "Singapore": ("singapore",), "New Zealand": ("new zealand",), "South Africa": ("south africa",),
+    "Nigeria": ("nigeria",), "Kenya": ("kenya",), "Pakistan": ("pakistan",), "Bangladesh": ("bangladesh",),
+    "Sri Lanka": ("sri lanka",), "Nepal": ("nepal",), "United Arab Emirates": ("united arab emirates",),
+    "Saudi Arabia": ("saudi arabia",), "Qatar": ("qatar",), "China": ("china",), "Japan": ("japan",),
+    "Philippines": ("philippines",), "Malaysia": ("malaysia",), "Indonesia": ("indonesia",), "Brazil": ("brazil",),
+    "Mexico": ("mexico",), "Poland": ("poland",), "Sweden": ("sweden",), "Switzerland": ("switzerland",),
+    "Belgium": ("belgium",), "Austria": ("austria",), "Portugal": ("portugal",), "Egypt": ("egypt",),
+}
+# Upper-case abbreviations only count when written exactly so
+_COUNTRY_ABBREVIATIONS = {"US": "United States", "USA": "United States", "UK": "United Kingdom",
+                          "UAE": "United Arab Emirates"}
+
+_STATES = {
+    "United States": (
+        "AL Alabama|AK Alaska|AZ Arizona|AR Arkansas|CA California|CO Colorado|CT Connecticut|DE Delaware|"
+        "FL Florida|GA Georgia|HI Hawaii|ID Idaho|IL Illinois|IN Indiana|IA Iowa|KS Kansas|KY Kentucky|"
+        "LA Louisiana|ME Maine|MD Maryland|MA Massachusetts|MI Michigan|MN Minnesota|MS Mississippi|"
+        "MO Missouri|MT Montana|NE Nebraska|NV Nevada|NH New Hampshire|NJ New Jersey|NM New Mexico|"
+        "NY New York|NC North Carolina|ND North Dakota|OH Ohio|OK Oklahoma|OR Oregon|PA Pennsylvania|"
+        "RI Rhode Island|SC South Carolina|SD South Dakota|TN Tennessee|TX Texas|UT Utah|VT Vermont|"
+        "VA Virginia|WA Washington|WV West Virginia|WI Wisconsin|WY Wyoming|DC District of Columbia"),
+    "Canada": (
+        "AB Alberta|BC British Columbia|MB Manitoba|NB New Brunswick|NL Newfoundland and Labrador|"
+        "NS Nova Scotia|ON Ontario|PE Prince Edward Island|QC Quebec|SK Saskatchewan|YT Yukon"),
+    "Australia": (
+        "NSW New South Wales|VIC Victoria|QLD Queensland|- Western Australia|- South Australia|TAS Tasmania|"
+        "ACT Australian Capital Territory|- Northern Territory"),
+    "India": (
+        "- Andhra Pradesh|- Arunachal Pradesh|- Assam|- Bihar|- Chhattisgarh|- Goa|- Gujarat|- Haryana|"
+        "- Himachal Pradesh|- Jharkhand|- Karnataka|- Kerala|- Madhya Pradesh|- Maharashtra|- Manipur|"
+        "- Meghalaya|- Mizoram|- Nagaland|- Odisha|- Punjab|- Rajasthan|- Sikkim|- Tamil Nadu|- Telangana|"
+        "- Tripura|- Uttar Pradesh|- Uttarakhand|- West Bengal|- Jammu and Kashmir|- Ladakh|- Puducherry|"
+        "- Chandigarh"),
+    "United Kingdom": "- Greater London|- West Midlands|- Greater Manchester|- Yorkshire",
+}
+
+# City[/alias...]|state|country; a name listed more than once is ambiguous, the first entry being the likelier.
+# Names that are also common words (Mobile, Reading, Bath, Nice, ...) are left out.
+_CITIES = """
+New York/New York City/NYC/Manhattan/Brooklyn|New York|United States
+Los Angeles|California|United States
+San Francisco|California|United States
+San Jose|California|United States
+San Diego|California|United States
+Sacramento|California|United States
+Oakland|California|United States
+Irvine|California|United States
+Mountain View|California|United States
+Palo Alto|California|United States
+Sunnyvale|California|United States
+Santa Clara|California|United States
+Cupertino|California|United States
+Chicago|Illinois|United States
+Houston|Texas|United States
+Dallas|Texas|United States
+Austin|Texas|United States
+San Antonio|Texas|United States
+Plano|Texas|United States
+Fort Worth|Texas|United States
+Phoenix|Arizona|United States
+Tucson|Arizona|United States
+Philadelphia|Pennsylvania|United States
+Pittsburgh|Pennsylvania|United States
+Seattle|Washington|United States
+Redmond|Washington|United States
+Bellevue|Washington|United States
+Boston|Massachusetts|United States
+Cambridge|Cambridgeshire|United Kingdom
+Cambridge|Massachusetts|United States
+Denver|Colorado|United States
+Boulder|Colorado|United States
+Atlanta|Georgia|United States
+Miami|Florida|United States
+Orlando|Florida|United States
+Tampa|Florida|United States
+Jacksonville|Florida|United States
+Nashville|Tennessee|United States
+Detroit|Michigan|United States
+Ann Arbor|Michigan|United States
+Minneapolis|Minnesota|United States
+Las Vegas|Nevada|United States
+Portland|Oregon|United States
+Portland|Maine|United States
+Charlotte|North Carolina|United States
+Raleigh|North Carolina|United States
+Baltimore|Maryland|United States
+Salt Lake City|Utah|United States
+St Louis/Saint Louis|Missouri|United States
+Kansas City|Missouri|United States
+Cleveland|Ohio|United States
+Columbus|Ohio|United States
+Cincinnati|Ohio|United States
+Indianapolis|Indiana|United States
+Milwaukee|Wisconsin|United States
+New Orleans|Louisiana|United States
+Jersey City|New Jersey|United States
+Newark|New Jersey|United States
+Princeton|New Jersey|United States
+Honolulu|Hawaii|United States
+Anchorage|Alaska|United States
+Albuquerque|New Mexico|United States
+Omaha|Nebraska|United States
+Richmond|Virginia|United States
+Arlington|Virginia|United States
+Washington DC/Washington D C|District of Columbia|United States
+London|Greater London|United Kingdom
+London|Ontario|Canada
+Manchester|Greater Manchester|United Kingdom
+Birmingham|West Midlands|United Kingdom
+Birmingham|Alabama|United States
+Leeds|Yorkshire|United Kingdom
+Sheffield|Yorkshire|United Kingdom
+Liverpool||United Kingdom
+Bristol||United Kingdom
+Nottingham||United Kingdom
+Leicester||United Kingdom
+Newcastle/Newcastle upon Tyne||United Kingdom
+Oxford||United Kingdom
+Southampton||United Kingdom
+Brighton||United Kingdom
+Coventry|West Midlands|United Kingdom
+Glasgow|Scotland|United Kingdom
+Edinburgh|Scotland|United Kingdom
+Aberdeen|Scotland|United Kingdom
+Cardiff|Wales|United Kingdom
+Belfast|Northern Ireland|United Kingdom
+Toronto|Ontario|Canada
+Ottawa|Ontario|Canada
+Mississauga|Ontario|Canada
+Waterloo|Ontario|Canada
+Vancouver|British Columbia|Canada
+Montreal/Montréal|Quebec|Canada
+Quebec City|Quebec|Canada
+Calgary|Alberta|Canada
+Edmonton|Alberta|Canada
+Winnipeg|Manitoba|Canada
+Halifax|Nova Scotia|Canada
+Sydney|New South Wales|Australia
+Melbourne|Victoria|Australia
+Brisbane|Queensland|Australia
+Gold Coast|Queensland|Australia
+Perth|Western Australia|Australia
+Adelaide|South Australia|Australia
+Canberra|Australian Capital Territory|Australia
+Hobart|Tasmania|Australia
+Berlin||Germany
+Munich/München/Muenchen|Bavaria|Germany
+Hamburg||Germany
+Frankfurt||Germany
+Cologne/Köln|North Rhine-Westphalia|Germany
+Düsseldorf/Dusseldorf|North Rhine-Westphalia|Germany
+Stuttgart||Germany
+Leipzig||Germany
+Dresden||Germany
+Paris||France
+Lyon||France
+Marseille||France
+Toulouse||France
+Bordeaux||France
+Lille||France
+Nantes||France
+Strasbourg||France
+Rome/Roma||Italy
+Milan/Milano||Italy
+Naples/Napoli||Italy
+Turin/Torino||Italy
+Bologna||Italy
+Florence/Firenze||Italy
+Amsterdam||Netherlands
+Rotterdam||Netherlands
+The Hague/Den Haag||Netherlands
+Utrecht||Netherlands
+Eindhoven||Netherlands
+Madrid||Spain
+Barcelona||Spain
+Valencia||Spain
+Seville/Sevilla||Spain
+Bilbao||Spain
+Malaga/Málaga||Spain
+Mumbai/Bombay/Navi Mumbai|Maharashtra|India
+Pune|Maharashtra|India
+Nagpur|Maharashtra|India
+Nashik|Maharashtra|India
+Thane|Maharashtra|India
+New Delhi/Delhi|Delhi|India
+Noida|Uttar Pradesh|India
+Ghaziabad|Uttar Pradesh|India
+Lucknow|Uttar Pradesh|India
+Kanpur|Uttar Pradesh|India
+Gurgaon/Gurugram|Haryana|India
+Faridabad|Haryana|India
+Bangalore/Bengaluru|Karnataka|India
+Mysore/Mysuru|Karnataka|India
+Hyderabad|Telangana|India
+Hyderabad|Sindh|Pakistan
+Chennai/Madras|Tamil Nadu|India
+Coimbatore|Tamil Nadu|India
+Kolkata/Calcutta|West Bengal|India
+Ahmedabad|Gujarat|India
+Surat|Gujarat|India
+Vadodara|Gujarat|India
+Jaipur|Rajasthan|India
+Indore|Madhya Pradesh|India
+Bhopal|Madhya Pradesh|India
+Kochi/Cochin|Kerala|India
+Thiruvananthapuram/Trivandrum|Kerala|India
+Visakhapatnam/Vizag|Andhra Pradesh|India
+Patna|Bihar|India
+Bhubaneswar|Odisha|India
+Dublin||Ireland
+Cork||Ireland
+Auckland||New Zealand
+Wellington||New Zealand
+Johannesburg||South Africa
+Cape Town||South Africa
+Lagos||Nigeria
+Abuja||Nigeria
+Nairobi||Kenya
+Karachi|Sindh|Pakistan
+Lahore|Punjab|Pakistan
+Islamabad||Pakistan
+Dhaka||Bangladesh
+Colombo||Sri Lanka
+Kathmandu||Nepal
+Dubai||United Arab Emirates
+Abu Dhabi||United Arab Emirates
+Riyadh||Saudi Arabia
+Doha||Qatar
+Beijing||China
+Shanghai||China
+Shenzhen||China
+Hong Kong||China
+Tokyo||Japan
+Manila||Philippines
+Kuala Lumpur||Malaysia
+Jakarta||Indonesia
+Sao Paulo/São Paulo||Brazil
+Mexico City||Mexico
+Warsaw||Poland
+Stockholm||Sweden
+Zurich/Zürich||Switzerland
+Geneva||Switzerland
+Brussels||Belgium
+Vienna||Austria
+Lisbon||Portugal
+Cairo||Egypt
+"""
+
+_TOKEN = re.compile(r"[^\W\d_]+")
+_POSTAL_ANYWHERE = (
+    (re.compile(r"\b[A-Z]{1,2}\d[A-Z\d]? ?\d[ABD-HJLNP-UW-Z]{2}\b"), "United Kingdom"),
+    (re.compile(r"\b[ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z] ?\d[ABCEGHJ-NPRSTV-Z]\d\b"), "Canada"),
+)
+# Only read right after a place in the matching country, where a bare number cannot be anything else
+_POSTAL_AFTER = {
+    "United States": re.compile(r"[\s,]*(\d{5}(?:-\d{4})?)\b"),
+    "India": re.compile(r"[\s,:-]*(?:pin(?:code)?[\s:.-]*)?(\d{3} ?\d{3})\b", re.IGNORECASE),
+}
+
+
+def _build():
+    """Compile the gazetteer: lower-cased phrase -> places, and upper-case abbreviation -> places."""
+    phrases, abbreviations = {}, {}
+
+    def add(table, key, place):
+        if place not in table.setdefault(key, []):
+            table[key].append(place)
+
+    for country, aliases in _COUNTRIES.items():
+        for alias in aliases:
+            add(phrases, alias, Place('country', country, '', country))
+    for abbreviation, country in _COUNTRY_ABBREVIATIONS.items():
+        add(abbreviations, abbreviation, Place('country', country, '', country))
+    for country, states in _STATES.items():
+        for entry in states.split('|'):
+            abbreviation, name = entry.split(' ', 1)
+            place = Place('state', name, name, country)
+            add(phrases, ' '.join(_TOKEN.findall(name.lower())), place)
+            if abbreviation != '-':
+                add(abbreviations, abbreviation, place)
+    for line in _CITIES.strip().splitlines():
+        names, state, country = line.split('|')
+        names = names.split('/')
+        for name in names:
+            add(phrases, ' '.join(_TOKEN.findall(name.lower())), Place('city', names[0], state, country))
+    return phrases, abbreviations
+
+
+PHRASES, ABBREVIATIONS = _build()
+
+
+# "Augusta, ME": a capitalized name, a comma and an upper-case state abbreviation
+_CITY_STATE = re.compile(r"([A-Z][^\W\d_]+(?:[ -][A-Z][^\W\d_]+){0,2}),\s*([A-Z]{2,3})\b")
+# Places inside an institution's name ("University of Maine", "Delhi Technological University") are not addresses
+_INSTITUTION_BEFORE = frozenset(("of",))
+_INSTITUTION_AFTER = frozenset(("university", "college", "institute", "school", "academy"))
+_LOCATION_LABELS = frozenset(("address", "location", "based in", "residence", "home", "city"))
+_SEPARATOR = re.compile(r"[|•·●▪◦♦;]|\s[-–—]\s")
+
+
+def _is_capitalized(token):
+    return token[0].isupper()
+
+
+def _in_institution_name(tokens, lowered, line, i, n):
+    """Whether the place at tokens[i:i + n] is followed, within a run of capitalized words, by "University" etc."""
+    if i and lowered[i - 1] in _INSTITUTION_BEFORE:
+        return True
+    j = i + n
+    while j < len(tokens) and not line[tokens[j - 1][2]:tokens[j][1]].strip():
+        if lowered[j] in _INSTITUTION_AFTER:
+            return True
+        if not _is_capitalized(tokens[j][0]):
+            return False
+        j += 1
+    return False
+
+
+def _is_address(line, match):
+    """Whether a "Name, ST" match reads as an address rather than a list ("Skills: Python, Excel, MS Office").
+
+    Within its separator-delimited segment, only a street part with a
+    number, or a location label, may come before it, and only a postal
+    code or a country after it.
+    """
+    start = max((m.end() for m in _SEPARATOR.finditer(line, 0, match.start(1))), default=0)
+    stop = _SEPARATOR.search(line, match.end(2))
+    before = line[start:match.start(1)]
+    after = line[match.end(2):stop.start() if stop else len(line)].strip(' ,.')
+    if ':' in before:
+        label, before = before.rsplit(':', 1)
+        if ' '.join(_TOKEN.findall(label.lower())) not in _LOCATION_LABELS:
+            return False
+    if before.strip(' ,') and not any(c.isdigit() for c in before):
+        return False
+    if not after:
+        return True
+    country = PHRASES.get(' '.join(_TOKEN.findall(after.lower())), ())
+    return any(place.kind == 'country' for place in country) or bool(
+        re.fullmatch(r"\d{5}(?:-\d{4})?(?:\s*,?\s*(?:USA?|United States))?", after))
+
+
+def _postal_after(country, line, end):
+    """A postal code of ``country`` right after position ``end`` of the line, or None."""
+    pattern = _POSTAL_AFTER.get(country)
+    return pattern.match(line, end) if pattern else None
+
+
+def _line_places(line):
+    """[(place options, start, end)] for every gazetteer phrase in one line, longest match first."""
+    tokens = [(m.group(), m.start(), m.end()) for m in _TOKEN.finditer(line)]
+    lowered = [token.lower() for token, _s, _e in tokens]
+    city_state_ends = {m.end(2) for m in _CITY_STATE.finditer(line) if _is_address(line, m)} if ',' in line else ()
+    found = []
+    i = 0
+    while i < len(tokens):
+        # Place names are capitalized; "america" or "victoria" in running text are not places
+        if not _is_capitalized(tokens[i][0]):
+            i += 1
+            continue
+        for n in range(min(MAX_NGRAM, len(tokens) - i), 0, -1):
+            places = PHRASES.get(' '.join(lowered[i:i + n]))
+            if places and _is_capitalized(tokens[i + n - 1][0]):
+                if not _in_institution_name(tokens, lowered, line, i, n):
+                    found.append((places, tokens[i][1], tokens[i + n - 1][2]))
+                i += n
+                break
+        else:
+            token, start, end = tokens[i]
+            places = ABBREVIATIONS.get(token) if token.isupper() else None
+            # A state abbreviation needs a place or "Name," before it, or a postal code after it
+            if places and (places[0].kind == 'country' or end in city_state_ends
+                           or (found and not line[found[-1][2]:start].strip(', '))
+                           or _postal_after(places[0].country, line, end)):
+                found.append((places, start, end))
+            i += 1
+    return found
+
+
+def _choose(options, countries, states=()):
+    """The first option in one of ``states``, else in one of ``countries``, else the first option."""
+    for place in options:
+        if place.state in states:
+            return place
+    for place in options:
+        if place.country in countries:
+            return place
+    return options[0]
+
+
+def _resolve_line(line):
+    """(location dict, set of countries that fit every place, strength) for one header line, or None."""
+    mentions = _line_places(line)
+    postal_code = ''
+    postal_countries = set()
+    for pattern, country in _POSTAL_ANYWHERE:
+        match = pattern.search(line)
+        if match:
+            postal_code, postal_countries = match.group(), {country}
+            break
+    if not mentions and not postal_code:
+        return None
+
+    # Countries consistent with every mention on the line
+    countries = None
+    for options, _start, _end in mentions:
+        option_countries = {place.country for place in options}
+        countries = option_countries if countries is None else countries & option_countries
+    if postal_countries:
+        countries = postal_countries if countries is None else countries & postal_countries
+    if not countries:
+        return {}, set(), 0
+
+    states = {place.name for options, _s, _e in mentions for place in options
+              if place.kind == 'state' and place.country in countries}
+    location = {"city": "", "state": "", "country": "", "postal_code": postal_code, "full_address": ""}
+    for options, _start, end in mentions:
+        place = _choose(options, countries, states)
+        if not location[place.kind]:
+            location[place.kind] = place.name
+        if place.kind == 'city' and place.state and not location['state']:
+            location['state'] = place.state
+        if not location['postal_code']:
+            match = _postal_after(place.country, line, end)
+            if match:
+                location['postal_code'] = match.group(1)
+    city_guessed = False
+    if not location['city'] and location['state']:
+        # A city missing from the gazetteer, written as "City, ST" in an address
+        for match in _CITY_STATE.finditer(line):
+            if (any(place.name == location['state'] for place in ABBREVIATIONS.get(match.group(2), ()))
+                    and _is_address(line, match)):
+                location['city'] = match.group(1)
+                city_guessed = True
+                break
+    if not location['country']:
+        location['country'] = _choose(mentions[0][0], countries).country if mentions else next(iter(countries))
+    location['full_address'] = ' '.join(line.split())[:200]
+    # Two places agreeing with each other, "City, ST" or a postal code make the line more than a passing mention
+    strength = len(mentions) + city_guessed + (2 if location['postal_code'] else 0)
+    return location, {location['country']}, strength
+
+
+def header_lines(text):
+    """The first HEADER_LINES non-blank lines of the resume, within HEADER_CHARS characters."""
+    lines = [line for line in (text or '')[:HEADER_CHARS].splitlines() if line.strip()]
+    return lines[:HEADER_LINES]
+
+
+def resolve_location(text):
+    """The candidate's location from the earliest header line that pins it down, else None.
+
+    A line counts when it reaches MIN_STRENGTH: a postal code, "City, ST"
+    or two places that agree. A single bare place name ("Phoenix
+    Technologies", a person called Paris) is left to Gemini, and so is a
+    line whose places contradict each other, or a header whose counting
+    lines disagree on the country.
+    """
+    resolved = []
+    for line in header_lines(text):
+        result = _resolve_line(line)
+        if result is not None and result[1] and result[2] >= MIN_STRENGTH:
+            resolved.append(result)
+    if not resolved or len({result[0]['country'] for result in resolved}) > 1:
+        return None
+    return resolved[0][0]
+
+
+def infer_country(location_info):
+    """Country name for a location dict: its country field, else from its address or state."""
+    country = (location_info.get("country") or "").strip()
+    if country:
+        return country
+    if location_info.get("full_address"):
+        for result in map(_resolve_line, location_info["full_address"].splitlines()):
+            if result and result[1]:
+                return result[0]["country"]
+    state = (location_info.get("state") or "").strip()
+    places = ABBREVIATIONS.get(state) or PHRASES.get(' '.join(_TOKEN.findall(state.lower())), [])
+    for place in places:
+        if place.kind == 'state':
+            return place.country
+    return None
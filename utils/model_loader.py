@@ -1,17 +1,25 @@
 # models/model_loader.py
-import pickle
 import streamlit as st
+from utils.compact_model import CompactTextClassifier
+from utils.model_registry import ModelRegistry
+
+MODEL_NAMES = (
+    'rf_classifier_categorization',
+    'tfidf_vectorizer_categorization',
+    'rf_classifier_job_recommendation',
+    'tfidf_vectorizer_job_recommendation',
+)
 
 @st.cache_resource
+def get_model_registry():
+    """Process-wide registry; models load lazily from models/manifest.json."""
+    from services.retrieval_service import RoleIndex
+    return ModelRegistry(loaders={'compact': CompactTextClassifier.load, 'role_index': RoleIndex.load})
+
+def load_model(name):
+    """Load one model on demand; raises ModelUnavailable if it cannot be served."""
+    return get_model_registry().get(name)
+
 def load_ml_models():
-    """Load ML models with proper caching."""
-    rf_classifier_categorization = pickle.load(open('models/rf_classifier_categorization.pkl', 'rb'))
-    tfidf_vectorizer_categorization = pickle.load(open('models/tfidf_vectorizer_categorization.pkl', 'rb'))
-    rf_classifier_job_recommendation = pickle.load(open('models/rf_classifier_job_recommendation.pkl', 'rb'))
-    tfidf_vectorizer_job_recommendation = pickle.load(open('models/tfidf_vectorizer_job_recommendation.pkl', 'rb'))
-    return {
-        'rf_classifier_categorization': rf_classifier_categorization,
-        'tfidf_vectorizer_categorization': tfidf_vectorizer_categorization,
-        'rf_classifier_job_recommendation': rf_classifier_job_recommendation,
-        'tfidf_vectorizer_job_recommendation': tfidf_vectorizer_job_recommendation
-    }
+    """Load all four models; raises ModelUnavailable if any of them cannot be served."""
+    return {name: load_model(name) for name in MODEL_NAMES}
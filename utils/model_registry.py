@@ -0,0 +1,238 @@
+# utils/model_registry.py
+"""Lazy, integrity-checked loading of the serving models.
+
+models/manifest.json lists every artifact with its file, version, SHA-256
+and the scikit-learn version it was written with. Each artifact is loaded
+on first use (or by the background warm-up started with the app), after
+its hash has been checked against the manifest. A missing, unregistered or
+corrupted artifact raises ModelUnavailable for the features that need it
+only. Load times and sizes are kept for the admin dashboard.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+
+MODELS_DIR = 'models'
+MANIFEST_PATH = os.path.join(MODELS_DIR, 'manifest.json')
+MANIFEST_FORMAT = 1
+
+
+class ModelUnavailable(RuntimeError):
+    """An artifact is missing, unregistered or fails its integrity check."""
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def estimate_size(obj, _seen=None):
+    """Approximate resident bytes of a loaded model: arrays, containers and object attributes."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        base = getattr(obj, 'base', None)
+        if base is None:
+            return nbytes + sys.getsizeof(obj)
+        # A view (e.g. SGD's coef_) owns no data; count what it views once (a memory map counts as ~0)
+        return sys.getsizeof(obj) + estimate_size(base, seen)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), seen)
+    return size
+
+
+def read_manifest(path=MANIFEST_PATH):
+    """Return the manifest's artifact entries, or {} if there is no manifest."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ModelUnavailable(f"{path}: unsupported manifest format {manifest.get('format')!r}")
+    return manifest.get('artifacts', {})
+
+
+def register_artifact(name, path, version, manifest_path=MANIFEST_PATH, **extra):
+    """Record (or replace) an artifact in the manifest with its current hash.
+
+    ``path`` is stored relative to the manifest's directory; ``extra``
+    fields (e.g. metrics) are stored alongside.
+    """
+    import sklearn
+
+    artifacts = read_manifest(manifest_path)
+    base = os.path.dirname(manifest_path)
+    artifacts[name] = dict(
+        extra,
+        path=os.path.relpath(path, base),
+        version=str(version),
+        sha256=file_sha256(path),
+        bytes=os.path.getsize(path),
+        sklearn_version=sklearn.__version__,
+    )
+    _write_manifest(artifacts, manifest_path)
+    return artifacts[name]
+
+
+def unregister_artifact(name, manifest_path=MANIFEST_PATH):
+    """Remove an artifact from the manifest (its files are left alone); returns whether it was there."""
+    artifacts = read_manifest(manifest_path)
+    if artifacts.pop(name, None) is None:
+        return False
+    _write_manifest(artifacts, manifest_path)
+    return True
+
+
+def _write_manifest(artifacts, manifest_path):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'format': MANIFEST_FORMAT, 'artifacts': dict(sorted(artifacts.items()))}, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, manifest_path)
+
+
+def _load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class ModelRegistry:
+    """Thread-safe registry that loads each manifest artifact once, on demand."""
+
+    def __init__(self, manifest_path=MANIFEST_PATH, loaders=None):
+        self.manifest_path = manifest_path
+        self.loaders = {'pickle': _load_pickle, **(loaders or {})}
+        self._lock = threading.Lock()
+        self._name_locks = {}
+        self._models = {}
+        self._failures = {}
+        self._stats = {}
+        self._warm_up_thread = None
+
+    def _entry(self, name):
+        try:
+            artifacts = read_manifest(self.manifest_path)
+        except (OSError, ValueError) as e:
+            raise ModelUnavailable(f"cannot read {self.manifest_path}: {e}") from e
+        if name not in artifacts:
+            raise ModelUnavailable(f"model '{name}' is not registered in {self.manifest_path}")
+        return artifacts[name]
+
+    def _load(self, name):
+        entry = self._entry(name)
+        path = os.path.join(os.path.dirname(self.manifest_path), entry['path'])
+        if not os.path.exists(path):
+            raise ModelUnavailable(f"model '{name}' (version {entry.get('version')}) is missing: {path}")
+        started = time.perf_counter()
+        if file_sha256(path) != entry['sha256']:
+            raise ModelUnavailable(f"model '{name}' failed its integrity check: {path} does not match the manifest hash")
+        loader = self.loaders.get(entry.get('format', 'pickle'))
+        if loader is None:
+            raise ModelUnavailable(f"model '{name}': unknown artifact format {entry.get('format')!r}")
+        try:
+            model = loader(path)
+        except Exception as e:
+            raise ModelUnavailable(f"model '{name}' could not be loaded from {path}: {e}") from e
+        load_seconds = time.perf_counter() - started
+
+        warnings = []
+        # Only pickles depend on the scikit-learn version (and only they need it imported)
+        if entry.get('format', 'pickle') == 'pickle' and entry.get('sklearn_version'):
+            import sklearn
+            if entry['sklearn_version'] != sklearn.__version__:
+                warnings.append(f"written with scikit-learn {entry['sklearn_version']}, running {sklearn.__version__}")
+        self._stats[name] = {
+            'version': entry.get('version'),
+            'load_seconds': round(load_seconds, 3),
+            'file_bytes': os.path.getsize(path),
+            'resident_bytes': estimate_size(model),
+            'warnings': warnings,
+        }
+        return model
+
+    def get(self, name):
+        """Return a loaded model, loading it on first use; raises ModelUnavailable.
+
+        A failure is remembered, so later requests fail fast until reload().
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        with name_lock:
+            if name in self._models:
+                return self._models[name]
+            if name in self._failures:
+                raise ModelUnavailable(self._failures[name])
+            try:
+                model = self._load(name)
+            except ModelUnavailable as e:
+                self._failures[name] = str(e)
+                raise
+            self._models[name] = model
+            return model
+
+    def reload(self, name=None):
+        """Forget a loaded or failed model (or all of them) so the next get() loads it again."""
+        with self._lock:
+            names = [name] if name else list(set(self._models) | set(self._failures))
+            for n in names:
+                self._models.pop(n, None)
+                self._failures.pop(n, None)
+                self._stats.pop(n, None)
+
+    def warm_up(self, names=None):
+        """Load the given (or all registered) models on a background thread, once per registry."""
+        with self._lock:
+            if self._warm_up_thread is not None:
+                return self._warm_up_thread
+            if names is None:
+                try:
+                    names = list(read_manifest(self.manifest_path))
+                except (OSError, ValueError, ModelUnavailable):
+                    names = []
+
+            def run():
+                for name in names:
+                    try:
+                        self.get(name)
+                    except ModelUnavailable:
+                        pass
+
+            self._warm_up_thread = threading.Thread(target=run, name='model-warm-up', daemon=True)
+            self._warm_up_thread.start()
+            return self._warm_up_thread
+
+    def stats(self):
+        """Per-model status, version, load time and sizes."""
+        try:
+            names = set(read_manifest(self.manifest_path))
+        except (OSError, ValueError, ModelUnavailable):
+            names = set()
+        names |= set(self._models) | set(self._failures)
+        stats = {}
+        for name in sorted(names):
+            if name in self._models:
+                stats[name] = dict(self._stats.get(name, {}), status='loaded')
+            elif name in self._failures:
+                stats[name] = {'status': 'failed', 'error': self._failures[name]}
+            else:
+                stats[name] = {'status': 'not loaded'}
+        return stats
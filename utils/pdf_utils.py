@@ -1,47 +1,95 @@
 # utils/pdf_utils.py
 import streamlit as st
-import base64
+import os
 import re
 import json
+import tempfile
+import time
 from utils.gemini_utils import get_gemini_response1 # Correct relative import
+from utils.document_cache import document_hash, get_document, put_extraction, read_pdf_bytes
+from utils.prompt_builder import trim_to_budget
+from utils.settings import EXTRACTION_PROMPT_TOKENS, PREVIEW_DIR, PREVIEW_MAX_AGE_SECONDS
+
+GEMINI_EXTRACTION = "gemini_resume_data"
 
 
-@st.cache_data
 def pdf_reader(file):
-    """Extract text from PDF using PdfReader."""
+    """Extract text from a PDF (path, bytes or upload) through the document cache."""
     try:
-        from PyPDF2 import PdfReader 
-        reader = PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        return get_document(file)["text"]
     except ImportError:
         st.error("PyPDF2 is not installed. Please install it.")
         return None
 
 
-def show_pdf(file_path):
-    """Display PDF in Streamlit."""
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = F'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
+def publish_preview(pdf_file, sha256=None, directory=PREVIEW_DIR):
+    """Publish a PDF in the static preview directory once per content hash; returns its URL.
+
+    The preview is its own copy, so its age limit and the upload store's
+    eviction never touch each other's files. Every new preview prunes the
+    expired ones. Later calls for the same document only refresh the
+    file's mtime, which keeps it from being pruned, so nothing is read or
+    encoded per rerun.
+    """
+    pdf_bytes = None
+    if sha256 is None:
+        pdf_bytes = read_pdf_bytes(pdf_file)
+        sha256 = document_hash(pdf_bytes)
+    path = os.path.join(directory, sha256 + '.pdf')
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_bytes if pdf_bytes is not None else read_pdf_bytes(pdf_file))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        prune_previews(directory)
+    return 'app/' + path.replace(os.sep, '/')
+
+
+def prune_previews(directory=PREVIEW_DIR, max_age=PREVIEW_MAX_AGE_SECONDS):
+    """Delete previews not viewed for ``max_age`` seconds."""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def show_pdf(pdf_file, sha256=None):
+    """Display PDF in Streamlit.
+
+    The iframe points at the file under Streamlit's static serving instead
+    of inlining it base64-encoded, so a rerun only sends the URL.
+    """
+    url = publish_preview(pdf_file, sha256)
+    pdf_display = F'<iframe src="{url}" width="700" height="1000" type="application/pdf"></iframe>'
     st.markdown(pdf_display, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=3600)
-def extract_resume_data_with_gemini(pdf_path):
-    """Extract resume data using Gemini API."""
+def extract_resume_data_with_gemini(pdf_file, sha256=None):
+    """Extract resume data using Gemini API.
+
+    Results are stored with the parsed document, so a repeat upload of the
+    same bytes skips both PDF parsing and the Gemini call.
+    """
     try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(pdf_path)
-        max_pages = min(3, len(reader.pages))  # Limit to first 3 pages
-        text = ""
-        for i in range(max_pages):
-            page = reader.pages[i]
-            page_text = page.extract_text()
-            if page_text is not None:
-                text += page_text
+        document = get_document(pdf_file, sha256)
+        cached = document["extractions"].get(GEMINI_EXTRACTION)
+        if cached is not None:
+            return cached
+
+        no_of_pages = document["no_of_pages"]
+        # Send the resume once, trimmed section-aware (contact and skills first) to the token budget
+        text = trim_to_budget(document["text"], EXTRACTION_PROMPT_TOKENS)
 
         prompt5 = """
         You are a resume parsing assistant. Extract the following information from the resume text below:
@@ -52,7 +100,7 @@ def extract_resume_data_with_gemini(pdf_path):
 
         VERY IMPORTANT: Return your answer ONLY as a valid JSON object with these exact keys:
         name, email, mobile_number, skills (as an array). Try to limit single skill to at most 3 words.
-        Extract skills from at most 5 pages of the resume. Return at most 10 skills.
+        Return at most 10 skills.
         Format your response as valid, parseable JSON with no other text before or after.
         Ensure all quotes are properly escaped.
 
@@ -61,7 +109,6 @@ def extract_resume_data_with_gemini(pdf_path):
 
         RESUME TEXT:
         """
-        prompt5 += text
 
         response = get_gemini_response1(prompt5, text)  # Use the Gemini utility
 
@@ -74,7 +121,8 @@ def extract_resume_data_with_gemini(pdf_path):
                     data = json.loads(json_str)
                 else:
                     data = json.loads(response)
-                data["no_of_pages"] = len(reader.pages)
+                data["no_of_pages"] = no_of_pages
+                put_extraction(document["sha256"], GEMINI_EXTRACTION, data)
                 return data
             except json.JSONDecodeError as e:
                 with open("error.log", "a") as f:
@@ -105,7 +153,7 @@ def extract_resume_data_with_gemini(pdf_path):
                     "email": email,
                     "mobile_number": mobile_number,
                     "skills": skills,
-                    "no_of_pages": len(reader.pages)
+                    "no_of_pages": no_of_pages
                 }
                 return fallback_data
 
@@ -117,7 +165,7 @@ def extract_resume_data_with_gemini(pdf_path):
                 "email": "",
                 "mobile_number": "",
                 "skills": [],
-                "no_of_pages": len(reader.pages)
+                "no_of_pages": no_of_pages
             }
 
     except Exception as e:
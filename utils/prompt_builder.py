@@ -0,0 +1,138 @@
+# utils/prompt_builder.py
+"""Token-budgeted prompt construction for Gemini requests.
+
+Prompt parts are deduplicated and their size estimated locally. When a
+document does not fit its budget it is trimmed section by section: the
+header (name and contact details) and skills are kept ahead of summaries,
+education and projects, and long experience narratives go first.
+"""
+import math
+import re
+
+from utils.settings import PROMPT_MAX_TOKENS
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "[...]"
+
+# Section heading keywords and their keep priority (lower is kept first)
+SECTION_PRIORITIES = (
+    (0, ('contact', 'contact information', 'contact details', 'personal details', 'personal information')),
+    (1, ('skills', 'technical skills', 'key skills', 'core competencies', 'competencies', 'technologies',
+         'tools', 'expertise', 'areas of expertise', 'highlights', 'skill highlights')),
+    (2, ('summary', 'professional summary', 'profile', 'professional profile', 'objective',
+         'career objective', 'about me')),
+    (3, ('education', 'academic background', 'qualifications', 'certifications', 'certificates',
+         'licenses', 'languages')),
+    (4, ('projects', 'achievements', 'accomplishments', 'awards', 'publications')),
+    (5, ('experience', 'work experience', 'professional experience', 'employment', 'employment history',
+         'work history', 'career history', 'internships')),
+    (7, ('interests', 'hobbies', 'references', 'declaration', 'activities', 'volunteer')),
+)
+HEADER_PRIORITY = 0
+
+_HEADINGS = {heading: priority for priority, headings in SECTION_PRIORITIES for heading in headings}
+_HEADING_LINE = re.compile(r'^\s*([A-Za-z][A-Za-z &/]{1,40}?)\s*:?\s*$')
+
+
+def estimate_tokens(text):
+    """Estimate the token count of a text without calling the API.
+
+    Uses the larger of ~4 characters per token and one token per word, which
+    over- rather than under-estimates for resume text.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / CHARS_PER_TOKEN), len(text.split()))
+
+
+def _heading_priority(line):
+    match = _HEADING_LINE.match(line)
+    if not match:
+        return None
+    return _HEADINGS.get(' '.join(match.group(1).lower().split()))
+
+
+def split_sections(text):
+    """Split resume text into (priority, text) sections at recognised headings.
+
+    Everything before the first heading is the header, which normally holds
+    the name and contact details.
+    """
+    sections = []
+    priority, lines = HEADER_PRIORITY, []
+    for line in text.splitlines(keepends=True):
+        heading_priority = _heading_priority(line)
+        if heading_priority is not None:
+            if lines:
+                sections.append((priority, ''.join(lines)))
+            priority, lines = heading_priority, []
+        lines.append(line)
+    if lines:
+        sections.append((priority, ''.join(lines)))
+    return sections
+
+
+def _truncate(text, max_tokens):
+    """Cut text at a line boundary (or hard, for one long line) to about max_tokens."""
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER) - 1)
+    if max_chars <= 0:
+        return ''
+    cut = text.rfind('\n', 0, max_chars)
+    if cut <= 0:
+        cut = max_chars
+    return text[:cut].rstrip() + '\n' + TRUNCATION_MARKER + '\n'
+
+
+def trim_to_budget(text, max_tokens):
+    """Return text unchanged if it fits max_tokens, otherwise a section-aware cut.
+
+    Sections are admitted in priority order, the first one that does not fit
+    is truncated to the remaining budget, and the kept sections are put back
+    in their original document order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sections = split_sections(text)
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], i))
+    kept = {}
+    remaining = max_tokens
+    for i in order:
+        section = sections[i][1]
+        tokens = estimate_tokens(section)
+        if tokens <= remaining:
+            kept[i] = section
+            remaining -= tokens
+        else:
+            truncated = _truncate(section, remaining)
+            if truncated:
+                kept[i] = truncated
+            break
+    return ''.join(kept[i] for i in sorted(kept))
+
+
+def dedupe_parts(parts):
+    """Drop empty parts and any part already contained in an earlier one."""
+    kept = []
+    for part in parts:
+        text = str(part)
+        stripped = text.strip()
+        if not stripped or any(stripped in earlier for earlier in kept):
+            continue
+        kept.append(text)
+    return kept
+
+
+def fit_parts(parts, max_tokens=PROMPT_MAX_TOKENS):
+    """Deduplicate prompt parts and trim the largest until the total fits max_tokens."""
+    parts = dedupe_parts(parts)
+    sizes = [estimate_tokens(part) for part in parts]
+    while parts and sum(sizes) > max_tokens:
+        largest = max(range(len(parts)), key=sizes.__getitem__)
+        budget = max(0, sizes[largest] - (sum(sizes) - max_tokens))
+        trimmed = trim_to_budget(parts[largest], budget)
+        if estimate_tokens(trimmed) >= sizes[largest]:
+            break
+        parts[largest] = trimmed
+        sizes[largest] = estimate_tokens(trimmed)
+    return parts
+
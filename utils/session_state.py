@@ -14,12 +14,23 @@ def reset_session_state():
     #     del st.session_state.predicted_category
     if 'recommended_job' in st.session_state:
         del st.session_state.recommended_job
+    if 'model_errors' in st.session_state:
+        del st.session_state.model_errors
     if 'recommended_skills' in st.session_state:
         del st.session_state.recommended_skills
     if 'rec_course' in st.session_state:
         del st.session_state.rec_course
+    if 'domain_ranking' in st.session_state:
+        del st.session_state.domain_ranking
+    if 'skill_gaps' in st.session_state:
+        del st.session_state.skill_gaps
+    if 'similar_roles' in st.session_state:
+        del st.session_state.similar_roles
     if 'summary_response' in st.session_state:
         del st.session_state.summary_response
+    if 'ai_client' in st.session_state:
+        st.session_state.ai_client.cancel_all()
+        del st.session_state.ai_client
     
     # Clear all job search related variables
     if 'job_results' in st.session_state:
@@ -0,0 +1,80 @@
+# utils/settings.py
+"""Tunable limits for local caches and stores, overridable through environment variables."""
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+CACHE_DIR = os.environ.get("SRA_CACHE_DIR", ".cache")
+
+# Parsed-document cache (utils/document_cache.py)
+DOCUMENT_CACHE_DIR = os.path.join(CACHE_DIR, "documents")
+DOCUMENT_CACHE_MAX_ENTRIES = _env_int("SRA_DOCUMENT_CACHE_MAX_ENTRIES", 5000)
+DOCUMENT_CACHE_MAX_BYTES = _env_int("SRA_DOCUMENT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Content-addressed store of uploaded resumes (utils/upload_store.py); found by the batch tools and Recruiter page
+UPLOAD_STORE_DIR = os.environ.get("SRA_UPLOAD_STORE_DIR", os.path.join("Uploaded_Resumes", "store"))
+UPLOAD_MAX_FILE_BYTES = _env_int("SRA_UPLOAD_MAX_FILE_BYTES", 20 * 1024 * 1024)
+UPLOAD_STORE_MAX_BYTES = _env_int("SRA_UPLOAD_STORE_MAX_BYTES", 1024 * 1024 * 1024)
+# Uploads nobody has opened for this long are removed
+UPLOAD_STORE_MAX_AGE_SECONDS = _env_int("SRA_UPLOAD_STORE_MAX_AGE_SECONDS", 30 * 24 * 3600)
+
+# Persistent Gemini response cache (utils/llm_cache.py)
+LLM_CACHE_PATH = os.environ.get("SRA_LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = _env_int("SRA_LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+LLM_CACHE_MAX_BYTES = _env_int("SRA_LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Prompt construction (utils/prompt_builder.py)
+# Hard ceiling for any Gemini request, kept under the model's 30720-token input limit
+PROMPT_MAX_TOKENS = _env_int("SRA_PROMPT_MAX_TOKENS", 30000)
+# Budget for the resume text in the structured-extraction prompt
+EXTRACTION_PROMPT_TOKENS = _env_int("SRA_EXTRACTION_PROMPT_TOKENS", 6000)
+
+# Background Gemini calls (services/async_ai_service.py)
+AI_SESSION_CONCURRENCY = _env_int("SRA_AI_SESSION_CONCURRENCY", 3)
+AI_CALL_TIMEOUT_SECONDS = _env_int("SRA_AI_CALL_TIMEOUT_SECONDS", 60)
+
+# MySQL connection pool (utils/db_pool.py)
+DB_POOL_MAX_SIZE = _env_int("SRA_DB_POOL_MAX_SIZE", 5)
+DB_POOL_IDLE_TIMEOUT_SECONDS = _env_int("SRA_DB_POOL_IDLE_TIMEOUT_SECONDS", 300)
+# Idle connections are pinged before reuse once they have been idle this long
+DB_POOL_PING_AFTER_SECONDS = _env_int("SRA_DB_POOL_PING_AFTER_SECONDS", 30)
+DB_POOL_CHECKOUT_TIMEOUT_SECONDS = _env_int("SRA_DB_POOL_CHECKOUT_TIMEOUT_SECONDS", 10)
+
+# Write-behind queue for analysis rows (utils/write_behind.py)
+DB_WRITE_BATCH_SIZE = _env_int("SRA_DB_WRITE_BATCH_SIZE", 100)
+DB_WRITE_FLUSH_INTERVAL_MS = _env_int("SRA_DB_WRITE_FLUSH_INTERVAL_MS", 1000)
+DB_WRITE_MAX_RETRIES = _env_int("SRA_DB_WRITE_MAX_RETRIES", 5)
+
+# Admin dashboard query cache; also bounds how stale writes from other processes can look
+DB_QUERY_CACHE_TTL_SECONDS = _env_int("SRA_DB_QUERY_CACHE_TTL_SECONDS", 60)
+
+# Admin exports, served by Streamlit static file serving (utils/download_utils.py)
+STATIC_DIR = "static"
+EXPORT_DIR = os.path.join(STATIC_DIR, "exports")
+EXPORT_CHUNK_ROWS = _env_int("SRA_EXPORT_CHUNK_ROWS", 5000)
+# Exports are reachable by URL, so they are removed after this long
+EXPORT_MAX_AGE_SECONDS = _env_int("SRA_EXPORT_MAX_AGE_SECONDS", 3600)
+
+# Resume previews, served the same way and named by content hash (utils/pdf_utils.py)
+PREVIEW_DIR = os.path.join(STATIC_DIR, "previews")
+# Previews not viewed for this long are removed
+PREVIEW_MAX_AGE_SECONDS = _env_int("SRA_PREVIEW_MAX_AGE_SECONDS", 24 * 3600)
+
+# Adzuna job search (services/adzuna_client.py); point the base URL at scripts/fake_adzuna_server.py to test offline
+ADZUNA_BASE_URL = os.environ.get("SRA_ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
+ADZUNA_CONNECT_TIMEOUT_SECONDS = _env_int("SRA_ADZUNA_CONNECT_TIMEOUT_SECONDS", 5)
+ADZUNA_READ_TIMEOUT_SECONDS = _env_int("SRA_ADZUNA_READ_TIMEOUT_SECONDS", 20)
+ADZUNA_POOL_SIZE = _env_int("SRA_ADZUNA_POOL_SIZE", 10)
+# Job postings change slowly; a cached search is reused by every session for this long
+ADZUNA_CACHE_TTL_SECONDS = _env_int("SRA_ADZUNA_CACHE_TTL_SECONDS", 15 * 60)
+ADZUNA_CACHE_MAX_ENTRIES = _env_int("SRA_ADZUNA_CACHE_MAX_ENTRIES", 512)
+# Result pages fetched concurrently per search, and the most a user can ask for
+ADZUNA_MAX_WORKERS = _env_int("SRA_ADZUNA_MAX_WORKERS", 4)
+JOB_SEARCH_MAX_PAGES = _env_int("SRA_JOB_SEARCH_MAX_PAGES", 5)
+# Requests sent to Adzuna by the whole process (the API key is shared); 0 disables the limit
+ADZUNA_RATE_LIMIT_PER_MINUTE = _env_int("SRA_ADZUNA_RATE_LIMIT_PER_MINUTE", 25)
+ADZUNA_RATE_BURST = _env_int("SRA_ADZUNA_RATE_BURST", 5)
@@ -0,0 +1,24 @@
+# utils/skill_utils.py
+import ast
+import re
+
+MAX_SKILL_LENGTH = 100
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_skill(skill):
+    """Canonical form used as the resume_skill key: trimmed, lower-case, single-spaced."""
+    skill = _WHITESPACE.sub(' ', str(skill)).strip(' .,;:-').lower()
+    return skill[:MAX_SKILL_LENGTH].rstrip()
+
+
+def parse_skill_list(skills):
+    """Turn a skills list, or its stored ``str(list)`` form, into unique canonical skills in order."""
+    if isinstance(skills, str):
+        try:
+            parsed = ast.literal_eval(skills)
+        except (ValueError, SyntaxError):
+            parsed = skills.split(',')
+        skills = parsed if isinstance(parsed, (list, tuple, set)) else [parsed]
+    canonical = (canonical_skill(skill) for skill in skills or ())
+    return list(dict.fromkeys(skill for skill in canonical if skill))
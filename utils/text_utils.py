@@ -1,13 +1,151 @@
 # utils/text_utils.py
 import re
 
-def cleanResume(txt):
-    """Clean resume text by removing URLs, special characters, etc."""
+_PUNCTUATION = """!"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"""
+_RT_CC = re.compile(r'RT|cc')
+# Anything the URL/RT/cc/hashtag/mention rules can act on; the tokens around these are the only ones stripped
+_SPECIAL = ('http', 'RT', 'cc', '#', '@')
+_TOKEN_REST = re.compile(r'\S*')
+
+# Byte table applied after encoding to ASCII with '?' for every non-ASCII
+# character: punctuation (including that '?') becomes a space, as do the
+# \x1c-\x1f separators that str.split() treats as whitespace but bytes.split() does not.
+_TRANSLATION = bytes(
+    ord(' ') if chr(b) in _PUNCTUATION or 0x1c <= b <= 0x1f else b for b in range(256)
+)
+
+
+def clean_resume_reference(txt):
+    """Seven-pass reference implementation, kept to check normalize_resume against."""
     cleanText = re.sub(r'http\S+\s', ' ', txt)
     cleanText = re.sub(r'RT|cc', ' ', cleanText)
     cleanText = re.sub(r'#\S+\s', ' ', cleanText)
     cleanText = re.sub(r'@\S+', ' ', cleanText)
-    cleanText = re.sub(r'[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', cleanText)
+    cleanText = re.sub(r'[%s]' % re.escape(_PUNCTUATION), ' ', cleanText)
     cleanText = re.sub(r'[^\x00-\x7f]', ' ', cleanText)
     cleanText = re.sub(r'\s+', ' ', cleanText)
     return cleanText
+
+
+def _special_positions(txt):
+    """Sorted offsets of every _SPECIAL substring, found with str.find."""
+    positions = []
+    for literal in _SPECIAL:
+        i = txt.find(literal)
+        while i != -1:
+            positions.append(i)
+            i = txt.find(literal, i + 1)
+    positions.sort()
+    return positions
+
+
+def _strip_token(token, followed, legacy_rt_cc):
+    """Apply the URL, RT/cc, hashtag and mention rules to one whitespace-free token.
+
+    ``followed`` tells whether whitespace comes after the token, which the
+    URL and hashtag rules require.
+    """
+    tail = ''
+    if followed:
+        i = token.find('http')
+        if i != -1 and i + 4 < len(token):
+            token = token[:i]
+            tail = ' '
+
+    if legacy_rt_cc:
+        pieces = _RT_CC.split(token) if ('RT' in token or 'cc' in token) else [token]
+    else:
+        pieces = ['', ''] if token in ('RT', 'cc') else [token]
+
+    last = len(pieces) - 1
+    for n, piece in enumerate(pieces):
+        # A removed match leaves a space behind, exactly like re.sub(..., ' ')
+        cut = False
+        if followed or n < last:
+            j = piece.find('#')
+            if j != -1 and j + 1 < len(piece):
+                piece = piece[:j]
+                cut = True
+        k = piece.find('@')
+        if k != -1 and k + 1 < len(piece):
+            piece = piece[:k]
+            cut = True
+        pieces[n] = piece + ' ' if cut else piece
+    return ' '.join(pieces) + tail
+
+
+def normalize_resume(txt, legacy_rt_cc=True):
+    """Clean resume text by removing URLs, special characters, etc. in a single pass.
+
+    Produces exactly what the seven-regex clean_resume_reference produces:
+    the few tokens the URL/RT/cc/hashtag/mention rules can touch are located
+    with str.find and stripped with plain string operations, then
+    punctuation and non-ASCII characters are mapped to spaces with a single
+    byte-table translate before whitespace is collapsed. With ``legacy_rt_cc=False`` "RT"/"cc"
+    are only removed as whole tokens instead of out of words like "account".
+    """
+    if not txt:
+        return txt
+    length = len(txt)
+
+    parts = []
+    copied = end = 0
+    for pos in _special_positions(txt):
+        if pos < end:
+            continue  # same token as the previous match
+        start = pos
+        while start > 0 and not txt[start - 1].isspace():
+            start -= 1
+        end = _TOKEN_REST.match(txt, pos).end()
+        parts.append(txt[copied:start])
+        parts.append(_strip_token(txt[start:end], end < length, legacy_rt_cc))
+        copied = end
+    if parts:
+        parts.append(txt[copied:])
+        txt = ''.join(parts)
+
+    data = txt.encode('ascii', 'replace').translate(_TRANSLATION)
+    body = b' '.join(data.split()).decode('ascii')
+    leading = data[:1].isspace()
+    trailing = data[-1:].isspace()
+    if not body:
+        return ' ' if (leading or trailing) else ''
+    return (' ' if leading else '') + body + (' ' if trailing else '')
+
+
+def normalize_resume_chunks(chunks, legacy_rt_cc=True):
+    """Normalize text arriving in chunks, yielding pieces whose concatenation
+    equals normalize_resume() of the whole text.
+
+    A token cut by a chunk boundary is held back until the next chunk, so
+    memory stays proportional to the chunk size rather than the document.
+    """
+    pending = ''
+    last_space = False
+    for chunk in chunks:
+        buf = pending + chunk
+        if not buf:
+            continue
+        if buf[-1].isspace():
+            cut = len(buf)
+        else:
+            tail = buf.rsplit(None, 1)[-1]
+            cut = len(buf) - len(tail)
+        pending = buf[cut:]
+        out = normalize_resume(buf[:cut], legacy_rt_cc)
+        if last_space and out.startswith(' '):
+            out = out[1:]
+        if out:
+            last_space = out.endswith(' ')
+            yield out
+    if pending:
+        out = normalize_resume(pending, legacy_rt_cc)
+        if last_space and out.startswith(' '):
+            out = out[1:]
+        if out:
+            yield out
+
+
+def cleanResume(txt):
+    """Clean resume text by removing URLs, special characters, etc."""
+    return normalize_resume(txt)
@@ -0,0 +1,153 @@
+# utils/upload_store.py
+"""Content-addressed store for uploaded resumes.
+
+Each upload is written once, as <sha256[:2]>/<sha256>.pdf, through a
+temporary file renamed into place. Identical uploads share one file
+whatever they were called, and different files with the same name never
+overwrite each other. Storing a document that is already present only
+refreshes its mtime.
+
+After a write, a background thread removes files unused for longer than
+the age limit, then the least recently used ones until the store fits
+its byte budget. Callers get a StoredUpload handle keyed on the hash,
+rather than a filename. The first filename a document was uploaded under
+is kept beside it in <sha256>.name, for display by upload_name().
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from utils.document_cache import document_hash, read_pdf_bytes
+from utils.settings import (
+    UPLOAD_MAX_FILE_BYTES, UPLOAD_STORE_DIR, UPLOAD_STORE_MAX_AGE_SECONDS, UPLOAD_STORE_MAX_BYTES
+)
+
+StoredUpload = namedtuple('StoredUpload', 'sha256 path size name')
+
+_evict_lock = threading.Lock()
+
+
+class UploadTooLarge(ValueError):
+    """The upload exceeds UPLOAD_MAX_FILE_BYTES."""
+
+
+def upload_path(sha256, directory=UPLOAD_STORE_DIR):
+    return os.path.join(directory, sha256[:2], sha256 + '.pdf')
+
+
+def _name_path(path):
+    return os.path.splitext(path)[0] + '.name'
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def upload_name(path):
+    """The original filename of a stored upload given by path, or None (not a stored upload, or unnamed)."""
+    try:
+        with open(_name_path(path), encoding='utf-8') as f:
+            return f.read() or None
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def store_upload(pdf_file, sha256=None, name=None, directory=UPLOAD_STORE_DIR, max_file_bytes=UPLOAD_MAX_FILE_BYTES):
+    """Store a PDF (path, bytes or upload) under its content hash, at most once; returns its StoredUpload.
+
+    ``name`` is the upload's original filename. It is carried on the
+    handle and kept for upload_name(), and has no effect on where the file
+    is stored; a document keeps the first name it was stored under.
+    """
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    if len(pdf_bytes) > max_file_bytes:
+        raise UploadTooLarge(f"{name or 'Upload'} is {len(pdf_bytes) / 2 ** 20:.1f} MB; "
+                             f"the limit is {max_file_bytes / 2 ** 20:.0f} MB")
+    sha256 = sha256 or document_hash(pdf_bytes)
+    name = name or getattr(pdf_file, 'name', None)
+    path = upload_path(sha256, directory)
+    written = False
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, pdf_bytes)
+        written = True
+    if name and not os.path.exists(_name_path(path)):
+        _write_atomic(_name_path(path), os.path.basename(name).encode('utf-8'))
+    if written:
+        schedule_eviction(directory)
+    return StoredUpload(sha256, path, len(pdf_bytes), upload_name(path) or name)
+
+
+def open_upload(sha256, directory=UPLOAD_STORE_DIR):
+    """The StoredUpload for a hash, or None if it was never stored or has been evicted."""
+    path = upload_path(sha256, directory)
+    try:
+        os.utime(path)
+        return StoredUpload(sha256, path, os.path.getsize(path), upload_name(path))
+    except FileNotFoundError:
+        return None
+
+
+def evict_uploads(directory=UPLOAD_STORE_DIR, max_bytes=UPLOAD_STORE_MAX_BYTES, max_age=UPLOAD_STORE_MAX_AGE_SECONDS):
+    """Remove uploads unused for ``max_age`` seconds, then the least recently used beyond ``max_bytes``."""
+    entries, names = [], []
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith('.name'):
+                names.append(path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    cutoff = time.time() - max_age
+    total_bytes = sum(size for _mtime, size, _path in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        # Abandoned .tmp files are only removed by age, never while they may still be written
+        if mtime >= cutoff and (total_bytes <= max_bytes or path.endswith('.tmp')):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_bytes -= size
+        removed += 1
+    # Names of uploads removed here or earlier
+    for path in names:
+        if not os.path.exists(os.path.splitext(path)[0] + '.pdf'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return removed
+
+
+def schedule_eviction(directory=UPLOAD_STORE_DIR):
+    """Run evict_uploads on a daemon thread, unless a run is already in progress."""
+    if not _evict_lock.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            evict_uploads(directory)
+        finally:
+            _evict_lock.release()
+
+    threading.Thread(target=run, name='upload-eviction', daemon=True).start()
+    return True
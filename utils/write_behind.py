@@ -0,0 +1,118 @@
+# utils/write_behind.py
+"""Write-behind buffer that takes database writes off the Streamlit script thread.
+
+Rows are queued under a content key and flushed in batches by a daemon
+thread. A key that is already pending or was written recently is ignored,
+so repeated reruns of the same analysis cost one dictionary lookup and
+never produce a second row. Failed batches are retried with exponential
+backoff while the error is transient; anything else is logged to
+error.log and dropped, and its keys are forgotten so a later rerun can
+queue them again.
+"""
+import atexit
+import threading
+import time
+from collections import OrderedDict
+
+
+class WriteBehindQueue:
+    """Deduplicating, batching writer running on a background thread."""
+
+    def __init__(self, write_batch, batch_size=100, flush_interval=1.0, max_retries=5,
+                 retry_backoff=0.5, retry_on=lambda e: False, seen_size=10000):
+        self._write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._retry_on = retry_on
+        self._seen_size = seen_size
+        self._pending = OrderedDict()
+        # Keys pending or written recently, oldest first
+        self._seen = OrderedDict()
+        self._in_flight = 0
+        self._closed = False
+        self._counts = {"queued": 0, "duplicates": 0, "written": 0, "retries": 0, "failed": 0}
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, key, row):
+        """Queue ``row`` under ``key``; returns False if the key is already pending or written."""
+        with self._cond:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                self._counts["duplicates"] += 1
+                return False
+            self._seen[key] = True
+            while len(self._seen) > self._seen_size:
+                self._seen.popitem(last=False)
+            self._pending[key] = row
+            self._counts["queued"] += 1
+            if len(self._pending) in (1, self.batch_size):
+                self._cond.notify_all()
+            return True
+
+    def _take_batch(self):
+        batch = []
+        while self._pending and len(batch) < self.batch_size:
+            batch.append(self._pending.popitem(last=False))
+        self._in_flight = len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                if len(self._pending) < self.batch_size and not self._closed:
+                    # Linger briefly so rows from concurrent sessions share a round trip
+                    self._cond.wait(self.flush_interval)
+                batch = self._take_batch()
+            self._write(batch)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch):
+        rows = [row for _, row in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._write_batch(rows)
+                with self._cond:
+                    self._counts["written"] += len(rows)
+                return
+            except Exception as e:
+                if attempt < self.max_retries and self._retry_on(e):
+                    with self._cond:
+                        self._counts["retries"] += 1
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                with open("error.log", "a") as f:
+                    f.write(f"Write-behind batch of {len(rows)} rows dropped: {e}\n")
+                with self._cond:
+                    self._counts["failed"] += len(rows)
+                    for key, _ in batch:
+                        self._seen.pop(key, None)
+                return
+
+    def flush(self, timeout=None):
+        """Block until every queued row has been written or dropped."""
+        with self._cond:
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout=10):
+        """Flush what is pending and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        """Counters plus the number of rows still pending."""
+        with self._cond:
+            return dict(self._counts, pending=len(self._pending) + self._in_flight)
@@ -1,7 +1,14 @@
 import streamlit as st
 import pandas as pd
-from utils.database import get_database_connection
-from utils.download_utils import get_table_download_link
+from utils.database import (
+    RESUME_COLUMNS, DEFAULT_ADMIN_COLUMNS, export_resume_data, fetch_categories, fetch_resume_page,
+    fetch_skill_counts, write_version
+)
+from utils.download_utils import EXPORT_FORMATS, get_export_download_link
+from utils.llm_cache import get_llm_cache
+from utils.model_loader import get_model_registry
+
+PAGE_SIZES = (25, 50, 100, 250)
 
 def render_admin_view():
     """Render the admin view of the application"""
@@ -13,56 +20,119 @@ def render_admin_view():
         
         if st.button('Login'):
             if ad_user == 'abc' and ad_password == '123':
-                display_admin_dashboard()
+                # Keep the dashboard open across the reruns its filters and pager trigger
+                st.session_state.admin_logged_in = True
             else:
+                st.session_state.admin_logged_in = False
                 st.error("Wrong ID & Password Provided")
 
+        if st.session_state.get('admin_logged_in'):
+            display_admin_dashboard()
+
 def display_admin_dashboard():
     """Display the admin dashboard after successful login"""
     st.success("Welcome !!")
     
-    # Get database connection
-    connection = get_database_connection()
-    cursor = connection.cursor()
-    
-    # Display Data - only fetch when necessary
     try:
-        connection.select_db("sql12764371")
-        cursor.execute('''SELECT * FROM user_data''')
-        data = cursor.fetchall()
-        
-        st.header("**User's👨‍💻 Data**")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-        st.dataframe(df)
-        
-        # Only create visualization if there's data
-        if not df.empty and 'Actual Skills' in df.columns:
-            display_skills_chart(df)
-        
-        st.markdown(get_table_download_link(df, 'User_Data.csv', 'Download Report'), unsafe_allow_html=True)
-    
+        display_user_data()
     except Exception as e:
         st.error(f"Database error: {str(e)}")
-    finally:
-        cursor.close()
-
-def display_skills_chart(df):
-    """Display a chart of skills from the dataframe"""
-    # Use session state to avoid recomputing
-    if 'admin_chart' not in st.session_state:
-        # Here we use pandas built-in plotting which is much lighter than matplotlib
-        skills_series = df['Actual Skills'].str.split(',').explode().str.strip()
-        skill_counts = skills_series.value_counts()
-        
-        if not skill_counts.empty:
-            chart_data = pd.DataFrame({
-                'Skill': skill_counts.index,
-                'Count': skill_counts.values
-            })
-            st.session_state.admin_chart = chart_data
-    
-    # Display chart
-    if 'admin_chart' in st.session_state:
-        st.bar_chart(st.session_state.admin_chart.set_index('Skill'))
\ No newline at end of file
+
+    display_llm_cache_stats()
+    display_model_stats()
+
+def read_filters():
+    """Render the grid filters and return them as a hashable tuple"""
+    version = write_version()
+    col1, col2, col3 = st.columns(3)
+    dates = col1.date_input("Analysed between", value=(), key="admin_dates")
+    date_from = dates[0] if len(dates) > 0 else None
+    date_to = dates[1] if len(dates) > 1 else date_from
+    category = col2.selectbox("Predicted category", ["All"] + fetch_categories(version), key="admin_category")
+    skill = col3.text_input("Has skill", key="admin_skill").strip()
+    columns = st.multiselect("Columns", RESUME_COLUMNS, default=DEFAULT_ADMIN_COLUMNS, key="admin_columns")
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key="admin_page_size")
+    return (tuple(columns), page_size, date_from, date_to, None if category == "All" else category, skill or None)
+
+def display_user_data():
+    """Display one keyset-paginated page of analysis rows with filters pushed down to SQL"""
+    st.header("**User's👨‍💻 Data**")
+    filters = read_filters()
+    columns, page_size, date_from, date_to, category, skill = filters
+
+    # Cursor stack: the after_id of every page visited so far, current page last
+    if st.session_state.get('admin_filters') != filters:
+        st.session_state.admin_filters = filters
+        st.session_state.admin_cursors = [None]
+    cursors = st.session_state.admin_cursors
+
+    rows, next_after_id = fetch_resume_page(
+        write_version(), columns, cursors[-1], page_size, date_from, date_to, category, skill
+    )
+    df = pd.DataFrame(rows)
+    st.dataframe(df, hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+    if col1.button("Previous", disabled=len(cursors) == 1, key="admin_prev"):
+        cursors.pop()
+        st.rerun()
+    if col2.button("Next", disabled=next_after_id is None, key="admin_next"):
+        cursors.append(next_after_id)
+        st.rerun()
+    col3.caption(f"Page {len(cursors)}")
+
+    display_skills_chart()
+
+    display_export(columns, date_from, date_to, category, skill)
+
+def display_export(columns, date_from, date_to, category, skill):
+    """Export every row matching the filters, generated only on request"""
+    st.subheader("**Download Report**")
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Format", list(EXPORT_FORMATS), key="admin_export_format", label_visibility="collapsed")
+    if col2.button("Prepare export", key="admin_export_btn"):
+        with st.spinner("Exporting..."):
+            st.session_state.admin_export = export_resume_data(fmt, columns, date_from, date_to, category, skill)
+
+    if st.session_state.get('admin_export'):
+        name, count = st.session_state.admin_export
+        st.markdown(get_export_download_link(name, f'Download Report ({count} rows)'), unsafe_allow_html=True)
+
+def display_llm_cache_stats():
+    """Display hit/miss counters of the persistent Gemini response cache"""
+    stats = get_llm_cache().stats()
+    lookups = stats['hits'] + stats['misses']
+    st.header("**Gemini Response Cache**")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hits", stats['hits'])
+    col2.metric("Misses", stats['misses'])
+    col3.metric("Hit rate", f"{stats['hits'] / lookups:.0%}" if lookups else "n/a")
+    col4.metric("Entries", f"{stats['entries']} ({stats['bytes'] / 1024:.0f} KB)")
+
+def display_model_stats():
+    """Display load status, versions, load times and sizes of the serving models"""
+    st.header("**Models**")
+    stats = get_model_registry().stats()
+    if not stats:
+        st.info("No models registered in models/manifest.json")
+        return
+    rows = [
+        {
+            'Model': name,
+            'Status': info['status'],
+            'Version': info.get('version', ''),
+            'Load time (s)': info.get('load_seconds'),
+            'File (KB)': round(info['file_bytes'] / 1024) if 'file_bytes' in info else None,
+            'Resident (KB)': round(info['resident_bytes'] / 1024) if 'resident_bytes' in info else None,
+            'Notes': info.get('error') or '; '.join(info.get('warnings', [])),
+        }
+        for name, info in stats.items()
+    ]
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+def display_skills_chart():
+    """Display a chart of the most common skills across all analysed resumes"""
+    skill_counts = fetch_skill_counts(write_version())
+    if skill_counts:
+        chart_data = pd.DataFrame(skill_counts).rename(columns={'skill': 'Skill', 'resume_count': 'Count'})
+        st.bar_chart(chart_data.set_index('Skill'))
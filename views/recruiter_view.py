@@ -0,0 +1,88 @@
+import glob
+import os
+
+import pandas as pd
+import streamlit as st
+from services.batch_service import find_resumes
+from services.ranking_service import JD_KEYWORDS, explain_top, load_resumes, rank_resumes
+
+JD_DIR = os.path.join("Uploaded_Resumes", "JD")
+RESUME_DIR = "Uploaded_Resumes"
+
+def render_recruiter_view():
+    """Render the recruiter view: rank many resumes against one job description"""
+    st.success('Rank candidates against a job description')
+
+    job_description = choose_job_description()
+    uploads = st.file_uploader("Candidate resumes", type=["pdf"], accept_multiple_files=True)
+    include_stored = st.checkbox(f"Include the resumes stored in {RESUME_DIR}/", value=not uploads)
+
+    col1, col2, col3 = st.columns(3)
+    top = col1.number_input("Shortlist size", min_value=1, value=20, step=5)
+    keywords = col2.number_input("JD keywords", min_value=5, max_value=100, value=JD_KEYWORDS, step=5)
+    explain = col3.number_input("Explain the top N with Gemini", min_value=0, max_value=10, value=0)
+
+    if st.button("Rank candidates", key="rank_btn"):
+        if not job_description.strip():
+            st.warning("Please provide Job Description")
+            return
+        pdf_files = list(uploads or [])
+        if include_stored:
+            pdf_files += find_resumes(RESUME_DIR)
+        if not pdf_files:
+            st.warning("Please upload resumes or include the stored ones")
+            return
+        with st.spinner("Ranking resumes..."):
+            resumes = load_resumes(pdf_files)
+            shortlist = rank_resumes(job_description, resumes, top=int(top), keywords=int(keywords))
+        if explain:
+            with st.spinner(f"Explaining the top {int(explain)} matches..."):
+                explain_top(job_description, shortlist, resumes, int(explain))
+        st.session_state.recruiter_shortlist = shortlist
+        st.session_state.recruiter_pool_size = len(resumes)
+
+    if st.session_state.get('recruiter_shortlist'):
+        display_shortlist(st.session_state.recruiter_shortlist, st.session_state.recruiter_pool_size)
+
+def choose_job_description():
+    """Pick a bundled JD, upload one, or paste one; returns its text"""
+    bundled = sorted(glob.glob(os.path.join(JD_DIR, "*.txt")))
+    options = ["Paste a job description"] + [os.path.basename(path) for path in bundled]
+    choice = st.selectbox("Job Description", options)
+    if choice != options[0]:
+        with open(os.path.join(JD_DIR, choice), encoding="utf-8") as f:
+            text = f.read()
+        with st.expander("Job description text"):
+            st.text(text)
+        return text
+    uploaded = st.file_uploader("Or upload it as a text file", type=["txt"])
+    if uploaded is not None:
+        return uploaded.getvalue().decode("utf-8", "replace")
+    return st.text_area("Job Description: ", key="recruiter_jd", height=200)
+
+def display_shortlist(shortlist, pool_size):
+    """Show the ranked shortlist with matched and missing keywords, plus any Gemini explanations"""
+    st.subheader(f"**Shortlist: top {len(shortlist)} of {pool_size} resumes**")
+    table = pd.DataFrame([{
+        'Rank': record['rank'],
+        'Resume': os.path.basename(record['name']),
+        'Score': record['score'],
+        'Keyword coverage': record['coverage'],
+        'Matched keywords': ', '.join(record['matched']),
+        'Missing keywords': ', '.join(record['missing']),
+    } for record in shortlist])
+    st.dataframe(table, hide_index=True, use_container_width=True, column_config={
+        'Score': st.column_config.ProgressColumn(format="%.3f", min_value=0.0, max_value=1.0),
+        'Keyword coverage': st.column_config.ProgressColumn(format="%.2f", min_value=0.0, max_value=1.0),
+    })
+    st.download_button("Download shortlist (CSV)", table.to_csv(index=False), file_name="shortlist.csv",
+                       mime="text/csv")
+
+    for record in shortlist:
+        if 'explanation' not in record:
+            break
+        with st.expander(f"{record['rank']}. {os.path.basename(record['name'])}"):
+            if record.get('explanation_error'):
+                st.error(f"AI analysis failed: {record['explanation_error']}")
+            else:
+                st.write(record['explanation'])
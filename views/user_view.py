@@ -1,15 +1,24 @@
 import streamlit as st
 import datetime
 import time
+from functools import partial
 from streamlit_tags import st_tags
-from utils.pdf_utils import pdf_reader, show_pdf, extract_resume_data_with_gemini
+from utils.pdf_utils import show_pdf, extract_resume_data_with_gemini
+from utils.document_cache import get_document
+from utils.upload_store import UploadTooLarge, store_upload
 from utils.session_state import reset_session_state
-from utils.database import insert_data
-from services.ml_service import predict_category, job_recommendation
-from services.recommendation_service import load_recommendation_data, course_recommender
-from services.ai_service import get_gemini_response1, get_gemini_response2
-from services.ai_service import extract_location_from_resume
-from services.job_search_service import find_jobs_by_location,search_jobs_by_country,test_adzuna_api ,display_job_results
+from utils.database import save_resume_data
+from services.ml_service import analyze_resume_text
+from utils.model_loader import load_model
+from utils.model_registry import ModelUnavailable
+from services.recommendation_service import (
+    load_recommendation_data, course_recommender, match_skill_domain, missing_skills, rank_domains, recommend_courses
+)
+from services.ai_service import match_candidate, summarize_candidate
+from services.ai_service import locate_candidate
+from services.async_ai_service import AsyncAIClient, start_resume_analysis
+from services.job_search_service import find_jobs_by_location,search_jobs_by_country,test_adzuna_api ,display_job_results, render_updates
+from utils.settings import JOB_SEARCH_MAX_PAGES
 
 def render_user_view():
     """Render the user view of the application"""
@@ -24,28 +33,36 @@ def render_user_view():
 
 def process_uploaded_pdf(pdf_file):
     """Process the uploaded PDF file"""
-    if st.session_state.current_pdf != pdf_file.name:
+    # Written once per content hash; a rerun or a repeat upload of the same file only refreshes its mtime
+    try:
+        upload = store_upload(pdf_file.getvalue(), name=pdf_file.name)
+    except UploadTooLarge as e:
+        st.error(str(e))
+        return
+
+    if st.session_state.current_pdf != upload.sha256:
         reset_session_state()
-        st.session_state.current_pdf = pdf_file.name
+        st.session_state.current_pdf = upload.sha256
         st.session_state.app_state = 'pdf_uploaded'
 
-    save_image_path = './Uploaded_Resumes/' + pdf_file.name
-    with open(save_image_path, "wb") as f:
-        f.write(pdf_file.getbuffer())
+    # Later stages read the stored file by its hash instead of the upload widget's bytes
+    document = get_document(upload.path, upload.sha256)
 
     with st.spinner("Loading PDF preview..."):
-        show_pdf(save_image_path)
+        show_pdf(upload.path, upload.sha256)
 
     if 'resume_data' not in st.session_state or st.session_state.app_state == 'pdf_uploaded':
+        # Location and summary only need the text, so they run while the extraction call is in flight
+        st.session_state.ai_client = start_resume_analysis(AsyncAIClient(), document["text"])
         with st.spinner("Extracting resume data..."):
-            st.session_state.resume_data = extract_resume_data_with_gemini(save_image_path)
-            st.session_state.resume_text = pdf_reader(save_image_path)
+            st.session_state.resume_data = extract_resume_data_with_gemini(upload.path, upload.sha256)
+            st.session_state.resume_text = document["text"]
             st.session_state.app_state = 'data_extracted'
 
     if st.session_state.resume_data:
-        display_resume_analysis(save_image_path)
+        display_resume_analysis()
 
-def display_resume_analysis(save_image_path):
+def display_resume_analysis():
     """Display the resume analysis results"""
     st.header("**Resume Analysis**")
     
@@ -71,8 +88,10 @@ def display_basic_info():
         try:
             if 'recommended_job' not in st.session_state:
                 with st.spinner("Analyzing resume..."):
-                    st.session_state.recommended_job = job_recommendation(st.session_state.resume_text)
-                    st.session_state.predicted_category = predict_category(st.session_state.resume_text)
+                    predictions = analyze_resume_text(st.session_state.resume_text)
+                    st.session_state.recommended_job = predictions['recommended_job']
+                    st.session_state.predicted_category = predictions['predicted_category']
+                    st.session_state.model_errors = predictions['unavailable']
 
             pages = st.session_state.resume_data.get('no_of_pages', 'N/A')
             email = st.session_state.resume_data.get('email', 'N/A')
@@ -95,11 +114,25 @@ def display_skills_and_recommendations():
     st_tags(label='### Skills that you have', text='See our skills recommendation',
             value=st.session_state.skills, key=skills_key, maxtags=15)
 
-    st.success("The predicted category of the Resume is: " + st.session_state.predicted_category)
-    st.success("According to our Analysis, this Resume is suited for the aforementioned job: " + st.session_state.recommended_job)
+    model_errors = st.session_state.get('model_errors', {})
+    if st.session_state.get('predicted_category'):
+        st.success("The predicted category of the Resume is: " + st.session_state.predicted_category)
+    else:
+        st.warning("Resume category prediction is unavailable: " + model_errors.get('predicted_category', 'unknown error'))
+    if st.session_state.get('recommended_job'):
+        st.success("According to our Analysis, this Resume is suited for the aforementioned job: " + st.session_state.recommended_job)
+    else:
+        st.warning("Job recommendation is unavailable: " + model_errors.get('recommended_job', 'unknown error'))
+    display_similar_roles()
 
     if 'recommended_skills' not in st.session_state:
         generate_recommendations()
+    display_course_recommendations()
+
+    if st.session_state.get('domain_ranking'):
+        st.caption("Skill domains: " + ", ".join(
+            f"{entry['domain']} ({entry['confidence']:.0%})" for entry in st.session_state.domain_ranking
+        ))
 
     # Save data to database
     save_to_database(cand_level)
@@ -110,47 +143,62 @@ def display_skills_and_recommendations():
         st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding these skills to your resume will boost the chances of getting a Job💼</h4>''',
             unsafe_allow_html=True)
 
+def role_index():
+    """The local role retrieval index, or None if none is registered"""
+    try:
+        return load_model('role_index')
+    except ModelUnavailable:
+        return None
+
+def display_similar_roles():
+    """Show the closest roles and postings from the local jobs index"""
+    index = role_index()
+    if index is None:
+        return
+    if 'similar_roles' not in st.session_state:
+        text = st.session_state.resume_text
+        st.session_state.similar_roles = (index.top_roles(text, k=5), index.similar_postings(text, k=5))
+    roles, postings = st.session_state.similar_roles
+    with st.expander("Closest roles in the jobs corpus"):
+        for role, score in roles:
+            st.text(f"{role}  ({score:.2f})")
+        st.caption("Most similar postings")
+        for _row, role, score, snippet in postings:
+            st.text(f"{role}  ({score:.2f}): {snippet}...")
+
 def generate_recommendations():
-    """Generate skill and course recommendations"""
+    """Generate skill recommendations and the skill gaps that drive course selection"""
     rec_data = load_recommendation_data()
-    recommended_skills = []
-    rec_course = ''
-
-    for i in st.session_state.resume_data['skills']:
-        i_lower = i.lower()
-        if i_lower in rec_data['ds_keyword']:
-            recommended_skills = rec_data['ds_skills']
-            rec_course = course_recommender(rec_data['ds_course'])
-            break
-        elif i_lower in rec_data['web_keyword']:
-            recommended_skills = rec_data['web_skills']
-            rec_course = course_recommender(rec_data['web_course'])
-            break
-        elif i_lower in rec_data['android_keyword']:
-            recommended_skills = rec_data['android_skills']
-            rec_course = course_recommender(rec_data['android_course'])
-            break
-        elif i_lower in rec_data['ios_keyword']:
-            recommended_skills = rec_data['ios_skills']
-            rec_course = course_recommender(rec_data['ios_course'])
-            break
-        elif i_lower in rec_data['uiux_keyword']:
-            recommended_skills = rec_data['uiux_skills']
-            rec_course = course_recommender(rec_data['uiux_course'])
-            break
+    skills = st.session_state.resume_data['skills']
+
+    ranking = rank_domains(skills, rec_data)
+    recommended_skills, _course_list = match_skill_domain(skills, rec_data, ranking)
 
+    st.session_state.domain_ranking = ranking
+    st.session_state.skill_gaps = missing_skills(recommended_skills, skills)
     st.session_state.recommended_skills = recommended_skills
-    st.session_state.rec_course = rec_course
+
+def display_course_recommendations():
+    """Select and render course recommendations; both steps are cheap index lookups"""
+    st.session_state.rec_course = ''
+    if not st.session_state.domain_ranking:
+        return
+    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 4)
+    courses = recommend_courses(
+        load_recommendation_data()['course_index'], st.session_state.skill_gaps,
+        st.session_state.domain_ranking, no_of_reco, seed=st.session_state.current_pdf
+    )
+    st.session_state.rec_course = course_recommender(courses)
 
 def save_to_database(cand_level):
-    """Save the analysis results to database"""
+    """Queue the analysis results for a background database write (once per document)"""
     ts = time.time()
     cur_date = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
     cur_time = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
     timestamp = str(cur_date + '_' + cur_time)
     
-    # Call the insert_data function with the correct parameter names
-    insert_data(
+    save_resume_data(
+        st.session_state.current_pdf,
         st.session_state.resume_data.get('name', 'Unknown'),
         st.session_state.resume_data.get('email', 'N/A'),
         timestamp,
@@ -158,7 +206,9 @@ def save_to_database(cand_level):
         cand_level,
         str(st.session_state.resume_data.get('skills', [])),
         str(st.session_state.recommended_skills if 'recommended_skills' in st.session_state else []),
-        str(st.session_state.rec_course if 'rec_course' in st.session_state else '')
+        str(st.session_state.rec_course if 'rec_course' in st.session_state else ''),
+        st.session_state.get('predicted_category'),
+        st.session_state.get('recommended_job')
     )
 
 def display_resume_tips():
@@ -200,31 +250,13 @@ def display_ai_analysis():
     with col1:
         if st.button("Summarize the Candidate", key="summarize_btn"):
             with st.spinner("Generating summary..."):
-                input_prompt1 = """
-You are an expert Applicant Tracking System (ATS) with deep knowledge in various job fields. 
-
-I will provide you with a resume text below. Please analyze the entire resume content and generate a comprehensive candidate summary.
-
-Requirements:
-- Provide a brief summary of the candidate based on the resume content
-- Present the summary in bullet points format
-- Keep the summary between 100-150 words
-- Focus on key qualifications, experience, skills, and strengths
-- Highlight the candidate's professional background and potential value
-
-Resume Text:
-{resume_text}
-
-Please provide your analysis as a candidate summary in bullet points.
-"""
                 text = st.session_state.resume_text
-                
-                # Use session state to cache response
-                summary_key = f"summary_{hash(text)}"
+
                 # Use session state to cache response with unique key
+                summary_key = f"summary_{hash(text)}"
                 if summary_key not in st.session_state:
-                    st.session_state[summary_key] = get_gemini_response1(input_prompt1, text)
-                
+                    st.session_state[summary_key] = ai_result('summary', summarize_candidate, text)
+
                 st.subheader("Candidate Summary:")
                 st.write(st.session_state[summary_key])
     
@@ -234,8 +266,11 @@ Please provide your analysis as a candidate summary in bullet points.
             if input_text == "":
                 st.warning("Please provide Job Description")
             else:
+                index = role_index()
+                if index is not None:
+                    similarity = index.similarity(st.session_state.resume_text, input_text)
+                    st.metric("Keyword match (local TF-IDF)", f"{similarity:.0%}")
                 with st.spinner("Analyzing match..."):
-                    input_prompt2 = """You are an skilled ATS (Applicant Tracking System) scanner with a deep understanding of various job fields and ATS functionality, your task is to evaluate the resume against the provided job description. First the output should come as Key skills missing and then last final thoughts."""
                     text = st.session_state.resume_text
                     
                     # Create a unique key for this job description
@@ -243,10 +278,20 @@ Please provide your analysis as a candidate summary in bullet points.
                     
                     # Use session state to cache response
                     if match_key not in st.session_state:
-                        st.session_state[match_key] = get_gemini_response2(input_prompt2, text, input_text)
+                        st.session_state[match_key] = match_candidate(text, input_text)
                     
                     st.write(st.session_state[match_key])
 
+def ai_result(name, fallback, *args):
+    """Read a background AI call started at upload, or run ``fallback(*args)`` if there is none."""
+    client = st.session_state.get('ai_client')
+    if client is None or name not in client.tasks:
+        return fallback(*args)
+    result = client.result(name)
+    if name in client.errors:
+        st.error(f"AI analysis failed ({name}): {client.errors[name]}")
+    return result
+
 def display_job_search():
     """Display job search based on location"""
     st.subheader("**Job Opportunities**")
@@ -259,6 +304,12 @@ def display_job_search():
     if 'country_selected' not in st.session_state:
         st.session_state.country_selected = False
         
+    # More pages are fetched concurrently; the first one is shown as soon as it arrives
+    max_pages = st.number_input("Result pages to load", min_value=1, max_value=JOB_SEARCH_MAX_PAGES, value=1,
+                                key="job_pages")
+    # The controls below only choose a search; it runs after them, so its results render underneath
+    search, search_message, by_country = None, None, False
+
     # Step 1: Initial job search button
     if not st.session_state.job_search_initiated:
         if st.button("Find Relevant Jobs"):
@@ -270,7 +321,10 @@ def display_job_search():
                 
             with st.spinner("Extracting location from resume..."):
                 # Extract location data from resume
-                st.session_state.location_data = extract_location_from_resume(st.session_state.resume_text)
+                location_data = ai_result('location', locate_candidate, st.session_state.resume_text)
+                if location_data and location_data.get("error"):
+                    st.error(f"Error extracting location: {location_data['error']}")
+                st.session_state.location_data = location_data
             
             # Force rerun to show next steps
             st.rerun()
@@ -287,13 +341,9 @@ def display_job_search():
             st.success(f"Detected location: {location_str}")
             
             # Search jobs directly with the found location
-            with st.spinner("Searching for job openings..."):
-                job_results = find_jobs_by_location(
-                    location_data, 
-                    job_title=st.session_state.get('recommended_job')
-                )
-                if job_results:
-                    st.session_state['job_results'] = job_results
+            search = partial(find_jobs_by_location, location_data,
+                             job_title=st.session_state.get('recommended_job'), max_pages=max_pages)
+            search_message = "Searching for job openings..."
         else:
             # No location found, offer country selection
             st.warning("No location detected in resume. Please select a country.")
@@ -309,14 +359,25 @@ def display_job_search():
             
             # Add country search button
             if st.button("Search Jobs in Selected Country"):
-                with st.spinner(f"Searching for jobs in {selected_country}..."):
-                    job_results = search_jobs_by_country(selected_country, 
-                                                     job_title=st.session_state.get('recommended_job'))
-                    if job_results:
-                        st.session_state['job_results'] = job_results
-                        st.session_state.country_selected = True
-    
+                search = partial(search_jobs_by_country, selected_country,
+                                 job_title=st.session_state.get('recommended_job'), max_pages=max_pages)
+                search_message = f"Searching for jobs in {selected_country}..."
+                by_country = True
+
+    # A search streams its pages into this placeholder as they arrive
+    if search is not None:
+        with st.spinner(search_message):
+            results_area = st.empty()
+            job_results = search(on_update=render_updates(results_area))
+        if job_results:
+            st.session_state['job_results'] = job_results
+            if by_country:
+                st.session_state.country_selected = True
+    else:
+        results_area = st.empty()
+
     # Display job results if they exist in session state
     if 'job_results' in st.session_state and st.session_state['job_results']:
-        display_job_results(st.session_state['job_results'])
+        with results_area.container():
+            display_job_results(st.session_state['job_results'])
         
\ No newline at end of file